@@ -0,0 +1,107 @@
+"""
+Korpus Erişim Benchmark'ı
+Sentetik bir json_output dizini üzerinde tüm dokümanları belleğe yükleyen eski yaklaşımı
+Corpus API'sinin indeks filtresi, LRU önbellekli okuma, toplu ön yükleme ve alan
+projeksiyonlu tembel gezinmesiyle karşılaştırır (süre ve tepe bellek).
+
+Kullanım: python benchmarks/bench_corpus.py [doküman_sayısı]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from corpus import Corpus
+from html_to_json import HTMLToJSONConverter
+from stats_catalog import INDEX_FILES
+
+DOC_TYPES = ["genelge", "kanun", "yonetmelik", "teblig"]
+
+
+def make_document(doc_no: int) -> dict:
+    """Dönüştürücü çıktısına benzeyen bir doküman üret"""
+    text = " ".join(f"MADDE {i} – Noter, 1512 sayılı Noterlik Kanunu uyarınca {doc_no} sayılı işlemi düzenler."
+                    for i in range(1, 40))
+    return {
+        "metadata": {"file_path": f"d{doc_no % 50}/doc{doc_no}.html", "title": f"{doc_no} sayılı belge"},
+        "content": {"text": text, "headings": [], "links": [{"url": f"doc{i}.html"} for i in range(20)],
+                    "images": [], "tables": [], "lists": [], "forms": []},
+        "legal": {"doc_type": DOC_TYPES[doc_no % len(DOC_TYPES)], "number": str(doc_no),
+                  "year": 1990 + doc_no % 30, "date": "", "articles": [], "references": []},
+        "conversion_date": "2025-01-16T00:00:00"
+    }
+
+
+def measure(label: str, func):
+    """Fonksiyonun süresini ve tepe bellek kullanımını yazdır"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<38} {elapsed:8.3f} sn  {peak / 1024 / 1024:8.1f} MB")
+    return result
+
+
+def load_everything(json_dir: Path) -> list:
+    """Eski yaklaşım: tüm dokümanları açıp belleğe al"""
+    documents = []
+    for json_file in json_dir.rglob("*.json"):
+        if json_file.name not in INDEX_FILES:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                documents.append(json.load(f))
+    return documents
+
+
+def main():
+    """Ana fonksiyon"""
+    logging.disable(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_dir = Path(temp_dir) / "json_output"
+        for doc_no in range(count):
+            document = make_document(doc_no)
+            path = json_dir / Path(document["metadata"]["file_path"]).with_suffix(".json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+
+        asyncio.run(HTMLToJSONConverter(str(Path(temp_dir) / "db"), str(json_dir)).create_master_index())
+        print(f"Doküman: {count}\n")
+
+        measure("Tümünü yükle + filtrele (eski)",
+                lambda: [d for d in load_everything(json_dir) if d["legal"]["doc_type"] == "kanun"])
+
+        corpus = Corpus(str(json_dir), max_documents=512)
+        measure("İndeks yükleme", lambda: len(corpus))
+        matches = measure("İndeks filtresi (doküman açılmaz)",
+                          lambda: corpus.filter(doc_type="kanun", doc_year=lambda y: y >= 2000))
+        keys = [entry["file_path"] for entry in matches][:500]
+
+        measure("Soğuk okuma (500 doküman)", lambda: [corpus.load(key) for key in keys])
+        measure("Önbellekten okuma (500 doküman)", lambda: [corpus.load(key) for key in keys])
+
+        corpus.cache.clear()
+        measure("Toplu ön yükleme (500 doküman)", lambda: corpus.prefetch(keys))
+
+        measure("Projeksiyonlu tembel gezinme (tümü)",
+                lambda: sum(len(doc["metadata"]["title"])
+                            for _, doc in corpus.iter_documents(fields=["metadata.title"])))
+        print(f"\nÖnbellek: {corpus.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Dosya Yazıcı Benchmark'ı
+Çok sayıda küçük dosyanın yazılmasını eski yöntem (dosya başına mkdir + aiofiles)
+ile AsyncFileWriter'ın farklı fsync politikaları arasında karşılaştırır.
+
+Disk gecikmesi gürültülü olabileceğinden duvar saatine ek olarak CPU süresi de raporlanır.
+
+Kullanım: python benchmarks/bench_file_writer.py [dosya_sayısı]
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiofiles
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from file_writer import AsyncFileWriter, FSYNC_POLICIES
+
+
+def make_jobs(root: Path, count: int):
+    """Sayfa benzeri küçük dosyalar üret (~2 KB, 50 dizine dağılmış)"""
+    body = "<html><body>" + "Noterlik Kanunu madde metni. " * 60 + "</body></html>"
+    return [(root / f"dizin_{i % 50}" / f"sayfa_{i}.html", body) for i in range(count)]
+
+
+async def baseline(jobs):
+    """Eski yöntem: her dosya için mkdir ve yeni aiofiles handle"""
+    async def save(path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+            await f.write(content)
+
+    await asyncio.gather(*(save(path, content) for path, content in jobs))
+
+
+async def with_writer(jobs, fsync_policy: str):
+    """AsyncFileWriter ile yazma"""
+    async with AsyncFileWriter(fsync_policy=fsync_policy) as writer:
+        await asyncio.gather(*(writer.write(path, content) for path, content in jobs))
+
+
+def run_case(name: str, count: int, factory):
+    """Tek bir senaryoyu geçici dizinde çalıştır ve sonucu yazdır"""
+    root = Path(tempfile.mkdtemp(prefix="bench_writer_"))
+    try:
+        jobs = make_jobs(root, count)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        asyncio.run(factory(jobs))
+        cpu = time.process_time() - cpu_start
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {count:>7} dosya  {elapsed:8.3f} sn  {count / elapsed:10.0f} dosya/sn  "
+              f"CPU {cpu:7.3f} sn")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """Ana fonksiyon"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    run_case("aiofiles (eski)", count, baseline)
+    for policy in FSYNC_POLICIES:
+        run_case(f"AsyncFileWriter/{policy}", count, lambda jobs, p=policy: with_writer(jobs, p))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Öncelikli Tarama Sınırı Benchmark'ı
+Süreç içinde çalışan sentetik bir mevzuat sitesi (kategori listeleri, sayfalama, etiket ve
+arşiv sayfaları, dokümanlar) üzerinde ilk N dokümanın indirilme süresini ve o ana kadar
+yapılan istek sayısını kuyruk stratejilerine göre karşılaştırır.
+
+Kullanım: python benchmarks/bench_frontier.py [doküman_sayısı] [hedef_N]
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from frontier import PriorityFrontier, default_score, fifo_score
+from web_scraper import AsyncWebScraper
+
+CATEGORIES = 8
+DOCS_PER_LISTING = 10
+TAGS = 40
+ARCHIVE_MONTHS = 72
+LATENCY = 0.005
+DOC_TYPES = ["Genelge", "Yönetmelik", "Tebliğ", "Karar"]
+
+
+class SyntheticSite:
+    """Listeleme ve gezinme sayfaları doküman sayısından fazla olan sentetik site"""
+
+    def __init__(self, doc_count: int):
+        self.doc_count = doc_count
+        self.listings = max(1, doc_count // (CATEGORIES * DOCS_PER_LISTING))
+        self.doc_requests = 0
+        self.requests = 0
+        self.seen_docs = set()
+        self.target = 0
+        self.reached = asyncio.Event()
+        self.first_docs = []
+
+    def doc_url(self, doc_no: int) -> str:
+        """Dokümanların yarısı anlamlı, yarısı anlamsız (kimlik) yollarda"""
+        category = doc_no % CATEGORIES
+        if doc_no % 2:
+            return f"/mevzuat/kat{category}/belge-{doc_no * 7919 % 100003}.html"
+        kind = DOC_TYPES[doc_no % len(DOC_TYPES)].lower().replace("ö", "o").replace("ğ", "g")
+        return f"/mevzuat/kat{category}/{kind}-{2000 + doc_no % 24}-{doc_no}.html"
+
+    def doc_anchor(self, doc_no: int) -> str:
+        return f"{doc_no} sayılı {DOC_TYPES[doc_no % len(DOC_TYPES)]}"
+
+    def menu(self) -> str:
+        """Her sayfada bulunan menü: kategoriler, etiketler ve arşiv"""
+        links = ['<a href="/index.html">Ana Sayfa</a>']
+        links += [f'<a href="/mevzuat/kat{c}/liste-1.html">Kategori {c}</a>' for c in range(CATEGORIES)]
+        links += [f'<a href="/etiket/t{t}.html">Etiket {t}</a>' for t in range(0, TAGS, 4)]
+        links += [f'<a href="/arsiv/{2000 + m // 12}-{m % 12 + 1}.html">Arşiv {m}</a>' for m in range(0, ARCHIVE_MONTHS, 6)]
+        return "<nav>" + " ".join(links) + "</nav>"
+
+    def page(self, body: str) -> web.Response:
+        return web.Response(text=f"<html><body>{self.menu()}{body}</body></html>", content_type="text/html")
+
+    def docs_of_listing(self, category: int, listing: int):
+        start = (listing - 1) * DOCS_PER_LISTING
+        return [category + (start + i) * CATEGORIES for i in range(DOCS_PER_LISTING)
+                if category + (start + i) * CATEGORIES < self.doc_count]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(LATENCY)
+        self.requests += 1
+        path = request.path
+        rng = random.Random(path)
+
+        if path == "/index.html":
+            return self.page("<h1>Mevzuat</h1>")
+
+        if path.startswith("/mevzuat/") and "/liste-" in path:
+            category = int(path.split("/")[2][3:])
+            listing = int(path.rsplit("-", 1)[1].split(".")[0])
+            docs = self.docs_of_listing(category, listing)
+            body = "".join(f'<a href="{self.doc_url(d)}">{self.doc_anchor(d)}</a>' for d in docs)
+            body += "".join(f'<a href="/mevzuat/kat{category}/liste-{p}.html">{p}</a>'
+                            for p in range(1, self.listings + 1))
+            if listing < self.listings:
+                body += f'<a href="/mevzuat/kat{category}/liste-{listing + 1}.html">Sonraki »</a>'
+            return self.page(body)
+
+        if path.startswith("/etiket/") or path.startswith("/arsiv/"):
+            body = "".join(f'<a href="/etiket/t{rng.randrange(TAGS)}.html">Etiket</a>' for _ in range(10))
+            body += "".join(f'<a href="/arsiv/{2000 + m // 12}-{m % 12 + 1}.html">{m % 12 + 1}</a>'
+                            for m in rng.sample(range(ARCHIVE_MONTHS), 10))
+            docs = [rng.randrange(self.doc_count) for _ in range(2)]
+            body += "".join(f'<a href="{self.doc_url(d)}">{self.doc_anchor(d)}</a>' for d in docs)
+            return self.page(body)
+
+        if path.startswith("/mevzuat/"):
+            if path not in self.seen_docs:
+                self.seen_docs.add(path)
+                self.doc_requests += 1
+                self.first_docs.append(path)
+                if self.doc_requests >= self.target:
+                    self.reached.set()
+            related = [rng.randrange(self.doc_count) for _ in range(2)]
+            body = "<p>Noterlik işlemleri hakkında açıklama.</p>" * 5
+            body += "".join(f'<a href="{self.doc_url(d)}">{self.doc_anchor(d)}</a>' for d in related)
+            return self.page(body)
+
+        return web.Response(status=404)
+
+
+async def crawl_until(site: SyntheticSite, base_url: str, frontier: PriorityFrontier, target: int,
+                      output_dir: Path) -> dict:
+    """Hedef doküman sayısına ulaşılana kadar tara"""
+    site.doc_requests = site.requests = 0
+    site.seen_docs = set()
+    site.first_docs = []
+    site.target = target
+    site.reached = asyncio.Event()
+
+    start = time.perf_counter()
+    async with AsyncWebScraper(base_url, str(output_dir), max_concurrent=10) as scraper:
+        scraper.pending_urls = frontier
+        crawl = asyncio.create_task(scraper.scrape_recursive(f"{base_url}/index.html"))
+        reached = asyncio.create_task(site.reached.wait())
+        await asyncio.wait([crawl, reached], return_when=asyncio.FIRST_COMPLETED)
+        elapsed = time.perf_counter() - start
+        requests = site.requests
+        for task in (crawl, reached):
+            task.cancel()
+        await asyncio.gather(crawl, reached, return_exceptions=True)
+
+    directories = {path.rsplit("/", 1)[0] for path in site.first_docs[:target]}
+    return {'seconds': elapsed, 'requests': requests, 'docs': min(site.doc_requests, target),
+            'directories': len(directories)}
+
+
+async def main():
+    """Ana fonksiyon"""
+    logging.disable(logging.INFO)
+    doc_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    target = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    site = SyntheticSite(doc_count)
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", site.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    port = server._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    strategies = [
+        ("Sırasız (eski küme davranışı)", lambda: PriorityFrontier(lambda url, info: random.random(), 0.0)),
+        ("FIFO (genişlik öncelikli)", lambda: PriorityFrontier(fifo_score, 0.0)),
+        ("Öncelikli (dizin cezası yok)", lambda: PriorityFrontier(default_score, 0.0)),
+        ("Öncelikli (varsayılan)", lambda: PriorityFrontier()),
+    ]
+
+    print(f"Site: {doc_count} doküman, {CATEGORIES} kategori x {site.listings} liste sayfası, "
+          f"{TAGS} etiket, {ARCHIVE_MONTHS} arşiv sayfası; hedef: ilk {target} doküman\n")
+    print(f"{'Strateji':<32} {'Süre':>10} {'İstek':>8} {'Doküman':>8} {'İsabet':>8} {'Dizin':>6}")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for index, (label, factory) in enumerate(strategies):
+                result = await crawl_until(site, base_url, factory(), target, Path(temp_dir) / f"db{index}")
+                precision = result['docs'] / max(result['requests'], 1) * 100
+                print(f"{label:<32} {result['seconds'] * 1000:8.0f} ms {result['requests']:8d} "
+                      f"{result['docs']:8d} {precision:7.1f}% {result['directories']:6d}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
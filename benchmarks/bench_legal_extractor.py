@@ -0,0 +1,91 @@
+"""
+Hukuki Çıkarıcı Benchmark'ı
+LegalExtractor'ın, dönüştürücünün doküman başına zaten yaptığı işe (HTML ayrıştırma ve
+tüm extract_* adımları) göre ne kadar ek süre getirdiğini sentetik mevzuat sayfaları
+üzerinde ölçer. Sayfalar her maddede atıf ve tarih içerdiğinden gerçek korpustan yoğundur.
+
+Kullanım: python benchmarks/bench_legal_extractor.py [doküman_sayısı] [madde_sayısı]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from html_to_json import HTMLToJSONConverter
+from legal_extractor import LegalExtractor
+
+
+def make_html(doc_no: int, article_count: int) -> str:
+    """Maddeler, tarihler ve atıflar içeren sentetik bir mevzuat sayfası üret"""
+    articles = "".join(
+        f"<p>Amaç</p><p>MADDE {i} – Bu madde 1512 sayılı Noterlik Kanununun {i} inci maddesi "
+        f"ve 2004/{i} sayılı Genelge uyarınca 12.03.2004 tarihinde düzenlenmiştir. "
+        f"{'Noterlik işlemleri hakkında ayrıntılı açıklama. ' * 8}</p>"
+        for i in range(1, article_count + 1)
+    )
+    return (f"<html><head><title>{doc_no} sayılı Noterlik Yönetmeliği</title></head>"
+            f"<body><p>Sayı: B.03.0.HUK/{doc_no}</p><p>15 Ocak 1990</p>{articles}</body></html>")
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Fonksiyonu birkaç kez çalıştır ve en kısa süreyi döndür"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Ana fonksiyon"""
+    doc_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    article_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    converter = HTMLToJSONConverter.__new__(HTMLToJSONConverter)
+    extractor = LegalExtractor()
+    pages = [make_html(i, article_count) for i in range(doc_count)]
+
+    def convert_baseline():
+        """Dönüştürücünün mevcut maliyeti: parse + tüm extract_* adımları"""
+        texts = []
+        for html in pages:
+            soup = BeautifulSoup(html, 'html.parser')
+            converter.extract_metadata(soup, "")
+            texts.append(converter.extract_text_content(soup))
+            converter.extract_headings(soup)
+            converter.extract_links(soup, "")
+            converter.extract_images(soup)
+            converter.extract_tables(soup)
+            converter.extract_lists(soup)
+            converter.extract_forms(soup)
+        return texts
+
+    def extract_legal():
+        """Hukuki çıkarım: yalnızca hazır metin üzerinde tek geçiş"""
+        found = 0
+        for i, text in enumerate(texts):
+            result = extractor.extract(text, f"{i} sayılı Noterlik Yönetmeliği", f"{i}-yonetmelik.html")
+            found += len(result['articles'])
+        return found
+
+    texts = convert_baseline()
+    parse_time = best_of(convert_baseline)
+    found_articles = extract_legal()
+    extract_time = best_of(extract_legal)
+
+    total_chars = sum(len(text) for text in texts)
+    print(f"Doküman: {doc_count}, madde/doküman: {article_count}, metin: {total_chars / 1e6:.1f} M karakter")
+    print(f"Mevcut dönüştürme     : {parse_time:8.3f} sn")
+    print(f"Hukuki çıkarım        : {extract_time:8.3f} sn  "
+          f"({total_chars / extract_time / 1e6:.1f} M karakter/sn, {found_articles} madde)")
+    print(f"Ek maliyet            : %{extract_time / parse_time * 100:.1f}")
+
+
+if __name__ == "__main__":
+    main()
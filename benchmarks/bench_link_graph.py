@@ -0,0 +1,64 @@
+"""
+Link Grafiği Benchmark'ı
+Sentetik, güç yasası dağılımlı bir site grafiğinde (varsayılan 100k sayfa, 1M link)
+CSR oluşturma, PageRank, giriş derecesi, erişilebilirlik ve kırık link analizini ölçer.
+
+Kullanım: python benchmarks/bench_link_graph.py [sayfa_sayısı] [link_sayısı]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from link_graph import LinkGraph, LinkGraphBuilder
+
+
+def timed(label: str, func):
+    """Fonksiyonu çalıştır, süresini yazdır ve sonucunu döndür"""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} sn")
+    return result
+
+
+def main():
+    """Ana fonksiyon"""
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    edge_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    rng = np.random.default_rng(0)
+
+    urls = [f"http://127.0.0.1:8000/site/d{i % 100}/sayfa_{i}.html" for i in range(node_count)]
+    sources = rng.integers(0, node_count, edge_count)
+    # Hedefler güç yasasıyla birkaç popüler sayfada yoğunlaşır
+    targets = np.minimum((rng.pareto(1.2, edge_count) * 50).astype(np.int64), node_count - 1)
+    order = np.argsort(sources, kind='stable')
+    sources, targets = sources[order], targets[order]
+    boundaries = np.flatnonzero(np.diff(sources)) + 1
+
+    def build():
+        builder = LinkGraphBuilder()
+        for source_block, target_block in zip(np.split(sources, boundaries), np.split(targets, boundaries)):
+            builder.add_page(urls[source_block[0]], [urls[t] for t in target_block])
+        for i in rng.integers(0, node_count, 100):
+            builder.mark_failed(urls[i])
+        return builder
+
+    builder = timed("Kenar toplama (add_page)", build)
+    graph = timed("CSR oluşturma", builder.build)
+    print(f"Düğüm: {graph.node_count}, kenar: {graph.edge_count}")
+
+    timed("Kaydet + yükle (.npz)", lambda: (graph.save("/tmp/bench_link_graph.npz"),
+                                            LinkGraph.load("/tmp/bench_link_graph.npz")))
+    timed("Giriş derecesi", graph.in_degree)
+    timed("PageRank", graph.pagerank)
+    timed("Erişilebilirlik (BFS)", lambda: graph.reachable([0]))
+    timed("Kırık linkler", graph.broken_links)
+
+
+if __name__ == "__main__":
+    main()
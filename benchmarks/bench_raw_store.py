@@ -0,0 +1,100 @@
+"""
+Ham HTML Deposu Benchmark'ı
+Aynı sentetik sayfa kümesini raw_html "inline" ve "store" modlarında dönüştürür;
+JSON boyutlarını, create_master_index süresini ve ham HTML'in tembel okunma süresini karşılaştırır.
+
+Kullanım: python benchmarks/bench_raw_store.py [sayfa_sayısı]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from html_to_json import HTMLToJSONConverter
+from stats_catalog import CATALOG_NAME
+from raw_store import RawHTMLStore, load_raw_html
+
+
+def make_page(page_no: int) -> str:
+    """Gerçek sayfalara benzeyen (menü, script, stil ağırlıklı) bir HTML üret"""
+    style = "<style>" + ".menu-item{color:#333;padding:4px 8px;margin:0}" * 80 + "</style>"
+    script = "<script>" + f"var config_{page_no} = {{id: {page_no}, items: [1,2,3]}};" * 60 + "</script>"
+    menu = "<ul>" + "".join(f'<li><a href="/kategori/{i}.html" class="menu-item">Kategori {i}</a></li>'
+                            for i in range(30)) + "</ul>"
+    body = "".join(f"<p>MADDE {i} – Noter, 1512 sayılı Noterlik Kanunu uyarınca {page_no} sayılı işlemi düzenler.</p>"
+                   for i in range(1, 15))
+    return (f"<html><head><title>{page_no} sayılı Genelge</title>{style}</head>"
+            f"<body><div class='nav'>{menu}</div>{script}<div class='content'>{body}</div></body></html>")
+
+
+def dir_size(root: Path, pattern: str) -> int:
+    """Desene uyan dosyaların toplam boyutu"""
+    return sum(f.stat().st_size for f in root.rglob(pattern) if f.is_file())
+
+
+async def run_mode(input_dir: Path, output_dir: Path, mode: str):
+    """Bir modda dönüştür ve ölçümleri döndür"""
+    converter = HTMLToJSONConverter(str(input_dir), str(output_dir), raw_html_mode=mode)
+    await converter.convert_all_html_files()
+
+    start = time.perf_counter()
+    await converter.create_master_index()
+    index_time = time.perf_counter() - start
+
+    docs = [p for p in output_dir.rglob("*.json") if p.name not in ("master_index.json", CATALOG_NAME)]
+    json_size = sum(p.stat().st_size for p in docs)
+    store_size = dir_size(output_dir, "raw_html.*")
+
+    # Ham HTML'i tembel olarak geri oku
+    start = time.perf_counter()
+    with RawHTMLStore(output_dir) as store:
+        for doc in docs[:200]:
+            with open(doc, 'r', encoding='utf-8') as f:
+                assert load_raw_html(json.load(f), output_dir, store)
+    raw_time = (time.perf_counter() - start) / min(200, len(docs))
+
+    return json_size, store_size, index_time, raw_time
+
+
+def main():
+    """Ana fonksiyon"""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    logging.disable(logging.INFO)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_raw_"))
+    try:
+        input_dir = root / "db"
+        for i in range(page_count):
+            path = input_dir / f"d{i % 20}" / f"{i}-sayili-genelge.html"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(make_page(i), encoding='utf-8')
+        html_size = dir_size(input_dir, "*.html")
+        print(f"Sayfa: {page_count}, HTML toplam: {html_size / 1e6:.1f} MB")
+
+        results = {}
+        for mode in ("inline", "store"):
+            results[mode] = asyncio.run(run_mode(input_dir, root / mode, mode))
+            json_size, store_size, index_time, raw_time = results[mode]
+            print(f"{mode:<7} JSON: {json_size / 1e6:7.1f} MB  depo: {store_size / 1e6:6.1f} MB  "
+                  f"master_index: {index_time:6.3f} sn  ham HTML okuma: {raw_time * 1000:6.3f} ms/doküman")
+
+        inline, store = results["inline"], results["store"]
+        print(f"JSON küçülme: {inline[0] / store[0]:.1f}x, master_index hızlanma: {inline[2] / store[2]:.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+SQLite Depolama Arka Ucu Benchmark'ı
+Sentetik sayfa ve dokümanları hem dosya düzenine hem SQLite deposuna yazar; listeleme,
+istatistik ve ana indeks oluşturmayı dosya sistemi taraması ile sorgu olarak karşılaştırır.
+
+Kullanım: python benchmarks/bench_sqlite_store.py [doküman_sayısı]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from file_writer import AsyncFileWriter
+from html_to_json import HTMLToJSONConverter
+from sqlite_store import SQLiteStore, export_layout
+
+
+def make_page(doc_no: int) -> str:
+    """Küçük bir mevzuat sayfası üret"""
+    return (f"<html><head><title>{doc_no} sayılı genelge</title></head><body>"
+            f"<h1>Genelge {doc_no}</h1>" + "<p>Noterlik işlemleri hakkında açıklama.</p>" * 20 +
+            "</body></html>")
+
+
+async def timed_async(label: str, coroutine_factory):
+    """Coroutine'i çalıştır, süreyi yazdır ve sonucunu döndür"""
+    start = time.perf_counter()
+    result = await coroutine_factory()
+    print(f"{label:<48} {(time.perf_counter() - start) * 1000:10.2f} ms")
+    return result
+
+
+def timed(label: str, func, repeat: int = 3):
+    """Fonksiyonu çalıştır, en iyi süreyi yazdır ve sonucunu döndür"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<48} {best * 1000:10.2f} ms")
+    return result
+
+
+def walk_stats(directory: Path) -> dict:
+    """Eski yaklaşım: dizini tarayıp sayı ve boyut topla"""
+    files = [path for path in directory.rglob("*.json") if path.name != "master_index.json"]
+    return {'files': len(files), 'bytes': sum(path.stat().st_size for path in files)}
+
+
+async def main():
+    """Ana fonksiyon"""
+    logging.disable(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    pages = {f"d{doc_no % 50}/genelge{doc_no}.html": make_page(doc_no) for doc_no in range(count)}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        store = SQLiteStore(root / "noterlik.db")
+
+        # Sayfaları iki arka uca da yaz
+        async def write_files():
+            async with AsyncFileWriter() as writer:
+                await asyncio.gather(*[await writer.submit(root / "db" / path, html) for path, html in pages.items()])
+
+        async def write_store():
+            async with store.writer("pages", root / "db_sqlite") as writer:
+                await asyncio.gather(*[await writer.submit(root / "db_sqlite" / path, html)
+                                       for path, html in pages.items()])
+
+        await timed_async("Sayfaları dosyalara yaz", write_files)
+        await timed_async("Sayfaları SQLite'a yaz (batch işlem)", write_store)
+
+        files_converter = HTMLToJSONConverter(str(root / "db"), str(root / "json_output"), raw_html_mode="none")
+        store_converter = HTMLToJSONConverter(str(root / "db_sqlite"), str(root / "json_sqlite"),
+                                              raw_html_mode="none", store=store)
+        await timed_async("Dönüştür (dosyalar)", files_converter.convert_all_html_files)
+        await timed_async("Dönüştür (SQLite)", store_converter.convert_all_html_files)
+
+        print()
+        timed("Listeleme: rglob('*.html')", lambda: list((root / "db").rglob("*.html")))
+        timed("Listeleme: page_paths()", store.page_paths)
+        timed("İstatistik: rglob + stat", lambda: walk_stats(root / "json_output"))
+        timed("İstatistik: stats()", store.stats)
+        await timed_async("Ana indeks: dosyaları oku (create_master_index)", files_converter.create_master_index)
+        await timed_async("Ana indeks: sorgu (create_master_index)", store_converter.create_master_index)
+        timed("Sorgu: index_rows(limit=100)", lambda: store.index_rows(limit=100))
+
+        print()
+        await timed_async("Dışa aktarım (tam)", lambda: export_layout(store, root / "export_db", root / "export_json"))
+        await timed_async("Dışa aktarım (değişiklik yok)", lambda: export_layout(store, root / "export_db",
+                                                                                  root / "export_json"))
+
+        with open(root / "export_json" / "master_index.json", 'r', encoding='utf-8') as f:
+            exported = json.load(f)
+        assert exported["total_files"] == count, exported["total_files"]
+        print(f"\nVeritabanı boyutu: {store.stats()['database_bytes'] / 1024 / 1024:.1f} MB")
+        store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
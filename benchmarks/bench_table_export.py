@@ -0,0 +1,106 @@
+"""
+Sütunlu Tablo Dışa Aktarımı Benchmark'ı
+Harç tarifesi benzeri tablolar içeren sentetik bir json_output dizini üretir; tabloları
+sütunlu depoya aktarır ve toplama sorgularını korpusu yeniden okuyan yaklaşımla karşılaştırır.
+
+Kullanım: python benchmarks/bench_table_export.py [doküman_sayısı]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from html_to_json import HTMLToJSONConverter
+from table_export import TableStore, build_table_export, parse_number
+
+OPERATIONS = ["Vekaletname", "Muvafakatname", "Satış vaadi", "Kira sözleşmesi", "Onay", "Tercüme"]
+
+
+def make_document(doc_no: int) -> dict:
+    """İki tablolu (tarife + yürürlük) bir doküman üret"""
+    tariff = {
+        "headers": ["İşlem", "Tutar (TL)", "Yürürlük"],
+        "rows": [["İşlem", "Tutar (TL)", "Yürürlük"]] + [
+            [operation, f"{(doc_no * 7 + i * 131) % 5000 + 100:,}".replace(",", ".") + ",50", f"01.0{i % 9 + 1}.20{10 + doc_no % 14}"]
+            for i, operation in enumerate(OPERATIONS * 3)
+        ],
+        "caption": "Harç Tarifesi"
+    }
+    layout = {"headers": [], "rows": [["Bilgi", "Açıklama"], ["Sayı", str(doc_no)]], "caption": ""}
+    return {
+        "metadata": {"file_path": f"d{doc_no % 50}/doc{doc_no}.html", "title": f"{doc_no} sayılı tarife"},
+        "content": {"text": "Tarife metni " * 200, "headings": [], "links": [], "images": [],
+                    "tables": [tariff, layout], "lists": [], "forms": []},
+        "legal": {"doc_type": "teblig", "number": str(doc_no), "year": 2010, "date": "", "articles": [], "references": []},
+        "conversion_date": "2025-01-16T00:00:00"
+    }
+
+
+def timed(label: str, func, repeat: int = 1):
+    """Fonksiyonu çalıştır, en iyi süreyi yazdır ve sonucunu döndür"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.2f} ms")
+    return result
+
+
+def naive_sum(json_dir: Path) -> float:
+    """Eski yaklaşım: her dokümanı açıp 'Tutar' sütununu topla"""
+    total = 0.0
+    for json_file in json_dir.rglob("doc*.json"):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        for table in document["content"]["tables"]:
+            if table["headers"] and table["headers"][1].startswith("Tutar"):
+                total += sum(parse_number(row[1]) for row in table["rows"][1:])
+    return total
+
+
+def main():
+    """Ana fonksiyon"""
+    logging.disable(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_dir = Path(temp_dir) / "json_output"
+        for doc_no in range(count):
+            document = make_document(doc_no)
+            path = json_dir / Path(document["metadata"]["file_path"]).with_suffix(".json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+        asyncio.run(HTMLToJSONConverter(str(Path(temp_dir) / "db"), str(json_dir)).create_master_index())
+
+        table_dir = Path(temp_dir) / "tables"
+        result = timed("Sütunlu dışa aktarım", lambda: build_table_export(str(json_dir), str(table_dir)))
+        print(f"  {result}")
+
+        store = timed("Depoyu yükle (mmap)", lambda: TableStore(table_dir))
+        naive = timed("Korpusu yeniden okuyarak toplam (eski)", lambda: naive_sum(json_dir))
+        total = timed("aggregate('tutar', 'sum')", lambda: store.aggregate("tutar", "sum"), repeat=5)
+        assert abs(naive - total) < 1e-6 * max(abs(naive), 1.0), (naive, total)
+        timed("aggregate('tutar', 'mean', 'işlem')",
+              lambda: store.aggregate("tutar", "mean", group_by="işlem"), repeat=5)
+        timed("aggregate('tutar', 'max', 'doc')", lambda: store.aggregate("tutar", "max", group_by="doc"), repeat=5)
+        timed("values('yürürlük', 'date') min", lambda: store.values("yürürlük", "date")[1].min(), repeat=5)
+
+        by_operation = store.aggregate("tutar", "mean", group_by="işlem")
+        print(f"\nİşlem bazında ortalama tutar: { {k: round(v, 2) for k, v in by_operation.items()} }")
+        print(f"Tablo 0: {store.table(0)['headers']} / {store.table(0)['types']}")
+
+
+if __name__ == "__main__":
+    main()
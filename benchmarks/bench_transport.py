@@ -0,0 +1,116 @@
+"""
+HTTP Taşıma Katmanı Benchmark'ı
+Ayrı bir süreçte yerel bir aiohttp sunucusu başlatır ve her taşıma profili (ve kuruluysa
+uvloop) için bağlantı ön ısıtma süresini, sıralı isteklerde istek başına gecikmeyi ve
+eşzamanlı isteklerde saniyedeki istek sayısını ölçer. FakeTransport satırı ağ olmadan
+taşıma katmanının kendi maliyetini gösterir.
+
+Kullanım: python benchmarks/bench_transport.py [istek_sayısı] [eşzamanlılık]
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from transport import (TRANSPORT_PROFILES, AiohttpTransport, FakeTransport, run, transport_options,
+                       uvloop_available)
+
+PAGE = "<html><body>" + "<p>Noterlik işlemleri hakkında açıklama.</p>" * 200 + "</body></html>"
+
+
+def serve(port_queue):
+    """Sunucu süreci: her yola aynı sayfayı döndür"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def start():
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+async def measure(transport, base_url: str, requests: int, concurrency: int) -> dict:
+    """Ön ısıtma, sıralı ve eşzamanlı istek ölçümleri"""
+    start = time.perf_counter()
+    await transport.start()
+    await transport.prewarm(f"{base_url}/index.html")
+    prewarm = time.perf_counter() - start
+
+    try:
+        sequential = max(requests // 10, 1)
+        start = time.perf_counter()
+        for index in range(sequential):
+            response = await transport.get(f"{base_url}/s/{index}.html")
+            assert response['status'] == 200
+        per_request = (time.perf_counter() - start) / sequential
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(index: int):
+            async with semaphore:
+                return await transport.get(f"{base_url}/c/{index}.html")
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[fetch(index) for index in range(requests)])
+        throughput = requests / (time.perf_counter() - start)
+        assert all(response['status'] == 200 for response in responses)
+    finally:
+        await transport.close()
+    return {'prewarm': prewarm, 'per_request': per_request, 'throughput': throughput}
+
+
+def main():
+    """Ana fonksiyon"""
+    logging.disable(logging.WARNING)
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    server = ctx.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    # DNS çözümlemesi (ve önbelleği) ölçüme girsin diye IP yerine host adı kullanılır
+    base_url = f"http://localhost:{port_queue.get(timeout=30)}"
+
+    loops = [False] + ([True] if uvloop_available() else [])
+    if not uvloop_available():
+        print("uvloop kurulu değil, yalnızca asyncio döngüsü ölçülüyor (pip install uvloop)\n")
+
+    print(f"{requests} istek, eşzamanlılık {concurrency}\n")
+    print(f"{'Profil':<16} {'Döngü':<8} {'Ön ısıtma':>12} {'Sıralı':>14} {'Eşzamanlı':>14}")
+    try:
+        for use_uvloop in loops:
+            loop_name = "uvloop" if use_uvloop else "asyncio"
+            rows = [(profile, lambda profile=profile: AiohttpTransport(transport_options(profile, concurrency)))
+                    for profile in TRANSPORT_PROFILES]
+            rows.append(("fake", lambda: FakeTransport(handler=lambda url, headers: PAGE)))
+            for label, factory in rows:
+                result = run(measure(factory(), base_url, requests, concurrency), use_uvloop=use_uvloop)
+                print(f"{label:<16} {loop_name:<8} {result['prewarm'] * 1000:9.2f} ms "
+                      f"{result['per_request'] * 1000:8.3f} ms/i {result['throughput']:10.0f} i/sn")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,13 @@ sys.path.insert(0, str(project_root / "src"))
 
 from web_scraper import AsyncWebScraper
 from html_to_json import HTMLToJSONConverter
+from distributed_scraper import ShardedCrawlCoordinator
+from raw_store import RAW_HTML_MODES
+from stats_catalog import StatsCatalog, read_catalog, top_directories
+from table_export import build_table_export
+from watcher import DirectoryWatcher
+from sqlite_store import STORE_NAME, SQLiteStore, export_layout
+from transport import DEFAULT_PROFILE, TRANSPORT_PROFILES, run, uvloop_available
 
 
 class NoterlikApp:
@@ -28,7 +35,18 @@ class NoterlikApp:
         self.base_url = "http://127.0.0.1:8000/9B2F1556-3672-40F0-987D-D82A926AEFA4/index.html"
         self.output_dir = "db"
         self.json_output_dir = "json_output"
+        self.tables_dir = "tables"
         self.max_concurrent = 30
+        self.num_workers = 1
+        self.raw_html_mode = "inline"
+        # Depolama arka ucu: "files" (db/ + json_output/) veya "sqlite" (tek veritabanı + dışa aktarım)
+        self.storage_backend = "files"
+        self.sqlite_path = STORE_NAME
+        # Daemon modu: yeniden tarama aralığı (sn) ve nazik (düşük) eşzamanlılık
+        self.daemon_interval = 3600
+        self.daemon_concurrent = 8
+        # HTTP taşıma profili: "pooled" (ısıtılmış havuz + DNS önbelleği), "basic", "no_keepalive"
+        self.transport_profile = DEFAULT_PROFILE
         
     def print_banner(self):
         """Uygulama banner'ını yazdır"""
@@ -58,7 +76,8 @@ class NoterlikApp:
 │  4. Web Arayüzünü Aç                                       │
 │  5. Ayarları Düzenle                                       │
 │  6. İstatistikleri Görüntüle                               │
-│  7. Çıkış                                                   │
+│  7. Daemon Modu (Periyodik Tarama + Artımlı Dönüştürme)    │
+│  8. Çıkış                                                   │
 └─────────────────────────────────────────────────────────────┘
         """
         print(menu)
@@ -69,13 +88,33 @@ class NoterlikApp:
         print(f"📍 Hedef URL: {self.base_url}")
         print(f"📁 Çıktı Klasörü: {self.output_dir}")
         print(f"⚡ Eşzamanlı İstek: {self.max_concurrent}")
+        print(f"🧩 İşçi Süreç: {self.num_workers}")
+        print(f"🗄️ Depolama: {self.storage_description()}")
+        print(f"🌐 HTTP Taşıma: {self.transport_profile} ({'uvloop' if uvloop_available() else 'asyncio'})")
         print("-" * 60)
         
+        store = self.open_store()
         try:
+            if self.num_workers > 1:
+                coordinator = ShardedCrawlCoordinator(
+                    base_url=self.base_url,
+                    output_dir=self.output_dir,
+                    num_workers=self.num_workers,
+                    max_concurrent=self.max_concurrent,
+                    store=store,
+                    transport=self.transport_profile
+                )
+                await coordinator.crawl(self.base_url)
+                
+                print("\n✅ Web Scraping başarıyla tamamlandı!")
+                return True
+            
             async with AsyncWebScraper(
                 base_url=self.base_url,
                 output_dir=self.output_dir,
-                max_concurrent=self.max_concurrent
+                max_concurrent=self.max_concurrent,
+                store=store,
+                transport=self.transport_profile
             ) as scraper:
                 await scraper.scrape_recursive(self.base_url)
                 
@@ -85,29 +124,63 @@ class NoterlikApp:
         except Exception as e:
             print(f"\n❌ Web Scraping hatası: {str(e)}")
             return False
+        finally:
+            if store is not None:
+                store.close()
     
     async def run_json_conversion(self):
         """HTML to JSON dönüştürme işlemini çalıştır"""
         print("\n🔄 HTML to JSON dönüştürme başlatılıyor...")
         print(f"📁 Kaynak Klasörü: {self.output_dir}")
         print(f"📁 Hedef Klasörü: {self.json_output_dir}")
+        print(f"🗄️ Depolama: {self.storage_description()}")
         print("-" * 60)
         
+        store = self.open_store()
         try:
             converter = HTMLToJSONConverter(
                 input_dir=self.output_dir,
-                output_dir=self.json_output_dir
+                output_dir=self.json_output_dir,
+                raw_html_mode=self.raw_html_mode,
+                store=store
             )
             
             await converter.convert_all_html_files()
             await converter.create_master_index()
             
+            if store is not None:
+                # Görüntüleyici ve tablo deposu dosya düzenini okur; yalnızca değişen satırlar yazılır
+                exported = await export_layout(store, self.output_dir, self.json_output_dir)
+                print(f"📤 Dışa Aktarım: {exported['pages']} sayfa, {exported['documents']} doküman")
+            
+            # Tabloları sütunlu depoya aktar (ana indeks üzerinden yalnızca tablolu dokümanlar okunur)
+            loop = asyncio.get_running_loop()
+            table_stats = await loop.run_in_executor(
+                None, build_table_export, self.json_output_dir, self.tables_dir, self.output_dir
+            )
+            print(f"📊 Tablolar: {table_stats['tables']} tablo, {table_stats['cells']} hücre → {self.tables_dir}")
+            
             print("\n✅ JSON dönüştürme başarıyla tamamlandı!")
             return True
             
         except Exception as e:
             print(f"\n❌ JSON dönüştürme hatası: {str(e)}")
             return False
+        finally:
+            if store is not None:
+                store.close()
+    
+    def open_store(self):
+        """SQLite arka ucu seçiliyse veritabanını aç"""
+        if self.storage_backend != "sqlite":
+            return None
+        return SQLiteStore(self.sqlite_path)
+    
+    def storage_description(self) -> str:
+        """Depolama arka ucunun kısa açıklaması"""
+        if self.storage_backend == "sqlite":
+            return f"SQLite ({self.sqlite_path})"
+        return "Dosyalar"
     
     async def run_full_process(self):
         """Tüm işlemleri sırayla çalıştır"""
@@ -131,6 +204,121 @@ class NoterlikApp:
             print("\n⚠️ JSON dönüştürme başarısız oldu.")
             return False
     
+    async def run_daemon(self):
+        """Siteyi periyodik olarak yeniden tara, değişen HTML dosyalarını artımlı dönüştür
+        
+        Tarama artımlı modda çalışır (koşullu istekler, değişmeyen dosyalar yeniden yazılmaz);
+        HTML klasörü izlenir ve yalnızca değişen dosyalar dönüştürülüp ana indekse işlenir.
+        Site değişmediği sürece dönüştürücü uyur. Ctrl+C ile durdurulur.
+        """
+        print("\n🛰️ Daemon modu başlatılıyor...")
+        print(f"📍 Hedef URL: {self.base_url}")
+        print(f"⏲️ Tarama Aralığı: {self.daemon_interval} sn")
+        print(f"⚡ Eşzamanlı İstek: {self.daemon_concurrent}")
+        print("🛑 Durdurmak için Ctrl+C")
+        print("-" * 60)
+        
+        store = self.open_store()
+        converter = HTMLToJSONConverter(
+            input_dir=self.output_dir,
+            output_dir=self.json_output_dir,
+            raw_html_mode=self.raw_html_mode,
+            store=store
+        )
+        # SQLite arka ucunda dizin izlenmez; değişen sayfalar tarama sonrasında sorguyla bulunur
+        watcher = DirectoryWatcher(self.output_dir, patterns=("*.html",)) if store is None else None
+        # Ana indeksi okuyup yeniden yazan işlemler sıraya sokulur
+        index_lock = asyncio.Lock()
+        tasks = []
+        
+        try:
+            if watcher is not None:
+                watcher.start()
+                print(f"👀 İzleme yöntemi: {watcher.backend}")
+            else:
+                print(f"👀 İzleme yöntemi: tarama sonrası sorgu ({self.storage_description()})")
+            
+            # Süreç kapalıyken oluşan değişiklikleri yakala
+            loop = asyncio.get_running_loop()
+            changed, removed = await loop.run_in_executor(None, converter.find_stale_files)
+            if changed or removed:
+                await self.convert_changes(converter, changed, removed, index_lock)
+            
+            tasks.append(asyncio.create_task(self.crawl_periodically(converter, index_lock)))
+            if watcher is not None:
+                tasks.append(asyncio.create_task(self.convert_on_change(converter, watcher, index_lock)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if watcher is not None:
+                watcher.close()
+            if store is not None:
+                store.close()
+            print("\n🛑 Daemon modu durduruldu.")
+    
+    async def crawl_periodically(self, converter: HTMLToJSONConverter, index_lock: asyncio.Lock):
+        """Siteyi belirlenen aralıkla artımlı olarak yeniden tara (taramalar üst üste binmez)"""
+        first_cycle = True
+        while True:
+            started = time.monotonic()
+            try:
+                # Havuz yalnızca ilk taramada ısıtılır (en fazla daemon_concurrent bağlantı); sonraki
+                # taramalar saatte bir çalıştığından ısıtma yalnızca siteye ek yük olur
+                async with AsyncWebScraper(
+                    base_url=self.base_url,
+                    output_dir=self.output_dir,
+                    max_concurrent=self.daemon_concurrent,
+                    incremental=True,
+                    store=converter.store,
+                    transport=self.transport_profile,
+                    prewarm=self.daemon_concurrent if first_cycle else 0
+                ) as scraper:
+                    first_cycle = False
+                    changed = await scraper.scrape_recursive(self.base_url)
+                stats = scraper.stats
+                print(f"🔄 {datetime.now():%H:%M:%S} Tarama: {stats['downloaded']} değişen, "
+                      f"{stats['unchanged']} aynı, {stats['removed']} silinen, {stats['failed']} başarısız")
+                
+                if changed and converter.store is not None:
+                    changed_pages, removed_pages = converter.find_stale_files()
+                    await self.convert_changes(converter, changed_pages, removed_pages, index_lock)
+                # Link grafiği taramanın sonunda yazılır; sıralama yeni grafiğe göre tazelenir
+                elif changed:
+                    async with index_lock:
+                        await converter.update_master_index()
+            except Exception as e:
+                print(f"❌ {datetime.now():%H:%M:%S} Tarama hatası: {str(e)}")
+            
+            await asyncio.sleep(max(self.daemon_interval - (time.monotonic() - started), 0))
+    
+    async def convert_on_change(self, converter: HTMLToJSONConverter, watcher: DirectoryWatcher,
+                                index_lock: asyncio.Lock):
+        """HTML klasöründeki değişiklik gruplarını bekle ve dönüştür"""
+        while True:
+            changed, removed = await watcher.wait_for_changes()
+            try:
+                await self.convert_changes(converter, changed, removed, index_lock)
+            except Exception as e:
+                print(f"❌ {datetime.now():%H:%M:%S} Dönüştürme hatası: {str(e)}")
+    
+    async def convert_changes(self, converter: HTMLToJSONConverter, changed, removed, index_lock: asyncio.Lock):
+        """Değişen HTML dosyalarını dönüştür, ana indeksi ve gerekirse tablo deposunu güncelle"""
+        async with index_lock:
+            result = await converter.convert_files(sorted(changed), removed=sorted(removed))
+            index_stats = await converter.update_master_index(result['written'], result['removed'])
+            if converter.store is not None:
+                await export_layout(converter.store, self.output_dir, self.json_output_dir)
+        print(f"📝 {datetime.now():%H:%M:%S} Dönüştürme: {len(result['written'])} güncellenen, "
+              f"{len(result['removed'])} silinen doküman")
+        
+        if index_stats['tables_changed']:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, build_table_export, self.json_output_dir, self.tables_dir, self.output_dir
+            )
+    
     def open_web_interface(self):
         """Web arayüzünü aç"""
         index_path = project_root / "index.html"
@@ -170,35 +358,102 @@ class NoterlikApp:
         except ValueError:
             pass
         
+        print(f"Mevcut İşçi Süreç Sayısı: {self.num_workers}")
+        try:
+            new_workers = int(input("Yeni İşçi Süreç Sayısı (1 = tek süreç, boş bırakırsanız mevcut kalır): ").strip())
+            if new_workers > 0:
+                self.num_workers = new_workers
+        except ValueError:
+            pass
+        
+        print(f"Mevcut Ham HTML Modu: {self.raw_html_mode}")
+        new_raw_mode = input("Yeni Ham HTML Modu (inline/store/none, boş bırakırsanız mevcut kalır): ").strip()
+        if new_raw_mode in RAW_HTML_MODES:
+            self.raw_html_mode = new_raw_mode
+        
+        print(f"Mevcut Depolama Arka Ucu: {self.storage_backend}")
+        new_backend = input("Yeni Depolama Arka Ucu (files/sqlite, boş bırakırsanız mevcut kalır): ").strip()
+        if new_backend in ("files", "sqlite"):
+            self.storage_backend = new_backend
+        
+        print(f"Mevcut Daemon Tarama Aralığı: {self.daemon_interval} sn")
+        try:
+            new_interval = int(input("Yeni Daemon Tarama Aralığı (sn, boş bırakırsanız mevcut kalır): ").strip())
+            if new_interval > 0:
+                self.daemon_interval = new_interval
+        except ValueError:
+            pass
+        
+        print(f"Mevcut HTTP Taşıma Profili: {self.transport_profile}")
+        new_profile = input(f"Yeni HTTP Taşıma Profili ({'/'.join(TRANSPORT_PROFILES)}, boş bırakırsanız mevcut kalır): ").strip()
+        if new_profile in TRANSPORT_PROFILES:
+            self.transport_profile = new_profile
+        
         print("\n✅ Ayarlar güncellendi!")
     
+    def load_catalog(self, directory: Path, kind: str):
+        """Dizinin istatistik kataloğunu oku, yoksa bir kez tarayarak oluştur"""
+        if not directory.exists():
+            return None
+        
+        if read_catalog(directory) is None:
+            print(f"📇 {directory} için istatistik kataloğu oluşturuluyor (tek seferlik tarama)...")
+        return StatsCatalog(directory, kind).summary()
+    
+    def print_catalog(self, summary, label: str, icon: str):
+        """Katalog özetini ve en büyük dizinleri yazdır"""
+        if summary is None:
+            print(f"{icon} {label} Dosyaları: Henüz oluşturulmadı")
+            return
+        
+        print(f"{icon} {label} Dosyaları: {summary['files']} adet")
+        print(f"💾 {label} Toplam Boyut: {self.format_size(summary['bytes'])}")
+        for rollup in top_directories(summary, limit=3):
+            print(f"   └─ {rollup['directory']}: {rollup['files']} dosya, {self.format_size(rollup['bytes'])}")
+    
+    def print_run_history(self, summaries, limit: int = 5):
+        """Son çalıştırmaların süre ve hızlarını, önceki ortalamaya göre eğilimle yazdır"""
+        runs = sorted(
+            (run for summary in summaries if summary for run in summary.get('runs', [])),
+            key=lambda run: run.get('finished_at', '')
+        )
+        if not runs:
+            return
+        
+        print("\n⏱️ Son Çalıştırmalar:")
+        for index, run in enumerate(runs[-limit:], start=max(len(runs) - limit, 0)):
+            previous = [r['files_per_sec'] for r in runs[:index]
+                        if r['operation'] == run['operation'] and r['files_per_sec']]
+            trend = ""
+            if previous and run['files_per_sec']:
+                change = (run['files_per_sec'] / (sum(previous) / len(previous)) - 1) * 100
+                trend = f" ({change:+.0f}% önceki ort.)"
+            if 'entries' in run:
+                detail = f"{run['entries']} indeks kaydı"
+            else:
+                detail = (f"{run['files']} dosya  {run['files_per_sec']:.1f} dosya/sn  "
+                          f"{self.format_size(run['bytes_per_sec'])}/sn{trend}")
+            print(f"   {run['finished_at'][:19]}  {run['operation']:<8} {run['duration']:8.2f} sn  {detail}")
+    
     def show_statistics(self):
         """İstatistikleri göster"""
         print("\n📊 İSTATİSTİKLER")
         print("-" * 30)
         
-        # HTML dosyaları
         html_dir = Path(self.output_dir)
-        if html_dir.exists():
-            html_files = list(html_dir.rglob("*.html"))
-            total_html_size = sum(f.stat().st_size for f in html_files if f.is_file())
-            print(f"📄 HTML Dosyaları: {len(html_files)} adet")
-            print(f"💾 HTML Toplam Boyut: {self.format_size(total_html_size)}")
-        else:
-            print("📄 HTML Dosyaları: Henüz oluşturulmadı")
-        
-        # JSON dosyaları
         json_dir = Path(self.json_output_dir)
-        if json_dir.exists():
-            json_files = list(json_dir.rglob("*.json"))
-            total_json_size = sum(f.stat().st_size for f in json_files if f.is_file())
-            print(f"📋 JSON Dosyaları: {len(json_files)} adet")
-            print(f"💾 JSON Toplam Boyut: {self.format_size(total_json_size)}")
-        else:
-            print("📋 JSON Dosyaları: Henüz oluşturulmadı")
         
-        # İndeks dosyası
-        index_file = json_dir / "file_index.json"
+        if self.storage_backend == "sqlite" and Path(self.sqlite_path).exists():
+            self.print_store_stats()
+        
+        # Sayılar dosya sistemi taranmadan, scraper ve dönüştürücünün kataloglarından okunur
+        html_summary = self.load_catalog(html_dir, "html")
+        json_summary = self.load_catalog(json_dir, "json")
+        self.print_catalog(html_summary, "HTML", "📄")
+        self.print_catalog(json_summary, "JSON", "📋")
+        
+        # İndeks dosyası (scraper tarafından HTML klasörüne yazılır)
+        index_file = html_dir / "file_index.json"
         if index_file.exists():
             print(f"📑 İndeks Dosyası: {index_file}")
             print(f"📅 Oluşturulma Tarihi: {datetime.fromtimestamp(index_file.stat().st_mtime)}")
@@ -207,6 +462,20 @@ class NoterlikApp:
         if master_index.exists():
             print(f"📑 Ana İndeks Dosyası: {master_index}")
             print(f"📅 Oluşturulma Tarihi: {datetime.fromtimestamp(master_index.stat().st_mtime)}")
+        
+        self.print_run_history([html_summary, json_summary])
+    
+    def print_store_stats(self):
+        """SQLite deposundaki sayfa/doküman toplamlarını sorgu ile yazdır"""
+        with SQLiteStore(self.sqlite_path) as store:
+            stats = store.stats(top=3)
+        
+        print(f"🗄️ Veritabanı: {self.sqlite_path} ({self.format_size(stats['database_bytes'])})")
+        for kind, label in (("pages", "Sayfa"), ("documents", "Doküman")):
+            print(f"   {label}: {stats[kind]['files']} adet, {self.format_size(stats[kind]['bytes'])}")
+            for rollup in stats[kind]['directories']:
+                print(f"   └─ {rollup['directory']}: {rollup['files']} kayıt, {self.format_size(rollup['bytes'])}")
+        print(f"   URL Eşlemesi: {stats['url_mappings']}  İndeks Satırı: {stats['index_rows']}")
     
     def print_summary(self):
         """İşlem özetini yazdır"""
@@ -216,13 +485,13 @@ class NoterlikApp:
         html_dir = Path(self.output_dir)
         json_dir = Path(self.json_output_dir)
         
-        if html_dir.exists():
-            html_files = list(html_dir.rglob("*.html"))
-            print(f"✅ İndirilen HTML Dosyaları: {len(html_files)}")
+        html_summary = self.load_catalog(html_dir, "html")
+        if html_summary:
+            print(f"✅ İndirilen HTML Dosyaları: {html_summary['files']}")
         
-        if json_dir.exists():
-            json_files = list(json_dir.rglob("*.json"))
-            print(f"✅ Oluşturulan JSON Dosyaları: {len(json_files)}")
+        json_summary = self.load_catalog(json_dir, "json")
+        if json_summary:
+            print(f"✅ Oluşturulan JSON Dosyaları: {json_summary['files']}")
         
         print(f"📁 HTML Çıktı Klasörü: {html_dir.absolute()}")
         print(f"📁 JSON Çıktı Klasörü: {json_dir.absolute()}")
@@ -249,7 +518,7 @@ class NoterlikApp:
             self.print_menu()
             
             try:
-                choice = input("\nSeçiminizi yapın (1-7): ").strip()
+                choice = input("\nSeçiminizi yapın (1-8): ").strip()
                 
                 if choice == "1":
                     await self.run_scraping()
@@ -270,11 +539,14 @@ class NoterlikApp:
                     self.show_statistics()
                     
                 elif choice == "7":
+                    await self.run_daemon()
+                    
+                elif choice == "8":
                     print("\n👋 Uygulama kapatılıyor...")
                     break
                     
                 else:
-                    print("\n❌ Geçersiz seçim! Lütfen 1-7 arasında bir sayı girin.")
+                    print("\n❌ Geçersiz seçim! Lütfen 1-8 arasında bir sayı girin.")
                 
                 input("\nDevam etmek için Enter'a basın...")
                 
@@ -294,7 +566,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n👋 Uygulama kapatıldı.")
     except Exception as e:
@@ -0,0 +1,357 @@
+"""
+Korpus Erişim Kütüphanesi
+Bu modül dönüştürücü çıktısı (json_output/) üzerinde içe aktarılabilir bir Corpus API'si
+sunar: dokümanlar tembel olarak gezilir, URL veya yol ile bulunur, yalnızca istenen
+alanlar döndürülür ve master_index.json üzerinden doküman dosyalarına dokunmadan
+filtreleme yapılır. Çözülmüş dokümanlar boyut sınırlı bir LRU önbellekte tutulur.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urldefrag
+
+from raw_store import RawHTMLStore, load_raw_html
+from stats_catalog import INDEX_FILES
+
+logger = logging.getLogger(__name__)
+
+
+def copy_document(value: Any) -> Any:
+    """JSON dokümanının derin kopyası (yalnızca dict/list iç içe geçer, copy.deepcopy'den hızlı)"""
+    if isinstance(value, dict):
+        return {key: copy_document(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_document(item) for item in value]
+    return value
+
+
+class DocumentCache:
+    """Doküman sayısı ve yaklaşık bayt boyutu ile sınırlı, iş parçacığı güvenli LRU önbellek
+
+    get() varsayılan olarak kopya döndürür; çağıranın dokümanı değiştirmesi önbellekteki
+    nesneyi ve sonraki okuyucuları etkilemez.
+    """
+
+    def __init__(self, max_documents: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str, copy: bool = True) -> Optional[Dict[str, Any]]:
+        """Önbellekteki dokümanı döndür ve en son kullanılan olarak işaretle
+
+        copy=False paylaşılan nesneyi döndürür; yalnızca dokümanı değiştirmeyen iç okuyucular içindir.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.stats['misses'] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats['hits'] += 1
+            document = item[0]
+        return copy_document(document) if copy else document
+
+    def put(self, key: str, document: Dict[str, Any], size: int):
+        """Dokümanı ekle, sınırlar aşılırsa en eski kullanılanları çıkar"""
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._items[key] = (document, size)
+            self.total_bytes += size
+
+            while self._items and (len(self._items) > self.max_documents or
+                                   (self.total_bytes > self.max_bytes and len(self._items) > 1)):
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        """Önbelleği boşalt"""
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+
+def project(document: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Dokümandan yalnızca istenen alanları (noktalı yol, ör. 'metadata.title') içeren kopya döndür"""
+    result: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split('.')
+        value: Any = document
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                value = None
+                break
+            value = value[part]
+
+        target = result
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return result
+
+
+def _matches(entry: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
+    """İndeks satırının filtre ölçütlerine uyup uymadığını denetle"""
+    for field, expected in criteria.items():
+        value = entry.get(field)
+        if callable(expected):
+            if not expected(value):
+                return False
+        elif isinstance(expected, (list, tuple, set, frozenset)):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class Corpus:
+    """Dönüştürülmüş JSON dokümanlarına önbellekli erişim"""
+
+    def __init__(self, json_dir: str = "json_output", html_dir: str = "db",
+                 max_documents: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.json_dir = Path(json_dir)
+        self.html_dir = Path(html_dir)
+        self.cache = DocumentCache(max_documents, max_bytes)
+        self._entries: Optional["OrderedDict[str, Dict[str, Any]]"] = None
+        self._url_paths: Optional[Dict[str, str]] = None
+        self._path_urls: Optional[Dict[str, str]] = None
+        self._raw_store: Optional[RawHTMLStore] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        """Doküman yolunu json_dir'e göreli, '/' ayraçlı anahtara çevir"""
+        return Path(path).with_suffix('.json').as_posix()
+
+    # İndeks
+
+    @property
+    def entries(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """Doküman anahtarı -> master_index.json satırı (ilk erişimde yüklenir)"""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            index_path = self.json_dir / "master_index.json"
+            if index_path.exists():
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for entry in json.load(f).get("files", []):
+                        self._entries[self._key(entry["file_path"])] = entry
+            else:
+                # İndeks yoksa yalnızca yolları listele; filtreler boş satırlar üzerinde çalışır
+                logger.warning(f"Ana indeks bulunamadı, dosya listesi kullanılıyor: {index_path}")
+                for json_file in sorted(self.json_dir.rglob("*.json")):
+                    if json_file.name not in INDEX_FILES:
+                        key = json_file.relative_to(self.json_dir).as_posix()
+                        self._entries[key] = {"file_path": key}
+        return self._entries
+
+    def _load_url_mapping(self):
+        """Scraper'ın file_index.json yol eşlemesinden URL <-> doküman anahtarı tablolarını kur"""
+        self._url_paths, self._path_urls = {}, {}
+        index_path = self.html_dir / "file_index.json"
+        if not index_path.exists():
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            path_mapping = json.load(f).get("path_mapping", {})
+        for url, html_path in path_mapping.items():
+            key = self._key(html_path)
+            self._url_paths[self._normalize_url(url)] = key
+            self._path_urls.setdefault(key, url)
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Fragment ve sondaki eğik çizgiyi at"""
+        return urldefrag(url)[0].rstrip('/')
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, path_or_url: str) -> bool:
+        return self.resolve(path_or_url) is not None
+
+    def keys(self) -> List[str]:
+        """Tüm doküman anahtarları (indeks sırasıyla)"""
+        return list(self.entries)
+
+    def resolve(self, path_or_url: str) -> Optional[str]:
+        """URL veya yolu doküman anahtarına çevir, bulunamazsa None döndür"""
+        if '://' in path_or_url:
+            if self._url_paths is None:
+                self._load_url_mapping()
+            key = self._url_paths.get(self._normalize_url(path_or_url))
+        else:
+            key = self._key(path_or_url)
+        if key is None:
+            return None
+        if key in self.entries or (self.json_dir / key).exists():
+            return key
+        return None
+
+    def url_of(self, path: str) -> Optional[str]:
+        """Dokümanın kaynak URL'sini döndür"""
+        if self._path_urls is None:
+            self._load_url_mapping()
+        return self._path_urls.get(self._key(path))
+
+    def entry(self, path_or_url: str) -> Optional[Dict[str, Any]]:
+        """Dokümanın indeks satırını döndür (doküman dosyası açılmaz)"""
+        key = self.resolve(path_or_url)
+        return self.entries.get(key) if key else None
+
+    def filter(self, predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+               **criteria: Any) -> List[Dict[str, Any]]:
+        """İndeks satırlarını filtrele
+
+        Ölçütler alan adı ile verilir; değer sabitse eşitlik, liste/küme ise üyelik,
+        çağrılabilir ise o fonksiyonun sonucu kullanılır.
+        Örnek: corpus.filter(doc_type="kanun", doc_year=lambda y: y and y >= 2000)
+        """
+        return [
+            entry for entry in self.entries.values()
+            if _matches(entry, criteria) and (predicate is None or predicate(entry))
+        ]
+
+    # Dokümanlar
+
+    def _read(self, key: str) -> Tuple[Dict[str, Any], int]:
+        """Doküman dosyasını oku ve çöz"""
+        with open(self.json_dir / key, 'rb') as f:
+            data = f.read()
+        return json.loads(data), len(data)
+
+    def _load_shared(self, path_or_url: str) -> Dict[str, Any]:
+        """Önbellekteki paylaşılan dokümanı döndür (çağıran değiştirmemeli)"""
+        key = self.resolve(path_or_url)
+        if key is None:
+            raise KeyError(f"Doküman bulunamadı: {path_or_url}")
+
+        document = self.cache.get(key, copy=False)
+        if document is None:
+            document, size = self._read(key)
+            self.cache.put(key, document, size)
+        return document
+
+    def load(self, path_or_url: str) -> Dict[str, Any]:
+        """Dokümanın tamamını (önbellekten veya diskten) döndür
+
+        Dönen sözlük çağıranındır; değiştirilmesi önbelleği etkilemez.
+        """
+        return copy_document(self._load_shared(path_or_url))
+
+    def get(self, path_or_url: str, fields: Optional[Iterable[str]] = None,
+            default: Any = None) -> Any:
+        """Dokümanı veya yalnızca istenen alanlarını döndür, bulunamazsa default"""
+        try:
+            document = self._load_shared(path_or_url)
+        except KeyError:
+            return default
+        # Yalnızca istenen alanlar kopyalanır
+        return copy_document(project(document, fields) if fields else document)
+
+    def __getitem__(self, path_or_url: str) -> Dict[str, Any]:
+        return self.load(path_or_url)
+
+    def iter_documents(self, fields: Optional[Iterable[str]] = None,
+                       keys: Optional[Iterable[str]] = None, cache: bool = False,
+                       **criteria: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Dokümanları tek tek (tembel) gez
+
+        Ölçütler filter() ile aynıdır ve doküman açılmadan indeks üzerinde uygulanır.
+        Tarama amaçlı gezinti varsayılan olarak önbelleği kirletmez (cache=False).
+        """
+        fields = list(fields) if fields else None
+        if keys is None:
+            keys = (self._key(entry["file_path"]) for entry in self.filter(**criteria))
+
+        for key in keys:
+            document = self.cache.get(key, copy=False)
+            shared = document is not None
+            if document is None:
+                try:
+                    document, size = self._read(key)
+                except Exception as e:
+                    logger.error(f"Doküman okuma hatası ({key}): {str(e)}")
+                    continue
+                if cache:
+                    self.cache.put(key, document, size)
+                    shared = True
+            result = project(document, fields) if fields else document
+            yield key, copy_document(result) if shared else result
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return self.iter_documents()
+
+    def prefetch(self, paths_or_urls: Iterable[str], max_workers: int = 8) -> int:
+        """Dokümanları paralel okuyup önbelleğe al, yüklenen doküman sayısını döndür"""
+        keys: Dict[str, None] = {}
+        for path_or_url in paths_or_urls:
+            key = self.resolve(path_or_url)
+            if key is not None and key not in self.cache:
+                keys[key] = None
+
+        # Önbellek sınırından fazlasını okumak yalnızca hemen çıkarılacak dokümanlar üretir
+        keys = list(keys)[:self.cache.max_documents]
+        if not keys:
+            return 0
+
+        loaded = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for key, result in zip(keys, executor.map(self._safe_read, keys)):
+                if result is not None:
+                    self.cache.put(key, *result)
+                    loaded += 1
+        return loaded
+
+    def _safe_read(self, key: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Okuma hatasını loglayıp None döndüren _read"""
+        try:
+            return self._read(key)
+        except Exception as e:
+            logger.error(f"Doküman okuma hatası ({key}): {str(e)}")
+            return None
+
+    def raw_html(self, path_or_url: str) -> Optional[str]:
+        """Dokümanın ham HTML'ini (inline veya paket deposundan) döndür"""
+        if self._raw_store is None:
+            self._raw_store = RawHTMLStore(self.json_dir)
+        return load_raw_html(self._load_shared(path_or_url), self.json_dir, self._raw_store)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Önbellek istatistikleri"""
+        return {
+            **self.cache.stats,
+            'documents': len(self.cache),
+            'bytes': self.cache.total_bytes,
+            'max_documents': self.cache.max_documents,
+            'max_bytes': self.cache.max_bytes
+        }
+
+    def close(self):
+        """Açık dosyaları kapat ve önbelleği boşalt"""
+        if self._raw_store is not None:
+            self._raw_store.close()
+            self._raw_store = None
+        self.cache.clear()
@@ -0,0 +1,378 @@
+"""
+Dağıtık (Shard'lı) Web Scraper
+Bu modül URL uzayını tutarlı hashing ile N işçi sürecine böler. Her işçi kendi
+oturumu ve kuyruğu ile çalışır, başka shard'a ait linkler koordinatör üzerinden
+sahibine iletilir. Tarama sonunda koordinatör file_index.json ve istatistikleri birleştirir.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from link_graph import GRAPH_NAME, LinkGraphBuilder
+from sqlite_store import SQLiteStore
+from stats_catalog import StatsCatalog
+from transport import DEFAULT_PROFILE, run
+from web_scraper import AsyncWebScraper, HierarchicalIndexer
+
+logger = logging.getLogger(__name__)
+
+
+def shard_key(url: str) -> str:
+    """URL'nin shard anahtarını döndür
+
+    Anahtar, HierarchicalIndexer'ın çakışma sayacında kullandığı temel dosya adıdır.
+    Böylece aynı ada sahip tüm sayfalar aynı shard'a düşer ve farklı işçiler
+    aynı dosyanın üzerine yazamaz.
+    """
+    path_parts = urlparse(url).path.strip('/').split('/')
+    if not path_parts or path_parts == ['']:
+        return "index"
+
+    filename = path_parts[-1]
+    if not filename.endswith('.html'):
+        filename += '.html'
+    return filename.replace('.html', '')
+
+
+class ConsistentHashRing:
+    """Sanal düğümlü tutarlı hash halkası"""
+
+    def __init__(self, nodes: List[int], vnodes: int = 64):
+        self.vnodes = vnodes
+        self._ring: List[Tuple[int, int]] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Anahtarın halka üzerindeki konumunu hesapla"""
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    def add_node(self, node: int):
+        """Halkaya düğüm ekle"""
+        for i in range(self.vnodes):
+            bisect.insort(self._ring, (self._hash(f"{node}#{i}"), node))
+
+    def remove_node(self, node: int):
+        """Halkadan düğüm çıkar"""
+        self._ring = [entry for entry in self._ring if entry[1] != node]
+
+    def get_node(self, key: str) -> int:
+        """Anahtarın sahibi olan düğümü döndür"""
+        if not self._ring:
+            raise ValueError("Hash halkası boş")
+
+        position = bisect.bisect(self._ring, (self._hash(key), -1))
+        if position == len(self._ring):
+            position = 0
+        return self._ring[position][1]
+
+    def owner_of(self, url: str) -> int:
+        """URL'nin sahibi olan shard'ı döndür"""
+        return self.get_node(shard_key(url))
+
+
+async def _run_shard(shard_id: int, num_shards: int, vnodes: int, base_url: str,
+                     output_dir: str, max_concurrent: int, inbox, outbox, store_path: Optional[str] = None,
+                     transport: str = DEFAULT_PROFILE):
+    """Tek bir shard'ın tarama döngüsü"""
+    loop = asyncio.get_running_loop()
+    ring = ConsistentHashRing(list(range(num_shards)), vnodes)
+    received = 0
+    reported = None
+    stopping = False
+
+    # Her işçi veritabanına kendi bağlantısıyla yazar (WAL + busy_timeout ile sıralanır)
+    store = SQLiteStore(store_path) if store_path else None
+
+    # Başka shard'a ait linkler yerel kuyruğa hiç girmez, koordinatöre iletilmek üzere toplanır
+    # Ön ısıtma shard'lara bölünür: toplamda tek bir taramacının havuzu kadar HEAD isteği gider
+    async with AsyncWebScraper(base_url, output_dir, max_concurrent, store=store, transport=transport,
+                               owns=lambda url: ring.owner_of(url) == shard_id,
+                               prewarm=-(-max_concurrent // num_shards)) as scraper:
+        scraper.stats['start_time'] = datetime.now()
+        # Yazılan dosyalar işçinin kataloğu üzerinden ortak boyut günlüğüne eklenir;
+        # toplamları yalnızca koordinatör işler
+        scraper.catalog.begin_run("shard")
+
+        while not stopping:
+            # Gelen kutusunu bloklamadan boşalt
+            while True:
+                try:
+                    message = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if message is None:
+                    stopping = True
+                    break
+                received += len(message)
+                scraper.enqueue(message)
+
+            if stopping:
+                break
+
+            if scraper.pending_urls:
+                await scraper.process_batch()
+
+                # Başka shard'a ait linkleri koordinatöre ilet
+                new_links = scraper.take_foreign_urls()
+                if new_links:
+                    outbox.put(('links', shard_id, new_links))
+                continue
+
+            # Kuyruk boş: boşta olduğunu bildir ve yeni iş bekle
+            if reported != received:
+                outbox.put(('idle', shard_id, received))
+                reported = received
+
+            message = await loop.run_in_executor(None, inbox.get)
+            if message is None:
+                break
+            received += len(message)
+            scraper.enqueue(message)
+
+        scraper.stats['end_time'] = datetime.now()
+        scraper.catalog.flush()
+        written = scraper.catalog.end_run()
+        for url in scraper.failed_urls:
+            scraper.link_graph.mark_failed(url)
+        outbox.put(('done', shard_id, {
+            'stats': scraper.stats,
+            'visited': len(scraper.visited_urls),
+            'failed_urls': sorted(scraper.failed_urls),
+            'path_mapping': scraper.indexer.path_mapping,
+            'file_counter': scraper.indexer.file_counter,
+            'link_graph': scraper.link_graph.to_payload(),
+            'written': {'files': written['files'], 'bytes': written['bytes']}
+        }))
+
+    if store is not None:
+        store.close()
+
+
+def _setup_worker_logging(shard_id: int, log_queue):
+    """İşçinin log kayıtlarını koordinatöre yönlendir
+
+    web_scraper import edilirken kök logger'a scraper.log dosya handler'ı eklenir; her işçi
+    aynı dosyaya eşzamansız yazmasın diye bu handler'lar kaldırılır ve kayıtlar kuyruk
+    üzerinden koordinatörün handler'larına tek noktadan yazdırılır.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter(f"[shard {shard_id}] %(message)s"))
+    root.addHandler(handler)
+
+
+def _shard_worker(shard_id: int, num_shards: int, vnodes: int, base_url: str,
+                  output_dir: str, max_concurrent: int, inbox, outbox, store_path: Optional[str] = None,
+                  transport: str = DEFAULT_PROFILE, log_queue=None):
+    """İşçi süreç giriş noktası (uvloop kuruluysa onun döngüsüyle)"""
+    if log_queue is not None:
+        _setup_worker_logging(shard_id, log_queue)
+    try:
+        run(_run_shard(shard_id, num_shards, vnodes, base_url,
+                       output_dir, max_concurrent, inbox, outbox, store_path, transport))
+    except Exception as e:
+        logger.error(f"Shard {shard_id} hatası: {str(e)}")
+        outbox.put(('error', shard_id, str(e)))
+
+
+class ShardedCrawlCoordinator:
+    """Shard'lı tarama koordinatörü
+
+    İşçiler arasındaki protokol yalnızca düz Python demetlerinden oluşur:
+    koordinatör → işçi: URL listesi veya durdurma için None;
+    işçi → koordinatör: ('links', shard, urls), ('idle', shard, alınan_url_sayısı),
+    ('done', shard, sonuç) ve ('error', shard, mesaj).
+    Kuyruklar multiprocessing.managers üzerinden ağa açılan kuyruklarla
+    değiştirilerek aynı protokol birden fazla makineye taşınabilir.
+    """
+
+    def __init__(self, base_url: str, output_dir: str = "db", num_workers: Optional[int] = None,
+                 max_concurrent: int = 50, vnodes: int = 64, store: Optional[SQLiteStore] = None,
+                 transport: str = DEFAULT_PROFILE):
+        self.base_url = base_url.rstrip('/')
+        self.output_dir = Path(output_dir)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent
+        self.vnodes = vnodes
+        self.ring = ConsistentHashRing(list(range(self.num_workers)), vnodes)
+        self.catalog = StatsCatalog(self.output_dir, kind="html")
+        self.store = store
+        # İşçilere yalnızca profil adı aktarılır; her işçi kendi bağlantı havuzunu kurar
+        self.transport = transport
+        self.stats: Dict[str, Any] = {
+            'downloaded': 0,
+            'failed': 0,
+            'skipped': 0,
+            'visited': 0,
+            'start_time': None,
+            'end_time': None,
+            'shards': {}
+        }
+
+        # Çıktı dizinini oluştur
+        self.output_dir.mkdir(exist_ok=True)
+
+    async def crawl(self, start_url: str, poll_interval: float = 1.0) -> Dict[str, Any]:
+        """Shard'lı taramayı başlat ve birleştirilmiş istatistikleri döndür"""
+        self.stats['start_time'] = datetime.now()
+        self.catalog.begin_run("scrape")
+        logger.info(f"Shard'lı scraping başlatılıyor: {start_url} ({self.num_workers} işçi)")
+
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context("spawn")
+        outbox = ctx.Queue()
+        inboxes = [ctx.Queue() for _ in range(self.num_workers)]
+        # İşçi logları koordinatörün handler'larına (scraper.log, konsol) tek süreçten yazılır
+        log_queue = ctx.Queue()
+        log_listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers,
+                                                      respect_handler_level=True)
+        log_listener.start()
+        processes = [
+            ctx.Process(
+                target=_shard_worker,
+                args=(shard_id, self.num_workers, self.vnodes, self.base_url,
+                      str(self.output_dir), self.max_concurrent, inboxes[shard_id], outbox,
+                      str(self.store.path) if self.store is not None else None, self.transport,
+                      log_queue),
+                daemon=True
+            )
+            for shard_id in range(self.num_workers)
+        ]
+        for process in processes:
+            process.start()
+
+        sent = [0] * self.num_workers
+        idle: Dict[int, int] = {}
+        results: Dict[int, Dict[str, Any]] = {}
+
+        def route(urls: List[str]):
+            """URL'leri sahibi olan shard'lara dağıt"""
+            groups: Dict[int, List[str]] = {}
+            for url in urls:
+                groups.setdefault(self.ring.owner_of(url), []).append(url)
+            for owner, group in groups.items():
+                inboxes[owner].put(group)
+                sent[owner] += len(group)
+
+        def next_message():
+            """Koordinatör kuyruğundan bir mesaj al, süreçlerin canlılığını denetle"""
+            while True:
+                try:
+                    return outbox.get(timeout=poll_interval)
+                except queue.Empty:
+                    dead = [i for i, p in enumerate(processes)
+                            if not p.is_alive() and i not in results]
+                    if dead:
+                        raise RuntimeError(f"İşçi süreç beklenmedik şekilde sonlandı: {dead}")
+
+        try:
+            route([start_url])
+
+            # Tüm işçiler boşta ve gönderilen her URL'yi almışsa tarama bitmiştir
+            while not (len(idle) == self.num_workers and
+                       all(idle[i] == sent[i] for i in range(self.num_workers))):
+                kind, shard_id, payload = await loop.run_in_executor(None, next_message)
+                if kind == 'links':
+                    route(payload)
+                elif kind == 'idle':
+                    idle[shard_id] = payload
+                elif kind == 'error':
+                    raise RuntimeError(f"Shard {shard_id} hatası: {payload}")
+
+            for inbox in inboxes:
+                inbox.put(None)
+
+            while len(results) < self.num_workers:
+                kind, shard_id, payload = await loop.run_in_executor(None, next_message)
+                if kind == 'done':
+                    results[shard_id] = payload
+                elif kind == 'error':
+                    raise RuntimeError(f"Shard {shard_id} hatası: {payload}")
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            log_listener.stop()
+
+        self.stats['end_time'] = datetime.now()
+        self.merge_results(results)
+
+        duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+        logger.info(f"Shard'lı scraping tamamlandı!")
+        logger.info(f"Toplam süre: {duration:.2f} saniye")
+        logger.info(f"İndirilen dosya: {self.stats['downloaded']}")
+        logger.info(f"Başarısız: {self.stats['failed']}")
+        logger.info(f"Toplam ziyaret edilen URL: {self.stats['visited']}")
+
+        return self.stats
+
+    def merge_results(self, results: Dict[int, Dict[str, Any]]):
+        """Shard sonuçlarını tek bir file_index.json, link grafiği ve istatistikte birleştir"""
+        indexer = HierarchicalIndexer()
+        link_graph = LinkGraphBuilder()
+
+        for shard_id in sorted(results):
+            result = results[shard_id]
+            shard_stats = result['stats']
+
+            # Shard anahtarı temel dosya adı olduğundan sayaçlar çakışmaz
+            indexer.path_mapping.update(result['path_mapping'])
+            indexer.file_counter.update(result['file_counter'])
+            link_graph.merge_payload(result['link_graph'])
+            self.catalog.count_written(result['written']['files'], result['written']['bytes'])
+
+            for key in ('downloaded', 'failed', 'skipped'):
+                self.stats[key] += shard_stats[key]
+            self.stats['visited'] += result['visited']
+            self.stats['shards'][shard_id] = {
+                'downloaded': shard_stats['downloaded'],
+                'failed': shard_stats['failed'],
+                'visited': result['visited']
+            }
+
+        index_path = self.output_dir / "file_index.json"
+        indexer.save_index(str(index_path))
+        logger.info(f"Birleştirilmiş indeks kaydedildi: {index_path}")
+        if self.store is not None:
+            self.store.put_url_mappings(indexer.path_mapping, indexer.file_counter)
+
+        graph = link_graph.build()
+        graph.save(self.output_dir / GRAPH_NAME)
+        logger.info(f"Birleştirilmiş link grafiği kaydedildi: {graph.node_count} düğüm, {graph.edge_count} kenar")
+
+        self.catalog.end_run(
+            downloaded=self.stats['downloaded'],
+            failed=self.stats['failed'],
+            visited=self.stats['visited'],
+            workers=self.num_workers
+        )
+        self.catalog.save()
+
+
+async def main():
+    """Ana fonksiyon"""
+    base_url = "http://127.0.0.1:8000/9B2F1556-3672-40F0-987D-D82A926AEFA4/index.html"
+    output_dir = "db"
+
+    coordinator = ShardedCrawlCoordinator(base_url, output_dir, max_concurrent=30)
+    await coordinator.crawl(base_url)
+
+
+if __name__ == "__main__":
+    run(main())
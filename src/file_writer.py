@@ -0,0 +1,247 @@
+"""
+Asenkron Dosya Yazıcı
+Bu modül çok sayıda küçük dosyayı sınırlı bir yazma kuyruğu, dizin oluşturma önbelleği
+ve boyutlandırılmış bir thread havuzunda toplu yazma ile diske kaydeder. Her dosya geçici
+bir dosyaya yazılıp atomik olarak yeniden adlandırılır; fsync davranışı ayarlanabilir.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# fsync politikaları
+#   none: fsync yapılmaz, işletim sistemi önbelleğine güvenilir (en hızlı)
+#   file: her dosya yeniden adlandırılmadan önce fsync edilir
+#   full: dosyaya ek olarak batch içindeki her dizin bir kez fsync edilir
+FSYNC_POLICIES = ("none", "file", "full")
+
+
+class AsyncFileWriter:
+    """Kuyruk tabanlı, batch'li ve atomik dosya yazıcı"""
+
+    def __init__(self, max_workers: int = 4, batch_size: int = 64, queue_size: int = 1024,
+                 fsync_policy: str = "none", encoding: str = "utf-8",
+                 on_written: Optional[Callable[[Path, int], None]] = None):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Geçersiz fsync politikası: {fsync_policy} (seçenekler: {', '.join(FSYNC_POLICIES)})")
+
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.fsync_policy = fsync_policy
+        self.encoding = encoding
+        # Her başarılı yazımdan sonra (yol, bayt) ile olay döngüsü thread'inde çağrılır
+        self.on_written = on_written
+        self.stats = {
+            'files': 0,
+            'chars': 0,
+            'bytes': 0,
+            'batches': 0,
+            'errors': 0,
+            'dirs_created': 0
+        }
+
+        self._known_dirs: Set[str] = set()
+        self._dir_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._pending_batches: Set[asyncio.Future] = set()
+        self._temp_counter = 0
+
+    async def __aenter__(self):
+        """Async context manager girişi"""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager çıkışı"""
+        await self.close()
+
+    def start(self):
+        """Yazma kuyruğunu ve thread havuzunu başlat"""
+        if self._consumer is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-writer")
+        self._in_flight = asyncio.Semaphore(self.max_workers)
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def submit(self, path: Union[str, Path], content: str) -> asyncio.Future:
+        """Dosyayı yazma kuyruğuna ekle, yazıldığında tamamlanan future döndür"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        # Kuyruk doluysa burada bekler (geri basınç)
+        await self._queue.put((Path(path), content, future))
+        return future
+
+    async def write(self, path: Union[str, Path], content: str):
+        """Dosyayı yaz ve diske kaydedilene kadar bekle"""
+        future = await self.submit(path, content)
+        await future
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Engelleyici bir işi (ör. ham HTML paketine ekleme) yazıcının thread havuzunda çalıştır"""
+        self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def close(self):
+        """Kuyruktaki tüm dosyaları yaz ve thread havuzunu kapat"""
+        if self._consumer is None:
+            return
+
+        await self._queue.put(None)
+        await self._consumer
+        if self._pending_batches:
+            await asyncio.gather(*self._pending_batches, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+        self._consumer = None
+        self._executor = None
+        self._queue = None
+
+    async def _consume(self):
+        """Kuyruktan batch'ler oluştur ve thread havuzuna gönder"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._in_flight.acquire()
+            jobs = [(path, content) for path, content, _ in batch]
+            task = loop.run_in_executor(self._executor, self._write_batch, jobs)
+            self._pending_batches.add(task)
+            task.add_done_callback(lambda t, b=batch: self._finish_batch(t, b))
+
+    def _finish_batch(self, task: asyncio.Future, batch: List[Tuple[Path, str, asyncio.Future]]):
+        """Batch sonuçlarını bekleyen future'lara dağıt"""
+        self._pending_batches.discard(task)
+        self._in_flight.release()
+
+        if task.cancelled():
+            # Kapanış sırasında iptal edilen batch: bekleyenler sonsuza kadar asılı kalmasın
+            for _, _, future in batch:
+                if not future.done():
+                    future.cancel()
+            return
+
+        if task.exception() is not None:
+            results = [task.exception()] * len(batch)
+        else:
+            results = task.result()
+
+        for (path, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                if not future.done():
+                    future.set_exception(result)
+                continue
+            if self.on_written is not None:
+                try:
+                    self.on_written(path, result)
+                except Exception as e:
+                    logger.error(f"Yazma sonrası geri çağırma hatası ({path}): {str(e)}")
+            if not future.done():
+                future.set_result(str(path))
+
+    def _ensure_dir(self, directory: Path):
+        """Dizini önbellekte yoksa oluştur"""
+        key = str(directory)
+        if key in self._known_dirs:
+            return
+
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._dir_lock:
+            if key not in self._known_dirs:
+                self._known_dirs.add(key)
+                self.stats['dirs_created'] += 1
+
+    def _write_batch(self, jobs: List[Tuple[Path, str]]) -> List[Union[int, Exception]]:
+        """Bir batch dosyayı thread içinde yaz, her dosya için bayt boyutunu veya hatayı döndür"""
+        results: List[Union[int, Exception]] = []
+        touched_dirs: Set[str] = set()
+        written = 0
+        written_chars = 0
+        written_bytes = 0
+
+        for path, content in jobs:
+            try:
+                self._ensure_dir(path.parent)
+
+                with self._dir_lock:
+                    self._temp_counter += 1
+                    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{self._temp_counter}.tmp")
+
+                try:
+                    with open(temp_path, 'w', encoding=self.encoding) as f:
+                        f.write(content)
+                        f.flush()
+                        size = os.fstat(f.fileno()).st_size
+                        if self.fsync_policy != "none":
+                            os.fsync(f.fileno())
+                    os.replace(temp_path, path)
+                except BaseException:
+                    if temp_path.exists():
+                        temp_path.unlink()
+                    raise
+
+                touched_dirs.add(str(path.parent))
+                written += 1
+                written_chars += len(content)
+                written_bytes += size
+                results.append(size)
+
+            except Exception as e:
+                logger.error(f"Dosya yazma hatası ({path}): {str(e)}")
+                results.append(e)
+
+        if self.fsync_policy == "full":
+            for directory in touched_dirs:
+                self._fsync_dir(directory)
+
+        with self._dir_lock:
+            self.stats['files'] += written
+            self.stats['chars'] += written_chars
+            self.stats['bytes'] += written_bytes
+            self.stats['batches'] += 1
+            self.stats['errors'] += len(jobs) - written
+
+        return results
+
+    @staticmethod
+    def _fsync_dir(directory: str):
+        """Yeniden adlandırmaların kalıcı olması için dizini fsync et"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            # Windows dizin fsync desteklemez
+            return
+
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Yazma istatistiklerini döndür"""
+        return dict(self.stats, fsync_policy=self.fsync_policy)
@@ -0,0 +1,232 @@
+"""
+Öncelikli Tarama Sınırı (Frontier)
+Bu modül taranacak URL'leri sırasız bir küme yerine puana göre sıralı bir yığında (heap)
+tutar. Puan değiştirilebilir bir fonksiyondur; varsayılan puan URL kalıbı, derinlik, link
+metni ve o ana kadar görülen giriş derecesini birleştirerek mevzuat dokümanlarını
+listeleme/gezinme sayfalarından önce indirir. Her batch içinde aynı dizinden alınan her
+URL'nin puanı düşürülür, böylece tek bir dizin batch'leri tekeline almaz.
+"""
+
+import heapq
+import math
+import posixpath
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from legal_extractor import DOC_TYPE_KEYWORDS, tr_lower
+
+# score(url, info) -> float; info: depth, anchor, in_degree. Yüksek puan önce indirilir.
+ScoreFunction = Callable[[str, Dict[str, Any]], float]
+
+DOC_KEYWORDS = tuple(keyword for keyword, _ in DOC_TYPE_KEYWORDS)
+
+DOCUMENT_URL_PATTERN = re.compile(r'(?:\d+-sayili|(?:19|20)\d{2}[-_/]\d+|sayi[-_]?\d+)')
+NAVIGATION_URL_PATTERN = re.compile(
+    r'(?:^|[/_-])(?:index|liste|listesi|kategori|kategoriler|sayfa|page|arsiv|etiket|tag|ara|arama|search)'
+    r'(?:[/_.-]|\d|$)'
+)
+PAGINATION_QUERY_PATTERN = re.compile(r'(?:^|&)(?:page|sayfa|p|start|offset)=', re.IGNORECASE)
+
+DOCUMENT_ANCHOR_PATTERN = re.compile(r'(?:\d+\s+sayılı|(?:19|20)\d{2}/\d+)')
+NAVIGATION_ANCHOR_WORDS = ('sonraki', 'önceki', 'ileri', 'geri', 'ana sayfa', 'anasayfa', 'tümü',
+                           'başa dön', 'son sayfa', 'ilk sayfa', '»', '«')
+
+# Varsayılan puanın ağırlıkları
+DOCUMENT_WEIGHT = 2.0
+NUMBER_WEIGHT = 1.0
+NAVIGATION_WEIGHT = 2.0
+IN_DEGREE_WEIGHT = 0.3
+DEPTH_WEIGHT = 0.1
+
+
+def url_pattern_score(url: str) -> float:
+    """URL yolundaki doküman / gezinme kalıplarına göre puan"""
+    parsed = urlparse(url)
+    path = tr_lower(unquote(parsed.path))
+    score = 0.0
+    if any(keyword in path for keyword in DOC_KEYWORDS):
+        score += DOCUMENT_WEIGHT
+    if DOCUMENT_URL_PATTERN.search(path):
+        score += NUMBER_WEIGHT
+    if NAVIGATION_URL_PATTERN.search(posixpath.basename(path) or path) or PAGINATION_QUERY_PATTERN.search(parsed.query):
+        score -= NAVIGATION_WEIGHT
+    return score
+
+
+def anchor_score(anchor: str) -> float:
+    """Link metnindeki doküman / gezinme ipuçlarına göre puan"""
+    text = tr_lower(anchor.strip())
+    if not text:
+        return 0.0
+    if text.isdigit() or any(word in text for word in NAVIGATION_ANCHOR_WORDS):
+        # Sayfalama ("2", "Sonraki »") ve menü linkleri
+        return -NAVIGATION_WEIGHT
+    score = 0.0
+    if any(keyword in text for keyword in DOC_KEYWORDS):
+        score += DOCUMENT_WEIGHT
+    if DOCUMENT_ANCHOR_PATTERN.search(text):
+        score += NUMBER_WEIGHT
+    return score
+
+
+def default_score(url: str, info: Dict[str, Any]) -> float:
+    """URL kalıbı, link metni, giriş derecesi ve derinliği birleştiren varsayılan puan"""
+    return (url_pattern_score(url) + anchor_score(info['anchor'])
+            + IN_DEGREE_WEIGHT * math.log1p(info['in_degree'])
+            - DEPTH_WEIGHT * info['depth'])
+
+
+def fifo_score(url: str, info: Dict[str, Any]) -> float:
+    """Sabit puan: URL'ler eklenme sırasıyla (genişlik öncelikli) indirilir"""
+    return 0.0
+
+
+def url_directory(url: str) -> str:
+    """Adil dağıtım için URL'nin dizini (host + üst yol)"""
+    parsed = urlparse(url)
+    return parsed.netloc + posixpath.dirname(parsed.path)
+
+
+class PriorityFrontier:
+    """Puana göre sıralı, küme arayüzlü URL kuyruğu
+
+    `in`, `len`, iterasyon, `add` ve `discard` bir küme gibi çalışır; bu yüzden
+    `pending_urls` kullanan kod değişmeden çalışır. Kuyruktaki bir URL'ye yeni link
+    bulundukça giriş derecesi artar ve URL yeni puanıyla yığına tekrar eklenir; eski
+    kayıtlar sürüm numarasıyla tembel olarak atlanır. Derinlik URL'nin kaydında tutulur;
+    pop_batch ile alınan URL'lerin derinliği yalnızca release() çağrılana kadar saklanır,
+    böylece bellek kullanımı taranan URL sayısıyla değil kuyruk boyuyla sınırlı kalır.
+    """
+
+    def __init__(self, score: Optional[ScoreFunction] = None, directory_penalty: float = 1.0):
+        self.score = score or default_score
+        self.directory_penalty = directory_penalty
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Kuyruktan alınmış, işlenmekte olan URL'lerin derinliği
+        self.in_flight: Dict[str, int] = {}
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._sequence = 0
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+
+    def depth(self, url: str) -> int:
+        """Kuyruktaki veya işlenmekte olan URL'nin bilinen en küçük derinliği (yoksa 0)"""
+        info = self.entries.get(url)
+        return info['depth'] if info is not None else self.in_flight.get(url, 0)
+
+    def add(self, url: str, depth: Optional[int] = None, anchor: str = "") -> bool:
+        """URL'yi ekle veya kuyruktaysa giriş derecesini artır; yeni eklendiyse True döndür"""
+        if url in self.entries or url in self.in_flight:
+            depth = self.depth(url) if depth is None else min(depth, self.depth(url))
+        elif depth is None:
+            depth = 0
+
+        info = self.entries.get(url)
+        added = info is None
+        if added:
+            info = self.entries[url] = {'depth': depth, 'anchor': anchor, 'in_degree': 1,
+                                        'version': 0, 'sequence': self._sequence}
+            self._sequence += 1
+        else:
+            info['depth'] = depth
+            info['anchor'] = info['anchor'] or anchor
+            info['in_degree'] += 1
+            info['version'] += 1
+
+        info['score'] = self.score(url, info)
+        heapq.heappush(self._heap, (-info['score'], info['sequence'], info['version'], url))
+        if len(self._heap) > 4 * len(self.entries) + 64:
+            self._compact()
+        return added
+
+    def update(self, urls: Iterable[str]):
+        """Birden çok URL ekle"""
+        for url in urls:
+            self.add(url)
+
+    def release(self, urls: Iterable[str]):
+        """İşlenmesi biten URL'lerin derinlik kaydını bırak"""
+        for url in urls:
+            self.in_flight.pop(url, None)
+
+    def discard(self, url: str):
+        """URL'yi kuyruktan çıkar (yığındaki kaydı tembel olarak atlanır)"""
+        self.entries.pop(url, None)
+
+    def _compact(self):
+        """Geçersiz kayıtları atıp yığını yeniden kur"""
+        self._heap = [(-info['score'], info['sequence'], info['version'], url)
+                      for url, info in self.entries.items()]
+        heapq.heapify(self._heap)
+
+    def _peek(self) -> Optional[Tuple[float, int, int, str]]:
+        """Yığının en üstündeki geçerli kaydı döndür (çıkarmadan)"""
+        heap = self._heap
+        while heap:
+            item = heap[0]
+            info = self.entries.get(item[3])
+            if info is not None and info['version'] == item[2]:
+                return item
+            heapq.heappop(heap)
+        return None
+
+    def pop_batch(self, size: int) -> List[str]:
+        """En yüksek puanlı en fazla `size` URL'yi kuyruktan al
+
+        Alınan URL'lerin derinliği release() çağrılana kadar depth() ile okunabilir.
+
+        Batch'e aynı dizinden alınan her URL, o dizindeki sonraki adayların puanını
+        `directory_penalty` kadar düşürür. Puan farkı büyükse dokümanlar yine önce gelir;
+        benzer puanlı dizinler ise batch'i paylaşır.
+        """
+        batch: List[str] = []
+        taken: Dict[str, int] = {}
+        # Bu batch'te cezalı puanla bekleyen adaylar: (-etkin puan, sıra, ceza sayısı, kayıt)
+        deferred: List[Tuple[float, int, int, Tuple[float, int, int, str]]] = []
+
+        while len(batch) < size:
+            item = self._peek()
+            if item is not None:
+                count = taken.get(url_directory(item[3]), 0)
+                if count and self.directory_penalty:
+                    heapq.heappop(self._heap)
+                    heapq.heappush(deferred, (item[0] + self.directory_penalty * count, item[1], count, item))
+                    continue
+
+            while deferred:
+                _, _, count, waiting = deferred[0]
+                current = taken.get(url_directory(waiting[3]), 0)
+                if current == count:
+                    break
+                # Aynı dizinden yeni URL alındı: cezayı güncelle
+                heapq.heapreplace(deferred, (waiting[0] + self.directory_penalty * current, waiting[1],
+                                             current, waiting))
+
+            if deferred and (item is None or (deferred[0][0], deferred[0][1]) < (item[0], item[1])):
+                chosen = heapq.heappop(deferred)[3]
+            elif item is not None:
+                chosen = heapq.heappop(self._heap)
+            else:
+                break
+
+            url = chosen[3]
+            self.in_flight[url] = self.entries.pop(url)['depth']
+            batch.append(url)
+            directory = url_directory(url)
+            taken[directory] = taken.get(directory, 0) + 1
+
+        # Seçilmeyen adaylar asıl puanlarıyla yığına döner
+        for _, _, _, item in deferred:
+            heapq.heappush(self._heap, item)
+        return batch
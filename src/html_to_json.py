@@ -9,22 +9,43 @@ import asyncio
 import aiofiles
 from pathlib import Path
 from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 import logging
 from tqdm import tqdm
 
+from file_writer import AsyncFileWriter
+from legal_extractor import LegalExtractor
+from raw_store import RawHTMLStore, RAW_HTML_MODES
+from link_graph import GRAPH_NAME, LinkGraph, document_ranks
+from stats_catalog import INDEX_FILES, StatsCatalog
+from sqlite_store import SQLiteStore
+
 # Logging konfigürasyonu
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Paketteki kayıt sayısı doküman sayısının bu katını aşınca ölü kayıtlar atılır
+RAW_COMPACT_RATIO = 1.5
+
 
 class HTMLToJSONConverter:
     """HTML dosyalarını JSON formatına dönüştürücü"""
     
-    def __init__(self, input_dir: str = "db", output_dir: str = "json_output"):
+    def __init__(self, input_dir: str = "db", output_dir: str = "json_output", fsync_policy: str = "none",
+                 raw_html_mode: str = "inline", store: Optional[SQLiteStore] = None):
+        if raw_html_mode not in RAW_HTML_MODES:
+            raise ValueError(f"Geçersiz raw_html modu: {raw_html_mode} (seçenekler: {', '.join(RAW_HTML_MODES)})")
+        
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.fsync_policy = fsync_policy
+        self.raw_html_mode = raw_html_mode
+        self.legal_extractor = LegalExtractor()
+        self.raw_store = RawHTMLStore(self.output_dir, fsync_policy=fsync_policy)
+        self.catalog = StatsCatalog(self.output_dir, kind="json")
+        # SQLite deposu verilmişse sayfalar oradan okunur, dokümanlar ve indeks satırları oraya yazılır
+        self.store = store
         self.output_dir.mkdir(exist_ok=True)
         
     def extract_text_content(self, soup: BeautifulSoup) -> str:
@@ -244,21 +265,42 @@ class HTMLToJSONConverter:
         
         return forms
     
-    async def convert_html_to_json(self, html_file_path: Path) -> Dict[str, Any]:
-        """Tek bir HTML dosyasını JSON'a dönüştür"""
+    async def read_html(self, html_file_path: Path) -> str:
+        """HTML içeriğini dosyadan veya SQLite deposundan oku"""
+        if self.store is None:
+            async with aiofiles.open(html_file_path, 'r', encoding='utf-8') as f:
+                return await f.read()
+        
+        loop = asyncio.get_running_loop()
+        html_content = await loop.run_in_executor(
+            None, self.store.read_page, SQLiteStore.key(html_file_path, self.input_dir)
+        )
+        if html_content is None:
+            raise FileNotFoundError(f"Sayfa depoda yok: {html_file_path}")
+        return html_content
+    
+    async def convert_html_to_json(self, html_file_path: Path,
+                                   writer: Optional[AsyncFileWriter] = None) -> Dict[str, Any]:
+        """Tek bir HTML dosyasını JSON'a dönüştür
+        
+        Ham HTML paketine ekleme (sıkıştırma + yazma) olay döngüsünü bloklamaz; yazıcı verilmişse
+        onun thread havuzunda, yoksa varsayılan havuzda çalışır.
+        """
         try:
             # HTML dosyasını oku
-            async with aiofiles.open(html_file_path, 'r', encoding='utf-8') as f:
-                html_content = await f.read()
+            html_content = await self.read_html(html_file_path)
             
             # BeautifulSoup ile parse et
             soup = BeautifulSoup(html_content, 'html.parser')
             
+            metadata = self.extract_metadata(soup, html_file_path)
+            text = self.extract_text_content(soup)
+            
             # JSON yapısını oluştur
             json_data = {
-                "metadata": self.extract_metadata(soup, html_file_path),
+                "metadata": metadata,
                 "content": {
-                    "text": self.extract_text_content(soup),
+                    "text": text,
                     "headings": self.extract_headings(soup),
                     "links": self.extract_links(soup, str(html_file_path)),
                     "images": self.extract_images(soup),
@@ -266,10 +308,21 @@ class HTMLToJSONConverter:
                     "lists": self.extract_lists(soup),
                     "forms": self.extract_forms(soup)
                 },
-                "raw_html": html_content,
-                "conversion_date": datetime.now().isoformat()
+                "legal": self.legal_extractor.extract(text, metadata["title"], html_file_path)
             }
             
+            # Ham HTML'i seçilen moda göre yerleştir
+            if self.raw_html_mode == "inline":
+                json_data["raw_html"] = html_content
+            elif self.raw_html_mode == "store":
+                if writer is not None:
+                    json_data["raw_html_ref"] = await writer.run(self.raw_store.put, html_content)
+                else:
+                    json_data["raw_html_ref"] = await asyncio.get_running_loop().run_in_executor(
+                        None, self.raw_store.put, html_content)
+            
+            json_data["conversion_date"] = datetime.now().isoformat()
+            
             return json_data
             
         except Exception as e:
@@ -278,82 +331,329 @@ class HTMLToJSONConverter:
     
     async def convert_all_html_files(self):
         """Tüm HTML dosyalarını JSON'a dönüştür"""
-        html_files = list(self.input_dir.rglob("*.html"))
+        if self.store is not None:
+            html_files = [self.input_dir / path for path in self.store.page_paths()]
+        else:
+            html_files = list(self.input_dir.rglob("*.html"))
         
         if not html_files:
             logger.warning(f"Hiç HTML dosyası bulunamadı: {self.input_dir}")
             return
         
         logger.info(f"{len(html_files)} HTML dosyası bulundu, dönüştürme başlıyor...")
+        await self.convert_files(html_files)
+        logger.info(f"Tüm HTML dosyaları JSON'a dönüştürüldü: {self.output_dir}")
+    
+    def json_path_for(self, html_file: Path) -> Path:
+        """HTML dosyasının JSON çıktı yolu"""
+        return self.output_dir / html_file.relative_to(self.input_dir).with_suffix('.json')
+    
+    def find_stale_files(self) -> Tuple[List[Path], List[Path]]:
+        """JSON'u olmayan veya JSON'undan yeni HTML dosyalarını ve kaynağı silinmiş JSON'ları bul
+        
+        İzleme başlamadan önce (ör. süreç kapalıyken) oluşan değişiklikleri yakalamak için
+        yalnızca dosya zamanları karşılaştırılır, içerik okunmaz.
+        """
+        if self.store is not None:
+            changed, removed = self.store.stale_pages()
+            return [self.input_dir / path for path in changed], [self.input_dir / path for path in removed]
+        
+        changed = []
+        for html_file in self.input_dir.rglob("*.html"):
+            json_file = self.json_path_for(html_file)
+            try:
+                if json_file.stat().st_mtime_ns < html_file.stat().st_mtime_ns:
+                    changed.append(html_file)
+            except FileNotFoundError:
+                changed.append(html_file)
+        
+        removed = []
+        for json_file in self.output_dir.rglob("*.json"):
+            if json_file.name in INDEX_FILES:
+                continue
+            html_file = self.input_dir / json_file.relative_to(self.output_dir).with_suffix('.html')
+            if not html_file.exists():
+                removed.append(html_file)
+        return changed, removed
+    
+    async def convert_files(self, html_files: List[Path], removed: Iterable[Path] = ()) -> Dict[str, List[Path]]:
+        """Verilen HTML dosyalarını dönüştür, silinen HTML dosyalarının JSON'larını kaldır
+        
+        Yazılan ve silinen JSON dosyalarının yollarını döndürür (update_master_index için).
+        """
+        self.catalog.begin_run("convert")
         
         # Progress bar
         pbar = tqdm(html_files, desc="Dönüştürülüyor", unit="dosya")
+        pending_writes = {}
+        written: List[Path] = []
+        failed = 0
         
-        for html_file in pbar:
-            try:
-                # JSON'a dönüştür
-                json_data = await self.convert_html_to_json(html_file)
-                
-                if json_data:
-                    # Çıktı dosya yolunu belirle
-                    relative_path = html_file.relative_to(self.input_dir)
-                    json_file_path = self.output_dir / relative_path.with_suffix('.json')
-                    
-                    # Dizin yapısını oluştur
-                    json_file_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.store is not None:
+            writer = self.store.writer("documents", self.output_dir, on_written=self.catalog.record_file)
+        else:
+            writer = AsyncFileWriter(fsync_policy=self.fsync_policy, on_written=self.catalog.record_file)
+        
+        async with writer:
+            for html_file in pbar:
+                try:
+                    # JSON'a dönüştür
+                    json_data = await self.convert_html_to_json(html_file, writer)
                     
-                    # JSON dosyasını kaydet
-                    async with aiofiles.open(json_file_path, 'w', encoding='utf-8') as f:
-                        await f.write(json.dumps(json_data, ensure_ascii=False, indent=2))
+                    if json_data:
+                        # Çıktı dosya yolunu belirle
+                        json_file_path = self.json_path_for(html_file)
+                        if self.store is not None:
+                            # İndeks satırı doküman ile aynı işlemde yazılır
+                            writer.stage_index_row(json_file_path, self.index_entry(json_data, json_file_path))
+                        
+                        # JSON dosyasını yazma kuyruğuna ekle, dönüştürme beklemeden devam eder
+                        future = await writer.submit(
+                            json_file_path, json.dumps(json_data, ensure_ascii=False, indent=2)
+                        )
+                        pending_writes[future] = (html_file, json_file_path)
+                        
+                        pbar.set_postfix({"Dönüştürülen": html_file.name})
                     
-                    pbar.set_postfix({"Dönüştürülen": html_file.name})
-                
-            except Exception as e:
-                logger.error(f"Dosya işleme hatası ({html_file}): {str(e)}")
+                except Exception as e:
+                    logger.error(f"Dosya işleme hatası ({html_file}): {str(e)}")
+            
+            # Yazma hatalarını raporla
+            results = await asyncio.gather(*pending_writes, return_exceptions=True)
+            for future, result in zip(pending_writes, results):
+                html_file, json_file_path = pending_writes[future]
+                if isinstance(result, Exception):
+                    failed += 1
+                    logger.error(f"Dosya işleme hatası ({html_file}): {str(result)}")
+                else:
+                    written.append(json_file_path)
+        
+        deleted: List[Path] = []
+        removed = list(removed)
+        if self.store is not None and removed:
+            self.store.delete("documents", [SQLiteStore.key(self.json_path_for(html_file), self.output_dir)
+                                            for html_file in removed])
+        for html_file in removed:
+            json_file_path = self.json_path_for(html_file)
+            if self.store is not None:
+                self.catalog.remove_file(json_file_path)
+            elif json_file_path.exists():
+                json_file_path.unlink()
+                self.catalog.remove_file(json_file_path)
+                logger.info(f"JSON silindi (kaynak HTML yok): {json_file_path}")
+            deleted.append(json_file_path)
         
         pbar.close()
-        logger.info(f"Tüm HTML dosyaları JSON'a dönüştürüldü: {self.output_dir}")
+        self.catalog.end_run(html_files=len(html_files), failed=failed + len(html_files) - len(pending_writes),
+                             removed=len(deleted))
+        summary = self.catalog.save()
+        
+        # Yeniden taramalarda paket yalnızca büyür: ölü kayıtlar çoğaldığında sıkıştır
+        if self.raw_html_mode == "store" and len(self.raw_store) > RAW_COMPACT_RATIO * max(summary['files'], 1):
+            await asyncio.get_running_loop().run_in_executor(None, self.compact_raw_store)
+        self.raw_store.close()
+        return {'written': written, 'removed': deleted}
+    
+    def raw_html_hashes(self) -> Optional[Set[str]]:
+        """Dokümanların referans verdiği ham HTML hash'leri (okunamayan doküman varsa None)"""
+        if self.store is not None:
+            return self.store.raw_html_hashes()
+        
+        hashes = set()
+        for json_file in self.output_dir.rglob("*.json"):
+            if json_file.name in INDEX_FILES:
+                continue
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    ref = json.load(f).get("raw_html_ref")
+            except Exception as e:
+                logger.error(f"JSON okuma hatası ({json_file}): {str(e)}")
+                return None
+            if ref:
+                hashes.add(ref["sha256"])
+        return hashes
+    
+    def compact_raw_store(self) -> Dict[str, int]:
+        """Artık hiçbir dokümanın referans vermediği ham HTML kayıtlarını paketten at"""
+        live = self.raw_html_hashes()
+        if live is None:
+            # Referansları bilinmeyen doküman varken hiçbir kayıt atılmaz
+            logger.warning("Ham HTML paketi sıkıştırılmadı: dokümanlar okunamadı")
+            return {}
+        return self.raw_store.compact(live)
+    
+    def build_index_entry(self, json_file: Path) -> Dict[str, Any]:
+        """Tek bir JSON dokümanından ana indeks satırı oluştur"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            json_data = json.load(f)
+        
+        return self.index_entry(json_data, json_file)
+    
+    def index_entry(self, json_data: Dict[str, Any], json_file: Path) -> Dict[str, Any]:
+        """Dönüştürülmüş doküman sözlüğünden ana indeks satırı oluştur"""
+        return {
+            "file_path": str(json_file.relative_to(self.output_dir)),
+            "title": json_data.get("metadata", {}).get("title", ""),
+            "description": json_data.get("metadata", {}).get("description", ""),
+            "keywords": json_data.get("metadata", {}).get("keywords", []),
+            "word_count": len(json_data.get("content", {}).get("text", "").split()),
+            "link_count": len(json_data.get("content", {}).get("links", [])),
+            "image_count": len(json_data.get("content", {}).get("images", [])),
+            "heading_count": len(json_data.get("content", {}).get("headings", [])),
+            "table_count": len(json_data.get("content", {}).get("tables", [])),
+            "doc_type": json_data.get("legal", {}).get("doc_type", ""),
+            "doc_number": json_data.get("legal", {}).get("number", ""),
+            "doc_year": json_data.get("legal", {}).get("year"),
+            "doc_date": json_data.get("legal", {}).get("date", ""),
+            "article_count": len(json_data.get("legal", {}).get("articles", [])),
+            "conversion_date": json_data.get("conversion_date", "")
+        }
+    
+    def load_document_ranks(self) -> Dict[str, Dict[str, float]]:
+        """Scraper'ın link grafiğinden HTML yolu -> PageRank / giriş derecesi eşlemesi yükle"""
+        graph_path = self.input_dir / GRAPH_NAME
+        index_path = self.input_dir / "file_index.json"
+        if not graph_path.exists() or not index_path.exists():
+            return {}
+        
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                path_mapping = json.load(f).get("path_mapping", {})
+            return document_ranks(LinkGraph.load(graph_path), path_mapping)
+        except Exception as e:
+            logger.error(f"Link grafiği yükleme hatası ({graph_path}): {str(e)}")
+            return {}
+    
+    def write_master_index(self, master_index: Dict[str, Any]) -> Path:
+        """Ana indeksi geçici dosyaya yazıp atomik olarak değiştir (okuyucular yarım dosya görmez)"""
+        master_index_path = self.output_dir / "master_index.json"
+        temp_path = master_index_path.with_name(f".{master_index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(master_index, ensure_ascii=False, indent=2))
+                if self.fsync_policy != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, master_index_path)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        return master_index_path
+    
+    def apply_ranks(self, entries: List[Dict[str, Any]]):
+        """Link grafiğindeki önem değerlerini indeks satırlarına uygula ve satırları sırala"""
+        ranks = self.load_document_ranks()
+        if not ranks:
+            return
+        
+        for entry in entries:
+            html_path = Path(entry["file_path"]).with_suffix('.html').as_posix()
+            # Artımlı güncellemede önceki grafikten kalan değerler temizlenir
+            entry.pop("pagerank", None)
+            entry.pop("in_degree", None)
+            entry.update(ranks.get(html_path, {}))
+        
+        # Link grafiği varsa sonuçları önemine göre sırala
+        entries.sort(key=lambda item: item.get("pagerank", 0.0), reverse=True)
+    
+    async def build_index_entries(self, json_files: List[Path]) -> List[Dict[str, Any]]:
+        """JSON dosyalarından indeks satırlarını paralel olarak oluştur"""
+        # Her dosya tek bir thread geçişinde okunup ayrıştırılır (aiofiles'ın
+        # open/read/close için ayrı ayrı yaptığı geçişler yerine)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, self.build_index_entry, json_file) for json_file in json_files),
+            return_exceptions=True
+        )
+        
+        entries = []
+        for json_file, result in zip(json_files, results):
+            if isinstance(result, Exception):
+                logger.error(f"İndeks oluşturma hatası ({json_file}): {str(result)}")
+            else:
+                entries.append(result)
+        return entries
     
     async def create_master_index(self):
         """Ana indeks dosyası oluştur"""
-        json_files = list(self.output_dir.rglob("*.json"))
+        self.catalog.begin_run("index")
+        loop = asyncio.get_running_loop()
+        
+        if self.store is not None:
+            # Satırlar dönüştürme sırasında yazıldı: indeks bir sorgudur, yalnızca önem değerleri tazelenir
+            entries = await loop.run_in_executor(None, self.store.index_rows)
+            self.apply_ranks(entries)
+            await loop.run_in_executor(None, self.store.update_ranks, entries)
+            total_files = len(entries)
+        else:
+            json_files = [
+                json_file for json_file in self.output_dir.rglob("*.json")
+                if json_file.name not in INDEX_FILES
+            ]
+            entries = await self.build_index_entries(json_files)
+            self.apply_ranks(entries)
+            total_files = len(json_files)
         
         master_index = {
             "created_at": datetime.now().isoformat(),
-            "total_files": len(json_files),
-            "files": []
+            "total_files": total_files,
+            "files": entries
         }
         
-        for json_file in json_files:
-            try:
-                # JSON dosyasını oku
-                async with aiofiles.open(json_file, 'r', encoding='utf-8') as f:
-                    json_data = json.loads(await f.read())
-                
-                file_info = {
-                    "file_path": str(json_file.relative_to(self.output_dir)),
-                    "title": json_data.get("metadata", {}).get("title", ""),
-                    "description": json_data.get("metadata", {}).get("description", ""),
-                    "keywords": json_data.get("metadata", {}).get("keywords", []),
-                    "word_count": len(json_data.get("content", {}).get("text", "").split()),
-                    "link_count": len(json_data.get("content", {}).get("links", [])),
-                    "image_count": len(json_data.get("content", {}).get("images", [])),
-                    "heading_count": len(json_data.get("content", {}).get("headings", [])),
-                    "table_count": len(json_data.get("content", {}).get("tables", [])),
-                    "conversion_date": json_data.get("conversion_date", "")
-                }
-                
-                master_index["files"].append(file_info)
-                
-            except Exception as e:
-                logger.error(f"İndeks oluşturma hatası ({json_file}): {str(e)}")
-        
         # Ana indeksi kaydet
-        master_index_path = self.output_dir / "master_index.json"
-        async with aiofiles.open(master_index_path, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(master_index, ensure_ascii=False, indent=2))
+        master_index_path = await loop.run_in_executor(None, self.write_master_index, master_index)
         
         logger.info(f"Ana indeks oluşturuldu: {master_index_path}")
+        
+        self.catalog.end_run(entries=len(master_index["files"]))
+        self.catalog.save()
+    
+    async def update_master_index(self, written: Iterable[Path] = (), removed: Iterable[Path] = ()) -> Dict[str, Any]:
+        """Ana indeksi yalnızca değişen JSON dosyaları için güncelle
+        
+        Mevcut indeks okunur, değişen satırlar yeniden oluşturulur, silinenler çıkarılır ve
+        indeks atomik olarak değiştirilir. İndeks henüz yoksa baştan oluşturulur.
+        """
+        master_index_path = self.output_dir / "master_index.json"
+        if self.store is not None or not master_index_path.exists():
+            # SQLite deposunda satırlar zaten güncel; indeks sorgudan yeniden üretilir
+            await self.create_master_index()
+            return {'updated': 0, 'removed': 0, 'rebuilt': True, 'tables_changed': True}
+        
+        self.catalog.begin_run("index")
+        loop = asyncio.get_running_loop()
+        
+        def load_index():
+            with open(master_index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        master_index = await loop.run_in_executor(None, load_index)
+        entries = {entry["file_path"]: entry for entry in master_index.get("files", [])}
+        
+        written = list(written)
+        removed_keys = {str(json_file.relative_to(self.output_dir)) for json_file in removed}
+        # Tablo deposunun yeniden oluşturulması gerekip gerekmediği için tablolu satırlar izlenir
+        tables_changed = False
+        for key in removed_keys:
+            tables_changed |= bool(entries.pop(key, {}).get("table_count"))
+        for entry in await self.build_index_entries(written):
+            previous = entries.get(entry["file_path"], {})
+            tables_changed |= bool(entry["table_count"] or previous.get("table_count"))
+            entries[entry["file_path"]] = entry
+        
+        master_index["created_at"] = datetime.now().isoformat()
+        master_index["files"] = list(entries.values())
+        master_index["total_files"] = len(master_index["files"])
+        self.apply_ranks(master_index["files"])
+        
+        await loop.run_in_executor(None, self.write_master_index, master_index)
+        logger.info(f"Ana indeks güncellendi: {len(written)} değişen, {len(removed_keys)} silinen dosya")
+        
+        self.catalog.end_run(entries=master_index["total_files"], updated=len(written), removed=len(removed_keys))
+        self.catalog.save()
+        return {'updated': len(written), 'removed': len(removed_keys), 'rebuilt': False,
+                'tables_changed': tables_changed}
 
 
 async def main():
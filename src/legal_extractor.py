@@ -0,0 +1,275 @@
+"""
+Hukuki Doküman Çıkarıcı
+Bu modül dönüştürücünün ürettiği düz metinden mevzuat türünü, sayı ve tarihleri,
+madde sınırlarını ve diğer mevzuata yapılan atıfları çıkarır. Tüm desenler modül
+yüklenirken tek bir regex içinde derlenir ve metin üzerinde tek geçişte çalıştırılır.
+"""
+
+import bisect
+import re
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
+
+
+class LegalReference(TypedDict):
+    """Başka bir mevzuata yapılan atıf"""
+    type: str
+    number: str
+    year: Optional[int]
+    text: str
+    offset: int
+
+
+class LegalArticle(TypedDict):
+    """Metin içinde adreslenebilir bir madde"""
+    id: str
+    kind: str
+    number: str
+    start: int
+    end: int
+    references: List[LegalReference]
+
+
+class LegalDocument(TypedDict):
+    """Bir dokümanın hukuki şeması"""
+    doc_type: str
+    number: str
+    year: Optional[int]
+    sayi: str
+    date: str
+    dates: List[str]
+    articles: List[LegalArticle]
+    references: List[LegalReference]
+
+
+MONTHS = {
+    'ocak': 1, 'şubat': 2, 'mart': 3, 'nisan': 4, 'mayıs': 5, 'haziran': 6,
+    'temmuz': 7, 'ağustos': 8, 'eylül': 9, 'ekim': 10, 'kasım': 11, 'aralık': 12
+}
+
+# (anahtar kelime kökü, tür) - sıralama önceliği belirler
+DOC_TYPE_KEYWORDS = [
+    ('genelge', 'genelge'),
+    ('yönetmeli', 'yonetmelik'),
+    ('yonetmeli', 'yonetmelik'),
+    ('tebliğ', 'teblig'),
+    ('teblig', 'teblig'),
+    ('tüzü', 'tuzuk'),
+    ('kanun', 'kanun'),
+    ('mahkeme', 'mahkeme'),
+    ('karar', 'mahkeme'),
+    ('sözleşme', 'sozlesme'),
+    ('sozlesme', 'sozlesme'),
+    ('vekalet', 'vekalet'),
+    ('noter', 'noterlik'),
+]
+
+# Metnin başında yalnızca açık belge türü ifadeleri aranır (başlık veya büyük harfle yazılmış
+# tür adı); "noter", "karar" gibi genel kelimeler neredeyse her metinde geçtiği için kullanılmaz
+BODY_DOC_TYPE_PATTERNS = [
+    (re.compile(r'\b(?:Genelge|GENELGE)'), 'genelge'),
+    (re.compile(r'\b(?:Yönetmeli[kğ]|YÖNETMELİ[KĞ])'), 'yonetmelik'),
+    (re.compile(r'\b(?:Tebliğ|TEBLİĞ)'), 'teblig'),
+    (re.compile(r'\bsayılı\s+Kanun|\bSAYILI\s+KANUN'), 'kanun'),
+]
+
+REFERENCE_TYPES = [
+    ('kanun', 'kanun'),
+    ('khk', 'khk'),
+    ('kararname', 'khk'),
+    ('yönetmeli', 'yonetmelik'),
+    ('genelge', 'genelge'),
+    ('tebliğ', 'teblig'),
+    ('tüzü', 'tuzuk'),
+]
+
+
+def tr_lower(text: str) -> str:
+    """Türkçe kurallarına uygun küçük harfe çevir"""
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def _tr_upper(text: str) -> str:
+    """Türkçe kurallarına uygun büyük harfe çevir"""
+    return text.replace('i', 'İ').replace('ı', 'I').upper()
+
+
+def _case_variants(words: List[str]) -> str:
+    """Kelimelerin küçük, baş harfi büyük ve tamamı büyük hallerinden alternatif oluştur"""
+    variants = []
+    for word in words:
+        for variant in (word, _tr_upper(word[0]) + word[1:], _tr_upper(word)):
+            if variant not in variants:
+                variants.append(variant)
+    return '|'.join(sorted(variants, key=len, reverse=True))
+
+
+_MONTH_ALTERNATIVES = _case_variants(list(MONTHS))
+_REFERENCE_WORDS = _case_variants(['kanun', 'khk', 'kararname', 'yönetmeli', 'genelge', 'tebliğ', 'tüzü'])
+
+# Tek geçişte çalışan birleşik desen; eşleşen grup adına göre işlenir.
+# Baştaki ileri bakış, alternatiflerin başlayabileceği karakterler dışındaki konumları
+# gruplara girmeden eler (sentetik mevzuat metninde ~7 kat hız). Dönüştürücü blokları
+# ayraçsız birleştirdiği için ("AmaçMADDE 1") madde başlıklarında kelime sınırı aranmaz.
+LEGAL_PATTERN = re.compile(
+    r'(?=[GEMS\d])(?:'
+    r'(?P<article>(?:(?P<art_kind>GEÇİCİ|Geçici|EK|Ek)\s+)?(?:MADDE|Madde)\s+'
+    r'(?P<art_no>\d+(?:/[A-Za-z])?)\s*[-–—:.])'
+    r'|(?P<ref>(?P<ref_no>\d+(?:/\d+)?)\s+(?:sayılı|Sayılı|SAYILI)'
+    r'(?:\s+(?P<ref_name>[^.,;:()]{0,80}?(?:' + _REFERENCE_WORDS + r')\w*))?)'
+    r'|(?P<date_num>(?P<dn_day>\d{1,2})[./](?P<dn_month>\d{1,2})[./](?P<dn_year>\d{4})\b)'
+    r'|(?P<date_txt>(?P<dt_day>\d{1,2})\s+(?P<dt_month>' + _MONTH_ALTERNATIVES + r')\s+(?P<dt_year>\d{4})\b)'
+    r'|(?P<sayi>(?:Sayı|SAYI)\s*:\s*(?P<sayi_val>[\w./-]+))'
+    r')'
+)
+
+ARTICLE_KINDS = {None: 'madde', 'GEÇİCİ': 'gecici', 'Geçici': 'gecici', 'EK': 'ek', 'Ek': 'ek'}
+
+FILE_NUMBER_PATTERN = re.compile(r'(?P<year>\d{4})-(?P<number>\d+)-sayili')
+TITLE_NUMBER_PATTERN = re.compile(r'(?:(?P<year>\d{4})/(?P<slash_no>\d+)|(?P<number>\d+)\s+sayılı)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def iso_date(year: int, month: int, day: int) -> Optional[str]:
+    """Takvimde var olan tarihi YYYY-AA-GG olarak döndür, olmayanı (31.02.2004 gibi) None"""
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def reference_type(name: str) -> str:
+    """Atıf adından mevzuat türünü bul (aynı adlar korpusta sık tekrarlanır)"""
+    lowered = tr_lower(name)
+    for keyword, ref_type in REFERENCE_TYPES:
+        if keyword in lowered:
+            return ref_type
+    return 'belge'
+
+
+class LegalExtractor:
+    """Düz metinden hukuki şema çıkarıcı"""
+
+    def detect_doc_type(self, title: str, file_name: str, text: str) -> str:
+        """Mevzuat türünü başlık, dosya adı ve metnin başından tahmin et, bulunamazsa 'diger'"""
+        for source in (title, file_name):
+            lowered = tr_lower(source)
+            for keyword, doc_type in DOC_TYPE_KEYWORDS:
+                if keyword in lowered:
+                    return doc_type
+        head = text[:300]
+        for pattern, doc_type in BODY_DOC_TYPE_PATTERNS:
+            if pattern.search(head):
+                return doc_type
+        return 'diger'
+
+    def parse_doc_number(self, title: str, file_name: str) -> Tuple[str, Optional[int]]:
+        """Dokümanın kendi sayı ve yılını başlık veya dosya adından çıkar"""
+        match = FILE_NUMBER_PATTERN.search(file_name)
+        if match:
+            return match.group('number'), int(match.group('year'))
+
+        match = TITLE_NUMBER_PATTERN.search(title)
+        if match:
+            if match.group('slash_no'):
+                return match.group('slash_no'), int(match.group('year'))
+            return match.group('number'), None
+
+        return '', None
+
+    @staticmethod
+    def _article_id(kind: str, number: str, seen: Dict[str, int]) -> str:
+        """Madde için benzersiz ve kararlı bir kimlik üret"""
+        prefix = {'madde': 'madde', 'gecici': 'gecici-madde', 'ek': 'ek-madde'}[kind]
+        base = f"{prefix}-{number.replace('/', '-').lower()}"
+        seen[base] = seen.get(base, 0) + 1
+        return base if seen[base] == 1 else f"{base}-{seen[base]}"
+
+    def extract(self, text: str, title: str = "", file_path: Union[str, Path] = "") -> LegalDocument:
+        """Metni tek geçişte tarayarak hukuki şemayı oluştur"""
+        file_name = Path(file_path).stem if file_path else ""
+        number, year = self.parse_doc_number(title, file_name)
+
+        articles: List[LegalArticle] = []
+        references: List[LegalReference] = []
+        dates: List[str] = []
+        sayi = ""
+        seen_ids: Dict[str, int] = {}
+
+        for match in LEGAL_PATTERN.finditer(text):
+            # Dış grup en son kapandığı için lastgroup her zaman alternatifin adıdır
+            kind = match.lastgroup
+
+            if kind == 'article':
+                art_kind = ARTICLE_KINDS[match.group('art_kind')]
+                art_no = match.group('art_no')
+                if articles:
+                    articles[-1]['end'] = match.start()
+                articles.append({
+                    'id': self._article_id(art_kind, art_no, seen_ids),
+                    'kind': art_kind,
+                    'number': art_no,
+                    'start': match.start(),
+                    'end': len(text),
+                    'references': []
+                })
+
+            elif kind == 'ref':
+                ref_no = match.group('ref_no')
+                ref_name = match.group('ref_name') or ''
+                ref_year = None
+                if '/' in ref_no:
+                    first, second = ref_no.split('/', 1)
+                    if len(first) == 4:
+                        ref_year, ref_no = int(first), second
+                references.append({
+                    'type': reference_type(ref_name),
+                    'number': ref_no,
+                    'year': ref_year,
+                    'text': match.group('ref').strip(),
+                    'offset': match.start()
+                })
+
+            elif kind == 'date_num':
+                found = iso_date(int(match.group('dn_year')), int(match.group('dn_month')),
+                                 int(match.group('dn_day')))
+                if found:
+                    dates.append(found)
+
+            elif kind == 'date_txt':
+                found = iso_date(int(match.group('dt_year')), MONTHS[tr_lower(match.group('dt_month'))],
+                                 int(match.group('dt_day')))
+                if found:
+                    dates.append(found)
+
+            elif kind == 'sayi' and not sayi:
+                sayi = match.group('sayi_val').rstrip('.-/')
+
+        # Atıfları ait oldukları maddelere dağıt
+        if articles:
+            starts = [article['start'] for article in articles]
+            for reference in references:
+                position = bisect.bisect_right(starts, reference['offset']) - 1
+                if position >= 0:
+                    articles[position]['references'].append(reference)
+
+        if year is None and dates:
+            year = int(dates[0][:4])
+
+        return {
+            'doc_type': self.detect_doc_type(title, file_name, text),
+            'number': number,
+            'year': year,
+            'sayi': sayi,
+            'date': dates[0] if dates else '',
+            'dates': sorted(set(dates)),
+            'articles': articles,
+            'references': references
+        }
+
+
+def article_text(text: str, article: Dict[str, Any]) -> str:
+    """Maddenin metnini ofsetleri kullanarak döndür"""
+    return text[article['start']:article['end']].strip()
@@ -0,0 +1,256 @@
+"""
+İç Link Grafiği
+Bu modül tarama sırasında bulunan linkleri tamsayı kimlikli, CSR (sıkıştırılmış satır)
+biçiminde NumPy dizileri olarak saklar. Grafik file_index.json'ın yanına kaydedilir ve
+vektörize PageRank / giriş derecesi sıralaması, kırık link ve erişilemeyen sayfa tespiti sunar.
+"""
+
+import logging
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GRAPH_NAME = "link_graph.npz"
+
+
+class LinkGraphBuilder:
+    """Tarama sırasında kenarları biriktiren artımlı grafik oluşturucu"""
+
+    def __init__(self):
+        self.url_ids: Dict[str, int] = {}
+        self.urls: List[str] = []
+        self.sources = array('i')
+        self.targets = array('i')
+        self.fetched = set()
+        self.failed = set()
+
+    def node_id(self, url: str) -> int:
+        """URL'nin tamsayı kimliğini döndür, yoksa oluştur"""
+        node = self.url_ids.get(url)
+        if node is None:
+            node = self.url_ids[url] = len(self.urls)
+            self.urls.append(url)
+        return node
+
+    def add_page(self, url: str, links: Iterable[str]):
+        """İndirilen bir sayfayı ve çıkış linklerini ekle"""
+        source = self.node_id(url)
+        self.fetched.add(source)
+        for link in links:
+            target = self.node_id(link)
+            if target != source:
+                self.sources.append(source)
+                self.targets.append(target)
+
+    def mark_failed(self, url: str):
+        """İndirilemeyen URL'yi işaretle"""
+        self.failed.add(self.node_id(url))
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Süreçler arası aktarım için grafiği düz veri yapılarına çevir"""
+        return {
+            'urls': self.urls,
+            'sources': self.sources.tobytes(),
+            'targets': self.targets.tobytes(),
+            'fetched': sorted(self.fetched),
+            'failed': sorted(self.failed)
+        }
+
+    def merge_payload(self, payload: Dict[str, Any]):
+        """Başka bir oluşturucunun (ör. shard) grafiğini bu grafiğe ekle"""
+        mapping = np.array([self.node_id(url) for url in payload['urls']], dtype=np.int32)
+        sources = np.frombuffer(payload['sources'], dtype=np.int32)
+        targets = np.frombuffer(payload['targets'], dtype=np.int32)
+        self.sources.extend(mapping[sources].tolist())
+        self.targets.extend(mapping[targets].tolist())
+        self.fetched.update(mapping[payload['fetched']].tolist())
+        self.failed.update(mapping[payload['failed']].tolist())
+
+    def build(self) -> "LinkGraph":
+        """Biriken kenarlardan CSR grafiği oluştur"""
+        n = len(self.urls)
+        sources = np.frombuffer(self.sources, dtype=np.int32) if self.sources else np.zeros(0, dtype=np.int32)
+        targets = np.frombuffer(self.targets, dtype=np.int32) if self.targets else np.zeros(0, dtype=np.int32)
+
+        # Aynı kenarı tekilleştir ve kaynağa göre sırala (sıralama + komşu karşılaştırma,
+        # büyük dizilerde np.unique'ten belirgin şekilde hızlı)
+        keys = np.sort(sources.astype(np.int64) * max(n, 1) + targets)
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        sources = (keys // max(n, 1)).astype(np.int32)
+        indices = (keys % max(n, 1)).astype(np.int32)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+
+        fetched = np.zeros(n, dtype=bool)
+        fetched[list(self.fetched)] = True
+        failed = np.zeros(n, dtype=bool)
+        failed[list(self.failed)] = True
+
+        return LinkGraph(list(self.urls), indptr, indices, fetched, failed)
+
+
+class LinkGraph:
+    """CSR biçiminde salt okunur link grafiği"""
+
+    def __init__(self, urls: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 fetched: np.ndarray, failed: np.ndarray):
+        self.urls = urls
+        self.indptr = indptr
+        self.indices = indices
+        self.fetched = fetched
+        self.failed = failed
+        self._url_ids: Optional[Dict[str, int]] = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.urls)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def node_id(self, url: str) -> Optional[int]:
+        """URL'nin kimliğini döndür"""
+        if self._url_ids is None:
+            self._url_ids = {url: i for i, url in enumerate(self.urls)}
+        return self._url_ids.get(url)
+
+    def links_of(self, url: str) -> Optional[List[str]]:
+        """Sayfanın çıkış linklerini döndür (sayfa grafikte yoksa None)"""
+        node = self.node_id(url)
+        if node is None or not self.fetched[node]:
+            return None
+        return [self.urls[i] for i in self.indices[self.indptr[node]:self.indptr[node + 1]]]
+
+    def save(self, path: Union[str, Path]):
+        """Grafiği tek bir .npz dosyasına kaydet"""
+        url_blob = '\n'.join(self.urls).encode('utf-8')
+        np.savez_compressed(
+            path,
+            indptr=self.indptr,
+            indices=self.indices,
+            fetched=self.fetched,
+            failed=self.failed,
+            urls=np.frombuffer(url_blob, dtype=np.uint8)
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LinkGraph":
+        """Kaydedilmiş grafiği yükle"""
+        with np.load(path) as data:
+            blob = data['urls'].tobytes().decode('utf-8')
+            urls = blob.split('\n') if blob else []
+            return cls(urls, data['indptr'], data['indices'], data['fetched'], data['failed'])
+
+    def out_degree(self) -> np.ndarray:
+        """Her düğümün çıkış derecesi"""
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """Her düğümün giriş derecesi"""
+        return np.bincount(self.indices, minlength=self.node_count)
+
+    def edge_sources(self) -> np.ndarray:
+        """Her kenarın kaynak düğümü (CSR satırlarının açılmış hali)"""
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), self.out_degree())
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+        """Vektörize güç yinelemesi ile PageRank hesapla"""
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+
+        out_degree = self.out_degree().astype(np.float64)
+        dangling = out_degree == 0
+        inverse_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        sources = self.edge_sources()
+        rank = np.full(n, 1.0 / n)
+
+        for _ in range(max_iter):
+            contribution = (rank * inverse_degree)[sources]
+            new_rank = np.bincount(self.indices, weights=contribution, minlength=n)
+            # Çıkışı olmayan düğümlerin ağırlığı tüm düğümlere eşit dağıtılır
+            new_rank = damping * (new_rank + rank[dangling].sum() / n) + (1.0 - damping) / n
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < tol:
+                break
+
+        return rank
+
+    def reachable(self, roots: Iterable[int]) -> np.ndarray:
+        """Kök düğümlerden erişilebilen düğümleri işaretle (seviye seviye BFS)"""
+        visited = np.zeros(self.node_count, dtype=bool)
+        frontier = np.unique(np.asarray(list(roots), dtype=np.int64))
+        visited[frontier] = True
+
+        while len(frontier):
+            starts = self.indptr[frontier]
+            counts = self.indptr[frontier + 1] - starts
+            if not counts.sum():
+                break
+            # Sınırdaki tüm düğümlerin komşu aralıklarını tek seferde topla
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            neighbours = np.unique(self.indices[offsets])
+            frontier = neighbours[~visited[neighbours]]
+            visited[frontier] = True
+
+        return visited
+
+    def unreachable_pages(self, roots: Iterable[Union[int, str]]) -> List[str]:
+        """Köklerden erişilemeyen indirilmiş sayfaları döndür"""
+        root_ids = [r if isinstance(r, (int, np.integer)) else self.node_id(r) for r in roots]
+        visited = self.reachable([r for r in root_ids if r is not None])
+        return [self.urls[i] for i in np.flatnonzero(self.fetched & ~visited)]
+
+    def orphan_pages(self, roots: Iterable[str] = ()) -> List[str]:
+        """Hiçbir sayfadan link almayan indirilmiş sayfaları döndür (kökler hariç)"""
+        orphans = self.fetched & (self.in_degree() == 0)
+        for root in roots:
+            node = self.node_id(root)
+            if node is not None:
+                orphans[node] = False
+        return [self.urls[i] for i in np.flatnonzero(orphans)]
+
+    def broken_links(self) -> List[Tuple[str, str]]:
+        """Başarısız URL'lere giden (kaynak, hedef) linklerini döndür"""
+        broken = self.failed[self.indices] & ~self.fetched[self.indices]
+        sources = self.edge_sources()[broken]
+        targets = self.indices[broken]
+        return [(self.urls[s], self.urls[t]) for s, t in zip(sources, targets)]
+
+    def summary(self, roots: Iterable[str] = ()) -> Dict[str, Any]:
+        """Grafik özet istatistikleri"""
+        roots = list(roots)
+        return {
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'fetched': int(self.fetched.sum()),
+            'failed': int(self.failed.sum()),
+            'broken_links': len(self.broken_links()),
+            'orphans': len(self.orphan_pages(roots)),
+            'unreachable': len(self.unreachable_pages(roots)) if roots else 0
+        }
+
+
+def document_ranks(graph: LinkGraph, path_mapping: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    """file_index.json yol eşlemesini kullanarak dosya yolu -> (pagerank, in_degree) döndür"""
+    ranks = graph.pagerank()
+    in_degree = graph.in_degree()
+    scale = float(graph.node_count)
+
+    result = {}
+    for url, relative_path in path_mapping.items():
+        node = graph.node_id(url)
+        if node is not None:
+            # Ölçekli PageRank: 1.0 ortalama bir sayfayı ifade eder
+            result[relative_path] = {
+                'pagerank': round(float(ranks[node] * scale), 6),
+                'in_degree': int(in_degree[node])
+            }
+    return result
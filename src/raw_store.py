@@ -0,0 +1,225 @@
+"""
+Ham HTML Deposu
+Bu modül dokümanların ham HTML içeriğini JSON dosyalarının dışında, tek bir sıkıştırılmış
+paket dosyasında saklar. Her kayıt bağımsız sıkıştırılır ve SHA-256 ile adreslenir;
+JSON dokümanları yalnızca (hash, ofset, uzunluk) referansı taşır ve HTML gerektiğinde
+tembel olarak okunur. Aynı içerik ikinci kez yazılmaz; artık referans verilmeyen
+kayıtlar compact() ile paketten atılır.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from file_writer import FSYNC_POLICIES
+
+logger = logging.getLogger(__name__)
+
+PACK_NAME = "raw_html.pack"
+INDEX_NAME = "raw_html.idx"
+
+# İndeksin ilk satırı etkin paket dosyasını adlandırır (sıkıştırma sonrası paket adı değişir)
+PACK_HEADER = "#pack\t"
+
+# JSON dokümanlarındaki raw_html yerleşim seçenekleri
+#   inline: ham HTML JSON içinde (eski davranış)
+#   store:  ham HTML paket dosyasında, JSON içinde raw_html_ref
+#   none:   ham HTML hiç saklanmaz
+RAW_HTML_MODES = ("inline", "store", "none")
+
+
+class RawHTMLStore:
+    """İçerik adresli, sıkıştırılmış ham HTML paketi
+
+    put() thread güvenlidir ve dönmeden önce paket ile indeksi işletim sistemine (fsync
+    politikası gerektiriyorsa diske) yazar; böylece referansı taşıyan JSON dokümanı hiçbir
+    zaman diskte olmayan bir kayda işaret etmez. Okumalar referanstaki ofset yerine
+    hash ile indeksten çözülür, bu yüzden sıkıştırma sonrası eski referanslar geçerli kalır.
+    """
+
+    def __init__(self, directory: Union[str, Path], compression_level: int = 6, fsync_policy: str = "none"):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Geçersiz fsync politikası: {fsync_policy} (seçenekler: {', '.join(FSYNC_POLICIES)})")
+
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_NAME
+        self.compression_level = compression_level
+        self.fsync_policy = fsync_policy
+        self.pack_name = PACK_NAME
+        self._entries: Optional[Dict[str, Dict[str, int]]] = None
+        self._pack_writer = None
+        self._index_writer = None
+        self._reader = None
+        self._lock = threading.RLock()
+
+    @property
+    def pack_path(self) -> Path:
+        """Etkin paket dosyasının yolu"""
+        return self.directory / self.pack_name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _load_entries(self) -> Dict[str, Dict[str, int]]:
+        """Paket indeksini (hash -> ofset/uzunluk) yükle"""
+        with self._lock:
+            if self._entries is None:
+                self._entries = {}
+                if self.index_path.exists():
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            if line.startswith(PACK_HEADER):
+                                self.pack_name = line[len(PACK_HEADER):].strip()
+                                continue
+                            parts = line.rstrip('\n').split('\t')
+                            if len(parts) == 4:
+                                sha, offset, length, size = parts
+                                self._entries[sha] = {"offset": int(offset), "length": int(length), "size": int(size)}
+
+                    # Çökme sonrası paketin sonunu aşan kayıtlar (yarım yazım) yok sayılır
+                    pack_size = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+                    torn = [sha for sha, entry in self._entries.items()
+                            if entry["offset"] + entry["length"] > pack_size]
+                    for sha in torn:
+                        del self._entries[sha]
+                    if torn:
+                        logger.warning(f"Ham HTML indeksinde paketi aşan {len(torn)} kayıt atlandı: {self.index_path}")
+            return self._entries
+
+    def _sync(self, handle):
+        """Tamponu işletim sistemine yaz, politika gerektiriyorsa diske kaydet"""
+        handle.flush()
+        if self.fsync_policy != "none":
+            os.fsync(handle.fileno())
+
+    def put(self, html: str) -> Dict[str, Any]:
+        """HTML'i pakete ekle (aynısı varsa tekrar yazma) ve referansını döndür
+
+        Sıkıştırma kilit dışında yapılır; dönüştürücü bu metodu yazıcının thread havuzunda çağırır.
+        """
+        data = html.encode('utf-8')
+        sha = hashlib.sha256(data).hexdigest()
+        entries = self._load_entries()
+
+        with self._lock:
+            if sha in entries:
+                return {"store": self.pack_name, "sha256": sha, **entries[sha]}
+
+        compressed = zlib.compress(data, self.compression_level)
+
+        with self._lock:
+            if sha not in entries:
+                if self._pack_writer is None:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    self._pack_writer = open(self.pack_path, 'ab')
+                    self._index_writer = open(self.index_path, 'a', encoding='utf-8')
+
+                # Önce paket, sonra indeks: indeks hiçbir zaman diskte olmayan veriye işaret etmez
+                offset = self._pack_writer.seek(0, 2)
+                self._pack_writer.write(compressed)
+                self._sync(self._pack_writer)
+                self._index_writer.write(f"{sha}\t{offset}\t{len(compressed)}\t{len(data)}\n")
+                self._sync(self._index_writer)
+                entries[sha] = {"offset": offset, "length": len(compressed), "size": len(data)}
+
+            return {"store": self.pack_name, "sha256": sha, **entries[sha]}
+
+    def get(self, ref: Dict[str, Any]) -> str:
+        """Referanstaki HTML'i okuyup aç (konum indeksten hash ile çözülür)"""
+        with self._lock:
+            entry = self._load_entries().get(ref.get("sha256")) or ref
+            if self._reader is None:
+                self._reader = open(self.pack_path, 'rb')
+
+            self._reader.seek(entry["offset"])
+            compressed = self._reader.read(entry["length"])
+        return zlib.decompress(compressed).decode('utf-8')
+
+    def get_by_hash(self, sha: str) -> Optional[str]:
+        """SHA-256 ile HTML'i bul"""
+        entry = self._load_entries().get(sha)
+        if entry is None:
+            return None
+        return self.get({"sha256": sha, **entry})
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._load_entries()
+
+    def __len__(self) -> int:
+        return len(self._load_entries())
+
+    def compact(self, live: Iterable[str]) -> Dict[str, int]:
+        """Yalnızca `live` hash'leri yeni bir pakete kopyala, eski paketi sil
+
+        Yeni paket ve indeks geçici adlarla yazılır; tek işlem noktası indeksin atomik olarak
+        yeniden adlandırılmasıdır. Öncesinde çökülürse eski paket geçerli kalır.
+        """
+        live = set(live)
+        with self._lock:
+            entries = self._load_entries()
+            keep = {sha: entry for sha, entry in entries.items() if sha in live}
+            before = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+            if len(keep) == len(entries):
+                return {'kept': len(keep), 'dropped': 0, 'bytes_before': before, 'bytes_after': before}
+
+            old_pack = self.pack_path
+            generation = int(self.pack_name.split('.')[1]) + 1 if self.pack_name.count('.') == 2 else 1
+            new_name = f"raw_html.{generation}.pack"
+            self.close()
+
+            new_entries: Dict[str, Dict[str, int]] = {}
+            temp_index = self.index_path.with_name(f".{INDEX_NAME}.{os.getpid()}.tmp")
+            with open(old_pack, 'rb') as source, open(self.directory / new_name, 'wb') as pack:
+                for sha, entry in sorted(keep.items(), key=lambda item: item[1]["offset"]):
+                    source.seek(entry["offset"])
+                    new_entries[sha] = {"offset": pack.tell(), "length": entry["length"], "size": entry["size"]}
+                    pack.write(source.read(entry["length"]))
+                self._sync(pack)
+            with open(temp_index, 'w', encoding='utf-8') as index:
+                index.write(f"{PACK_HEADER}{new_name}\n")
+                for sha, entry in new_entries.items():
+                    index.write(f"{sha}\t{entry['offset']}\t{entry['length']}\t{entry['size']}\n")
+                self._sync(index)
+            os.replace(temp_index, self.index_path)
+
+            old_pack.unlink(missing_ok=True)
+            self.pack_name = new_name
+            self._entries = new_entries
+            after = self.pack_path.stat().st_size
+        logger.info(f"Ham HTML paketi sıkıştırıldı: {len(entries) - len(keep)} kayıt atıldı, "
+                    f"{before} -> {after} bayt")
+        return {'kept': len(keep), 'dropped': len(entries) - len(keep), 'bytes_before': before, 'bytes_after': after}
+
+    def close(self):
+        """Açık dosyaları kapat"""
+        with self._lock:
+            for handle in (self._pack_writer, self._index_writer, self._reader):
+                if handle is not None:
+                    handle.close()
+            self._pack_writer = None
+            self._index_writer = None
+            self._reader = None
+
+
+def load_raw_html(json_data: Dict[str, Any], json_dir: Union[str, Path],
+                  store: Optional[RawHTMLStore] = None) -> Optional[str]:
+    """Dokümanın ham HTML'ini hangi modda yazıldığından bağımsız olarak döndür"""
+    if "raw_html" in json_data:
+        return json_data["raw_html"]
+
+    ref = json_data.get("raw_html_ref")
+    if not ref:
+        return None
+
+    if store is not None:
+        return store.get(ref)
+
+    with RawHTMLStore(json_dir) as temp_store:
+        return temp_store.get(ref)
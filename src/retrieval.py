@@ -0,0 +1,473 @@
+"""
+Parçalama ve Gömme (Embedding) Hattı
+Bu modül dönüştürülmüş dokümanların content.text alanını başlık ve madde sınırlarına
+uyan, örtüşmeli parçalara böler; parçaları bellek eşlenebilir (mmap) shard'lara yazar,
+takılabilir bir yerel gömme fonksiyonuyla NumPy vektör matrisi üretir ve kaba kuvvet
+veya IVF ile en yakın komşu sorgusu sunar.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from corpus import Corpus
+
+logger = logging.getLogger(__name__)
+
+# Metin listesi alıp (n, boyut) float32 matris döndüren fonksiyon
+EmbeddingFunction = Callable[[List[str]], np.ndarray]
+
+# Noktalama ancak ardından boşluk geliyorsa cümle sonudur (12.03.2004, 1.2 gibi değerler bölünmez)
+SENTENCE_PATTERN = re.compile(r'(?:[^.!?;]|[.!?;](?![.!?;\s]))+(?:[.!?;]+|$)')
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Parçalama için dokümandan okunan alanlar
+CHUNK_FIELDS = ["content.text", "content.headings", "legal.articles"]
+
+INDEX_DTYPE = np.dtype([
+    ('byte_start', '<i8'),
+    ('byte_len', '<i4'),
+    ('doc', '<i4'),
+    ('start', '<i8'),
+    ('end', '<i8')
+])
+
+
+def iter_documents(json_dir: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """json_output altındaki dokümanları Corpus üzerinden tek tek (tembel) oku
+
+    Yalnızca parçalayıcının kullandığı alanlar (metin, başlıklar, maddeler) döndürülür.
+    """
+    with Corpus(json_dir) as corpus:
+        yield from corpus.iter_documents(fields=CHUNK_FIELDS)
+
+
+def chunk_id(doc_key: str, start: int, end: int) -> str:
+    """Doküman ve ofsetlerden kararlı parça kimliği üret"""
+    return hashlib.sha1(f"{doc_key}:{start}:{end}".encode('utf-8')).hexdigest()[:16]
+
+
+class TextChunker:
+    """Başlık ve madde sınırlarına uyan, örtüşmeli akış parçalayıcı"""
+
+    def __init__(self, max_tokens: int = 256, overlap_tokens: int = 32):
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens, max_tokens değerinden küçük olmalı")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def section_boundaries(self, text: str, document: Dict[str, Any]) -> List[Tuple[int, str]]:
+        """Madde ve başlık başlangıçlarını (ofset, bölüm adı) olarak döndür"""
+        boundaries = {0: ""}
+
+        for article in document.get("legal", {}).get("articles", []):
+            boundaries[article["start"]] = article["id"]
+
+        # Başlıklar metinde sırayla geçer; konumlarını ileri doğru arayarak bul
+        position = 0
+        for heading in document.get("content", {}).get("headings", []):
+            heading_text = heading.get("text", "")
+            if not heading_text:
+                continue
+            found = text.find(heading_text, position)
+            if found >= 0:
+                boundaries.setdefault(found, heading_text[:80])
+                position = found + len(heading_text)
+
+        return sorted(boundaries.items())
+
+    def split_sentences(self, text: str, start: int, end: int) -> List[Tuple[int, int, int]]:
+        """Bölümü (başlangıç, bitiş, token sayısı) cümlelerine ayır"""
+        sentences = []
+        for match in SENTENCE_PATTERN.finditer(text, start, end):
+            tokens = list(TOKEN_PATTERN.finditer(text, match.start(), match.end()))
+            if not tokens:
+                continue
+            sentence_start = match.start() + len(match.group()) - len(match.group().lstrip())
+
+            # max_tokens'tan uzun cümleleri token sınırlarından böl
+            for i in range(0, len(tokens), self.max_tokens):
+                piece = tokens[i:i + self.max_tokens]
+                piece_start = sentence_start if i == 0 else piece[0].start()
+                piece_end = match.end() if i + self.max_tokens >= len(tokens) else piece[-1].end()
+                sentences.append((piece_start, piece_end, len(piece)))
+
+        return sentences
+
+    def chunk_text(self, doc_key: str, text: str, document: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Tek bir dokümanın metnini parçalara böl"""
+        boundaries = self.section_boundaries(text, document or {})
+        boundaries.append((len(text), ""))
+
+        for (section_start, section), (section_end, _) in zip(boundaries, boundaries[1:]):
+            sentences = self.split_sentences(text, section_start, section_end)
+            first = 0
+
+            while first < len(sentences):
+                # Token bütçesi dolana kadar cümle ekle
+                last = first
+                tokens = 0
+                while last < len(sentences) and (tokens + sentences[last][2] <= self.max_tokens or last == first):
+                    tokens += sentences[last][2]
+                    last += 1
+
+                start = sentences[first][0]
+                end = sentences[last - 1][1]
+                yield {
+                    "id": chunk_id(doc_key, start, end),
+                    "doc": doc_key,
+                    "section": section,
+                    "start": start,
+                    "end": end,
+                    "text": text[start:end].strip()
+                }
+
+                if last >= len(sentences):
+                    break
+
+                # Örtüşme: son cümlelerden overlap_tokens kadarını bir sonraki parçaya taşı
+                carried = 0
+                next_first = last
+                while next_first - 1 > first and carried + sentences[next_first - 1][2] <= self.overlap_tokens:
+                    next_first -= 1
+                    carried += sentences[next_first][2]
+                first = next_first
+
+    def chunk_corpus(self, json_dir: str) -> Iterator[Dict[str, Any]]:
+        """Tüm korpusu akış halinde parçala"""
+        for doc_key, document in iter_documents(json_dir):
+            text = document.get("content", {}).get("text", "")
+            if text:
+                yield from self.chunk_text(doc_key, text, document)
+
+
+class ChunkShardWriter:
+    """Parçaları bellek eşlenebilir shard dosyalarına yazar
+
+    Her shard üç dosyadan oluşur: UTF-8 metin bloğu (.txt), sabit genişlikli
+    ofset tablosu (.idx.npy) ve kimlik/doküman listeleri (.meta.json).
+    """
+
+    def __init__(self, output_dir: str, shard_size: int = 50000):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.shard_count = 0
+        self.total_chunks = 0
+        self.shard_names: List[str] = []
+        # Yazım bitene kadar önceki çalıştırmanın manifesti geçersizdir
+        (self.output_dir / "manifest.json").unlink(missing_ok=True)
+        self._reset()
+
+    def _reset(self):
+        """Yeni shard için tamponları sıfırla"""
+        self._rows: List[Tuple[int, int, int, int, int]] = []
+        self._ids: List[str] = []
+        self._sections: List[str] = []
+        self._docs: List[str] = []
+        self._doc_ids: Dict[str, int] = {}
+        self._text_file = None
+        self._byte_offset = 0
+
+    def add(self, chunk: Dict[str, Any]):
+        """Bir parçayı aktif shard'a ekle"""
+        if self._text_file is None:
+            self._text_file = open(self.output_dir / f"chunks-{self.shard_count:05d}.txt", 'wb')
+
+        data = chunk["text"].encode('utf-8')
+        self._text_file.write(data)
+
+        doc = self._doc_ids.setdefault(chunk["doc"], len(self._docs))
+        if doc == len(self._docs):
+            self._docs.append(chunk["doc"])
+
+        self._rows.append((self._byte_offset, len(data), doc, chunk["start"], chunk["end"]))
+        self._ids.append(chunk["id"])
+        self._sections.append(chunk["section"])
+        self._byte_offset += len(data)
+
+        if len(self._rows) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Aktif shard'ı diske yaz"""
+        if self._text_file is None:
+            return
+
+        self._text_file.close()
+        name = f"chunks-{self.shard_count:05d}"
+        np.save(self.output_dir / f"{name}.idx.npy", np.array(self._rows, dtype=INDEX_DTYPE))
+        with open(self.output_dir / f"{name}.meta.json", 'w', encoding='utf-8') as f:
+            json.dump({"docs": self._docs, "ids": self._ids, "sections": self._sections}, f, ensure_ascii=False)
+
+        self.total_chunks += len(self._rows)
+        self.shard_names.append(name)
+        self.shard_count += 1
+        self._reset()
+
+    def close(self):
+        """Kalan parçaları yaz, önceki çalıştırmadan kalan shard'ları sil ve manifesti oluştur"""
+        self.flush()
+        current = set(self.shard_names)
+        for path in self.output_dir.glob("chunks-*"):
+            if path.name.split('.', 1)[0] not in current:
+                path.unlink()
+        with open(self.output_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump({"shards": self.shard_count, "chunks": self.total_chunks, "names": self.shard_names}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ChunkStore:
+    """Shard'lara mmap ile salt okunur erişim (yalnızca manifestte listelenen shard'lar)"""
+
+    def __init__(self, chunk_dir: str):
+        self.chunk_dir = Path(chunk_dir)
+        self._shards = []
+        self._offsets = [0]
+
+        manifest_path = self.chunk_dir / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Parça manifesti bulunamadı (yazım tamamlanmamış olabilir): {manifest_path}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        names = manifest.get("names") or [f"chunks-{i:05d}" for i in range(manifest["shards"])]
+
+        for name in names:
+            index = np.load(self.chunk_dir / f"{name}.idx.npy", mmap_mode='r')
+            with open(self.chunk_dir / f"{name}.meta.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            text_path = self.chunk_dir / f"{name}.txt"
+            text_map = None
+            if text_path.stat().st_size:
+                with open(text_path, 'rb') as f:
+                    text_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._shards.append((index, meta, text_map))
+            self._offsets.append(self._offsets[-1] + len(index))
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Genel parça numarasını (shard, yerel sıra) olarak çöz"""
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        shard = int(np.searchsorted(self._offsets, position, side='right')) - 1
+        return shard, position - self._offsets[shard]
+
+    def text(self, position: int) -> str:
+        """Parça metnini döndür"""
+        shard, local = self._locate(position)
+        index, _, text_map = self._shards[shard]
+        row = index[local]
+        start = int(row['byte_start'])
+        return text_map[start:start + int(row['byte_len'])].decode('utf-8')
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        shard, local = self._locate(position)
+        index, meta, _ = self._shards[shard]
+        row = index[local]
+        return {
+            "id": meta["ids"][local],
+            "doc": meta["docs"][int(row['doc'])],
+            "section": meta["sections"][local],
+            "start": int(row['start']),
+            "end": int(row['end']),
+            "text": self.text(position)
+        }
+
+    def iter_texts(self, batch_size: int = 256) -> Iterator[List[str]]:
+        """Metinleri batch'ler halinde döndür"""
+        for batch_start in range(0, len(self), batch_size):
+            yield [self.text(i) for i in range(batch_start, min(batch_start + batch_size, len(self)))]
+
+
+class HashingEmbedder:
+    """Bağımlılıksız, CPU üzerinde çalışan özellik hash'leme gömücüsü
+
+    Gerçek bir model (ör. sentence-transformers) aynı imzayla takılabilir;
+    bu sınıf hattın uçtan uca çalışması için yerel varsayılandır.
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 2):
+        self.dim = dim
+        self.ngram = ngram
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        """Token'ın kova indeksini ve işaretini hesapla"""
+        digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        return value % self.dim, 1.0 if (value >> 63) & 1 else -1.0
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        rows, cols, values = [], [], []
+        cache: Dict[str, Tuple[int, float]] = {}
+
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [' '.join(tokens[i:i + self.ngram]) for i in range(len(tokens) - self.ngram + 1)]
+            for feature in features:
+                bucket = cache.get(feature)
+                if bucket is None:
+                    bucket = cache[feature] = self._bucket(feature)
+                rows.append(row)
+                cols.append(bucket[0])
+                values.append(bucket[1])
+
+        # Düzleştirilmiş (satır, kova) indeksleri üzerinde bincount, np.add.at'ten çok daha hızlıdır
+        flat = np.asarray(rows, dtype=np.intp) * self.dim + np.asarray(cols, dtype=np.intp)
+        matrix = np.bincount(flat, weights=values, minlength=len(texts) * self.dim)
+        matrix = matrix.reshape(len(texts), self.dim).astype(np.float32)
+        return normalize(matrix)
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getir (kosinüs benzerliği için)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def embed_store(store: ChunkStore, embedder: EmbeddingFunction, output_path: str,
+                batch_size: int = 256) -> np.ndarray:
+    """Tüm parçaları batch'ler halinde göm ve mmap edilebilir .npy matrisine yaz"""
+    vectors = None
+    row = 0
+
+    for texts in store.iter_texts(batch_size):
+        batch = normalize(np.asarray(embedder(texts), dtype=np.float32))
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float32,
+                                                shape=(len(store), batch.shape[1]))
+        vectors[row:row + len(batch)] = batch
+        row += len(batch)
+
+    if vectors is None:
+        # Boş depoda da dosya yazılır; önceki çalıştırmanın matrisi geride kalmaz
+        vectors = np.zeros((0, 0), dtype=np.float32)
+        np.save(output_path, vectors)
+        return vectors
+
+    vectors.flush()
+    return vectors
+
+
+class VectorIndex:
+    """Kaba kuvvet ve IVF destekli en yakın komşu indeksi (kosinüs benzerliği)"""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.centroids: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+        self.list_members: Optional[np.ndarray] = None
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """Gömme matrisini mmap ile yükle"""
+        return cls(np.load(path, mmap_mode='r'))
+
+    def build_ivf(self, n_lists: int = 64, iterations: int = 8, sample_size: int = 20000, seed: int = 0):
+        """Küresel k-means ile ters dosya (IVF) listelerini oluştur"""
+        rng = np.random.default_rng(seed)
+        n = len(self.vectors)
+        if n == 0:
+            # Boş korpus: IVF oluşturulmaz, search kaba kuvvete (boş sonuca) düşer
+            self.centroids = self.list_offsets = self.list_members = None
+            return
+        n_lists = max(1, min(n_lists, n))
+
+        sample = self.vectors[rng.choice(n, size=min(sample_size, n), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[assignment == i]
+                if len(members):
+                    centroids[i] = members.sum(axis=0)
+            centroids = normalize(centroids)
+
+        # Tüm vektörleri parça parça en yakın merkeze ata
+        assignment = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 65536):
+            assignment[start:start + 65536] = np.argmax(self.vectors[start:start + 65536] @ centroids.T, axis=1)
+
+        order = np.argsort(assignment, kind='stable')
+        self.centroids = centroids
+        self.list_members = order.astype(np.int64)
+        self.list_offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=n_lists))))
+
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorgu vektörleri için (benzerlikler, indeksler) döndür
+
+        nprobe verilirse ve IVF oluşturulmuşsa yalnızca en yakın nprobe listesi taranır.
+        """
+        queries = normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+
+        if nprobe is None or self.centroids is None:
+            return self._top_k(queries @ self.vectors.T, np.arange(len(self.vectors)), k)
+
+        scores_out = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids_out = np.full((len(queries), k), -1, dtype=np.int64)
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+        for q, lists in enumerate(probes):
+            candidates = np.concatenate([
+                self.list_members[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists
+            ])
+            if not len(candidates):
+                continue
+            scores, ids = self._top_k(queries[q:q + 1] @ self.vectors[candidates].T, candidates, k)
+            scores_out[q, :scores.shape[1]] = scores[0]
+            ids_out[q, :ids.shape[1]] = ids[0]
+
+        return scores_out, ids_out
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Skor matrisinden sıralı ilk k sonucu seç"""
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return np.zeros((len(scores), 0), dtype=np.float32), np.zeros((len(scores), 0), dtype=np.int64)
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), ids[np.take_along_axis(top, order, axis=1)]
+
+
+def build_retrieval_export(json_dir: str = "json_output", output_dir: str = "retrieval",
+                           embedder: Optional[EmbeddingFunction] = None,
+                           max_tokens: int = 256, overlap_tokens: int = 32) -> Dict[str, Any]:
+    """Korpusu parçala, shard'lara yaz ve gömme matrisini oluştur"""
+    chunker = TextChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    with ChunkShardWriter(output_dir) as writer:
+        for chunk in chunker.chunk_corpus(json_dir):
+            writer.add(chunk)
+
+    store = ChunkStore(output_dir)
+    embedder = embedder or HashingEmbedder()
+    vectors = embed_store(store, embedder, str(Path(output_dir) / "embeddings.npy"))
+    logger.info(f"{len(store)} parça ve {vectors.shape} boyutlu gömme matrisi oluşturuldu: {output_dir}")
+
+    return {"chunks": len(store), "shards": writer.shard_count, "dim": int(vectors.shape[1]) if vectors.size else 0}
+
+
+def main():
+    """Ana fonksiyon"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    build_retrieval_export("json_output", "retrieval")
+
+
+if __name__ == "__main__":
+    main()
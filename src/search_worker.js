@@ -0,0 +1,110 @@
+/**
+ * Noterlik Arama Worker'ı
+ * Ana indeks kayıtları üzerinde filtreleme ve puanlamayı ana thread dışında yapar.
+ * Dosya hem Web Worker olarak hem de Worker desteklenmediğinde normal script olarak
+ * yüklenebilir; ikinci durumda SearchIndex sınıfı ana thread'de kullanılır.
+ */
+
+class SearchIndex {
+    constructor(items) {
+        const count = items.length;
+        this.count = count;
+        this.titles = new Array(count);
+        this.descriptions = new Array(count);
+        this.keywords = new Array(count);
+        this.years = new Array(count);
+        this.categories = new Array(count);
+        this.ranks = new Float64Array(count);
+
+        // Küçük harfe çevirme her sorguda değil, indeks oluşturulurken bir kez yapılır
+        for (let i = 0; i < count; i++) {
+            const item = items[i];
+            this.titles[i] = SearchIndex.normalize(item.title);
+            this.descriptions[i] = SearchIndex.normalize(item.description);
+            this.keywords[i] = SearchIndex.normalize((item.keywords || []).join(' '));
+            this.years[i] = String(item.year || '');
+            this.categories[i] = item.category;
+            this.ranks[i] = item.rank || 0;
+        }
+    }
+
+    static normalize(text) {
+        // Türkçe I/İ dönüşümü elle yapılır; toLocaleLowerCase('tr-TR') büyük indekslerde belirgin şekilde yavaş
+        return String(text || '').replace(/I/g, 'ı').replace(/İ/g, 'i').toLowerCase();
+    }
+
+    /**
+     * Sorguya uyan kayıtların indekslerini puan sırasıyla döndür.
+     * Her kelime başlık, anahtar kelime, açıklama veya yıldan birinde geçmelidir.
+     */
+    search(term, category) {
+        const tokens = SearchIndex.normalize(term).split(/\s+/).filter(Boolean);
+        const matches = [];
+        const scores = [];
+
+        for (let i = 0; i < this.count; i++) {
+            if (category !== 'all' && this.categories[i] !== category) continue;
+
+            let score = 0;
+            let matched = true;
+            for (const token of tokens) {
+                let tokenScore = 0;
+                const titlePos = this.titles[i].indexOf(token);
+                if (titlePos === 0) tokenScore += 4;
+                else if (titlePos > 0) tokenScore += 3;
+                if (this.keywords[i].includes(token)) tokenScore += 2;
+                if (this.descriptions[i].includes(token)) tokenScore += 1;
+                if (this.years[i] === token) tokenScore += 2;
+                if (tokenScore === 0) {
+                    matched = false;
+                    break;
+                }
+                score += tokenScore;
+            }
+
+            if (matched) {
+                matches.push(i);
+                scores.push(score);
+            }
+        }
+
+        const indices = Int32Array.from(matches);
+        if (tokens.length > 0) {
+            // Puan eşitse önem (PageRank), o da eşitse indeks sırası korunur.
+            // Karşılaştırma, eşleşme sırasına hizalanmış tipli diziler üzerinde yapılır.
+            const count = matches.length;
+            const matchScores = Int32Array.from(scores);
+            const matchRanks = new Float64Array(count);
+            for (let j = 0; j < count; j++) matchRanks[j] = this.ranks[matches[j]];
+            const order = new Int32Array(count);
+            for (let j = 0; j < count; j++) order[j] = j;
+            order.sort((a, b) => (matchScores[b] - matchScores[a]) || (matchRanks[b] - matchRanks[a]) || (a - b));
+            for (let j = 0; j < count; j++) indices[j] = matches[order[j]];
+        }
+        return indices;
+    }
+}
+
+// Worker olarak çalışıyorsa mesaj protokolü:
+//   { type: 'index', items }                → { type: 'ready', count, elapsed }
+//   { type: 'search', id, term, category }  → { type: 'results', id, indices, elapsed }
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    let index = null;
+
+    self.addEventListener('message', (event) => {
+        const message = event.data;
+        const start = performance.now();
+
+        if (message.type === 'index') {
+            index = new SearchIndex(message.items);
+            self.postMessage({ type: 'ready', count: index.count, elapsed: performance.now() - start });
+        } else if (message.type === 'search' && index) {
+            const indices = index.search(message.term, message.category);
+            // Sonuç dizisi kopyalanmadan aktarılır
+            self.postMessage(
+                { type: 'results', id: message.id, indices, elapsed: performance.now() - start },
+                [indices.buffer]
+            );
+        }
+    });
+}
@@ -0,0 +1,538 @@
+"""
+SQLite Depolama Arka Ucu
+Bu modül ham sayfaları, dönüştürülmüş dokümanları, URL eşlemelerini ve ana indeks
+satırlarını tek bir SQLite veritabanında (WAL modu) tutar. Scraper ve dönüştürücü
+AsyncFileWriter ile aynı arayüze sahip SQLiteWriter üzerinden batch'li, işlem (transaction)
+içinde yazar; listeleme, istatistik ve indeks oluşturma dosya sistemi taraması yerine
+sorgu olarak çalışır. export_layout() görüntüleyicinin beklediği dosya düzenini üretir.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from file_writer import AsyncFileWriter
+
+logger = logging.getLogger(__name__)
+
+STORE_NAME = "noterlik.db"
+SCHEMA_VERSION = 2
+
+# Ana indeks satırı alanları (master_index.json ile aynı sırada)
+INDEX_COLUMNS = (
+    "file_path", "title", "description", "keywords", "word_count", "link_count", "image_count",
+    "heading_count", "table_count", "doc_type", "doc_number", "doc_year", "doc_date",
+    "article_count", "conversion_date"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    html TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pages_directory ON pages(directory);
+CREATE INDEX IF NOT EXISTS pages_updated_at ON pages(updated_at);
+
+CREATE TABLE IF NOT EXISTS url_mappings (
+    url TEXT PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS url_mappings_path ON url_mappings(path);
+
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    page_path TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_directory ON documents(directory);
+CREATE INDEX IF NOT EXISTS documents_page_path ON documents(page_path);
+CREATE INDEX IF NOT EXISTS documents_updated_at ON documents(updated_at);
+
+CREATE TABLE IF NOT EXISTS index_rows (
+    file_path TEXT PRIMARY KEY REFERENCES documents(path) ON DELETE CASCADE,
+    title TEXT,
+    description TEXT,
+    keywords TEXT,
+    word_count INTEGER,
+    link_count INTEGER,
+    image_count INTEGER,
+    heading_count INTEGER,
+    table_count INTEGER,
+    doc_type TEXT,
+    doc_number TEXT,
+    doc_year INTEGER,
+    doc_date TEXT,
+    article_count INTEGER,
+    conversion_date TEXT,
+    pagerank REAL,
+    in_degree INTEGER
+);
+CREATE INDEX IF NOT EXISTS index_rows_doc_type ON index_rows(doc_type, doc_year);
+CREATE INDEX IF NOT EXISTS index_rows_doc_year ON index_rows(doc_year);
+CREATE INDEX IF NOT EXISTS index_rows_pagerank ON index_rows(pagerank DESC);
+
+CREATE TABLE IF NOT EXISTS removed (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    removed_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, path)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Tablo türü -> (tablo, dışa aktarılacak içerik sütunu)
+KINDS = {"pages": ("pages", "html"), "documents": ("documents", "body")}
+
+# Değişiklik sürümü sütunu olan tablolar (eski şemalara eklenir, indeksi de sonradan kurulur)
+VERSIONED_TABLES = ("pages", "documents", "removed")
+
+
+def _directory(path: str) -> str:
+    """Anahtarın üst dizini ('.' kök dizin)"""
+    return PurePosixPath(path).parent.as_posix()
+
+
+class SQLiteStore:
+    """Sayfa, doküman, URL eşlemesi ve indeks satırları için tek dosyalı SQLite deposu
+
+    Bağlantılar thread başına açılır; WAL modunda okuyucular yazıcıyı beklemez. Yazımlar
+    SQLiteWriter'ın tek thread'inde batch'ler halinde tek işlemde yapılır. Anahtarlar
+    kök dizine göreli, '/' ayraçlı yollardır (ör. 'mevzuat/kanun.html').
+    """
+
+    def __init__(self, path: Union[str, Path] = STORE_NAME, busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # executescript kendi işlemini yönetir (açık bir işlem varsa önce COMMIT eder)
+        self.connection().executescript(SCHEMA)
+        with self.transaction() as connection:
+            self._migrate(connection)
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                               (str(SCHEMA_VERSION),))
+            connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('change_seq', '0')")
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection):
+        """Sürüm 1 şemasına version sütununu ekle
+
+        Mevcut satırlar 1. sürüme alınır; böylece geçişten sonraki ilk artımlı dışa aktarım
+        (exported_version = 0) hepsini bir kez yeniden yazar.
+        """
+        for table in VERSIONED_TABLES:
+            columns = {row["name"] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if "version" not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+                connection.execute(f"UPDATE {table} SET version = 1")
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('change_seq', '1')")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_version ON {table}(version)")
+
+    @staticmethod
+    def _next_version(connection: sqlite3.Connection) -> int:
+        """Açık yazma işlemi içinde değişiklik sayacını artır ve yeni değeri döndür
+
+        Duvar saati yerine monoton sayaç kullanılır: saat geri alınsa veya makineler arasında
+        kayma olsa da artımlı dışa aktarım hiçbir değişikliği kaçırmaz. BEGIN IMMEDIATE
+        yazıcıları sıraya soktuğundan oku-artır-yaz yarışsızdır.
+        """
+        row = connection.execute("SELECT value FROM meta WHERE key = 'change_seq'").fetchone()
+        version = (int(row[0]) if row else 0) + 1
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('change_seq', ?)", (str(version),))
+        return version
+
+    def connection(self) -> sqlite3.Connection:
+        """Bu thread'in bağlantısını döndür, yoksa aç"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                         isolation_level=None, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yazma işlemi: hata olursa tüm batch geri alınır"""
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self):
+        """Tüm thread bağlantılarını kapat"""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def key(path: Union[str, Path], root: Optional[Union[str, Path]] = None) -> str:
+        """Yolu kök dizine göreli, '/' ayraçlı anahtara çevir"""
+        path = Path(path)
+        if root is not None:
+            try:
+                path = path.relative_to(root)
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    def writer(self, kind: str, root: Union[str, Path], **kwargs: Any) -> "SQLiteWriter":
+        """Verilen tabloya yazan, AsyncFileWriter uyumlu yazıcı oluştur"""
+        return SQLiteWriter(self, kind, root, **kwargs)
+
+    # --- Yazma ---
+
+    def write_pages(self, rows: List[Tuple[str, str]]) -> List[int]:
+        """(anahtar, html) satırlarını tek işlemde yaz, bayt boyutlarını döndür"""
+        now = time.time()
+        records = []
+        for path, html in rows:
+            data = html.encode('utf-8')
+            records.append((path, _directory(path), html, len(data), hashlib.sha256(data).hexdigest(), now))
+
+        with self.transaction() as connection:
+            version = self._next_version(connection)
+            connection.executemany(
+                "INSERT OR REPLACE INTO pages (path, directory, html, size, sha256, updated_at, version) "
+                f"VALUES (?, ?, ?, ?, ?, ?, {version})", records
+            )
+            connection.executemany("DELETE FROM removed WHERE kind = 'pages' AND path = ?",
+                                   [(record[0],) for record in records])
+        return [record[3] for record in records]
+
+    def write_documents(self, rows: List[Tuple[str, str]],
+                        index_rows: Optional[Dict[str, Dict[str, Any]]] = None) -> List[int]:
+        """(anahtar, json) satırlarını ve varsa indeks satırlarını aynı işlemde yaz"""
+        now = time.time()
+        index_rows = index_rows or {}
+        records = []
+        entries = []
+        for path, body in rows:
+            page_path = PurePosixPath(path).with_suffix('.html').as_posix()
+            records.append((path, _directory(path), page_path, body, len(body.encode('utf-8')), now))
+            entry = index_rows.get(path)
+            if entry is not None:
+                entries.append(tuple(
+                    json.dumps(entry.get(column, []), ensure_ascii=False) if column == "keywords"
+                    else path if column == "file_path" else entry.get(column)
+                    for column in INDEX_COLUMNS
+                ))
+
+        placeholders = ", ".join("?" for _ in INDEX_COLUMNS)
+        with self.transaction() as connection:
+            version = self._next_version(connection)
+            connection.executemany(
+                "INSERT INTO documents (path, directory, page_path, body, size, updated_at, version) "
+                f"VALUES (?, ?, ?, ?, ?, ?, {version}) ON CONFLICT(path) DO UPDATE SET "
+                "directory = excluded.directory, page_path = excluded.page_path, body = excluded.body, "
+                "size = excluded.size, updated_at = excluded.updated_at, version = excluded.version", records
+            )
+            # PageRank / giriş derecesi satır yenilendiğinde korunur, create_master_index tazeler
+            connection.executemany(
+                f"INSERT INTO index_rows ({', '.join(INDEX_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(file_path) DO UPDATE SET "
+                + ", ".join(f"{column} = excluded.{column}" for column in INDEX_COLUMNS[1:]),
+                entries
+            )
+            connection.executemany("DELETE FROM removed WHERE kind = 'documents' AND path = ?",
+                                   [(record[0],) for record in records])
+        return [record[4] for record in records]
+
+    def delete(self, kind: str, paths: Iterable[str]) -> int:
+        """Satırları sil ve yalnızca gerçekten silinenler için dışa aktarım silme kaydı bırak"""
+        table, _ = KINDS[kind]
+        now = time.time()
+        with self.transaction() as connection:
+            deleted = [path for path in dict.fromkeys(paths)
+                       if connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,)).rowcount]
+            if deleted:
+                version = self._next_version(connection)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO removed (kind, path, removed_at, version) VALUES (?, ?, ?, ?)",
+                    [(kind, path, now, version) for path in deleted]
+                )
+        return len(deleted)
+
+    def put_url_mappings(self, mapping: Dict[str, str], file_counter: Optional[Dict[str, int]] = None):
+        """URL -> sayfa anahtarı eşlemesini (ve dosya adı sayaçlarını) tamamen değiştir"""
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM url_mappings")
+            connection.executemany("INSERT INTO url_mappings (url, path) VALUES (?, ?)", mapping.items())
+            if file_counter is not None:
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('file_counter', ?)",
+                                   (json.dumps(file_counter, ensure_ascii=False),))
+
+    def update_ranks(self, entries: Iterable[Dict[str, Any]]):
+        """İndeks satırlarının PageRank / giriş derecesi değerlerini güncelle"""
+        with self.transaction() as connection:
+            connection.execute("UPDATE index_rows SET pagerank = NULL, in_degree = NULL")
+            connection.executemany(
+                "UPDATE index_rows SET pagerank = ?, in_degree = ? WHERE file_path = ?",
+                [(entry["pagerank"], entry.get("in_degree"), entry["file_path"])
+                 for entry in entries if "pagerank" in entry]
+            )
+
+    def set_meta(self, key: str, value: Any):
+        with self.transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def current_version(self) -> int:
+        """Son işlenmiş (commit edilmiş) değişikliğin sürümü"""
+        return self.get_meta("change_seq", 0)
+
+    # --- Okuma ---
+
+    def page_paths(self) -> List[str]:
+        """Tüm sayfa anahtarları"""
+        return [row[0] for row in self.connection().execute("SELECT path FROM pages ORDER BY path")]
+
+    def read_page(self, path: str) -> Optional[str]:
+        """Sayfanın ham HTML'i"""
+        row = self.connection().execute("SELECT html FROM pages WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def page_sha256(self, path: str) -> Optional[str]:
+        """Sayfa içeriğinin SHA-256 özeti (içerik okunmadan değişiklik kontrolü için)"""
+        row = self.connection().execute("SELECT sha256 FROM pages WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def read_document(self, path: str) -> Optional[Dict[str, Any]]:
+        """Dönüştürülmüş dokümanı sözlük olarak döndür"""
+        row = self.connection().execute("SELECT body FROM documents WHERE path = ?", (path,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def url_mappings(self) -> Dict[str, str]:
+        """URL -> sayfa anahtarı eşlemesi"""
+        return dict(self.connection().execute("SELECT url, path FROM url_mappings").fetchall())
+
+    def raw_html_hashes(self) -> Set[str]:
+        """Dokümanların referans verdiği ham HTML paket kayıtları (raw_html_ref.sha256)"""
+        return {row[0] for row in self.connection().execute(
+            "SELECT json_extract(body, '$.raw_html_ref.sha256') AS sha FROM documents WHERE sha IS NOT NULL"
+        )}
+
+    def index_rows(self, doc_type: Optional[str] = None, year: Optional[int] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Ana indeks satırları (önem sırasına göre), isteğe bağlı tür/yıl filtresiyle"""
+        clauses, params = [], []
+        if doc_type is not None:
+            clauses.append("doc_type = ?")
+            params.append(doc_type)
+        if year is not None:
+            clauses.append("doc_year = ?")
+            params.append(year)
+        sql = "SELECT * FROM index_rows"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY pagerank IS NULL, pagerank DESC, file_path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        entries = []
+        for row in self.connection().execute(sql, params):
+            entry = {column: row[column] for column in INDEX_COLUMNS}
+            entry["keywords"] = json.loads(entry["keywords"]) if entry["keywords"] else []
+            if row["pagerank"] is not None:
+                entry["pagerank"] = row["pagerank"]
+                entry["in_degree"] = row["in_degree"]
+            entries.append(entry)
+        return entries
+
+    def stale_pages(self) -> Tuple[List[str], List[str]]:
+        """Dokümanı olmayan veya dokümanından yeni sayfalar ile sayfası silinmiş dokümanlar"""
+        connection = self.connection()
+        changed = [row[0] for row in connection.execute(
+            "SELECT p.path FROM pages p LEFT JOIN documents d ON d.page_path = p.path "
+            "WHERE d.path IS NULL OR d.version < p.version ORDER BY p.path"
+        )]
+        removed = [row[0] for row in connection.execute(
+            "SELECT d.page_path FROM documents d LEFT JOIN pages p ON p.path = d.page_path "
+            "WHERE p.path IS NULL ORDER BY d.page_path"
+        )]
+        return changed, removed
+
+    def stats(self, top: int = 5) -> Dict[str, Any]:
+        """Tablo bazında sayı/bayt toplamları ve en büyük dizinler"""
+        connection = self.connection()
+        result: Dict[str, Any] = {}
+        for kind, (table, _) in KINDS.items():
+            row = connection.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {table}").fetchone()
+            directories = connection.execute(
+                f"SELECT directory, COUNT(*) AS files, SUM(size) AS bytes FROM {table} "
+                f"GROUP BY directory ORDER BY bytes DESC LIMIT ?", (top,)
+            ).fetchall()
+            result[kind] = {
+                'files': row[0],
+                'bytes': row[1],
+                'directories': [dict(directory) for directory in directories]
+            }
+        result['url_mappings'] = connection.execute("SELECT COUNT(*) FROM url_mappings").fetchone()[0]
+        result['index_rows'] = connection.execute("SELECT COUNT(*) FROM index_rows").fetchone()[0]
+        result['database_bytes'] = sum(
+            path.stat().st_size for path in (self.path, Path(f"{self.path}-wal")) if path.exists()
+        )
+        return result
+
+    def changed_since(self, kind: str, since: int,
+                      until: Optional[int] = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """since sürümünden sonra (until dahil) yazılan (anahtar, içerik) satırları ve silinen anahtarlar"""
+        table, column = KINDS[kind]
+        until = self.current_version() if until is None else until
+        connection = self.connection()
+        rows = [tuple(row) for row in connection.execute(
+            f"SELECT path, {column} FROM {table} WHERE version > ? AND version <= ?", (since, until)
+        )]
+        removed = [row[0] for row in connection.execute(
+            "SELECT path FROM removed WHERE kind = ? AND version > ? AND version <= ?", (kind, since, until)
+        )]
+        return rows, removed
+
+
+class SQLiteWriter(AsyncFileWriter):
+    """AsyncFileWriter ile aynı arayüzde, dosyalar yerine SQLite tablosuna yazan yazıcı
+
+    Kuyruk, batch oluşturma, geri basınç ve on_written geri çağırması AsyncFileWriter'dan
+    gelir; her batch tek thread'de tek bir işlemle (executemany) yazılır. Dokümanlar için
+    stage_index_row() ile bırakılan indeks satırı aynı işlemde yazılır.
+    """
+
+    def __init__(self, store: SQLiteStore, kind: str, root: Union[str, Path], batch_size: int = 256,
+                 queue_size: int = 1024, on_written: Optional[Callable[[Path, int], None]] = None):
+        if kind not in KINDS:
+            raise ValueError(f"Geçersiz tablo türü: {kind} (seçenekler: {', '.join(KINDS)})")
+        # SQLite'ta tek yazıcı olduğundan tek thread yeterli (kilit çekişmesi olmaz)
+        super().__init__(max_workers=1, batch_size=batch_size, queue_size=queue_size, on_written=on_written)
+        self.store = store
+        self.kind = kind
+        self.root = Path(root)
+        self.index_rows: Dict[str, Dict[str, Any]] = {}
+
+    def stage_index_row(self, path: Union[str, Path], entry: Dict[str, Any]):
+        """Bir sonraki submit edilecek doküman için indeks satırını bırak"""
+        self.index_rows[self.store.key(path, self.root)] = entry
+
+    def _write_batch(self, jobs: List[Tuple[Path, str]]) -> List[Union[int, Exception]]:
+        """Batch'i tek işlemde yaz, her satır için bayt boyutunu veya hatayı döndür"""
+        rows = [(self.store.key(path, self.root), content) for path, content in jobs]
+        try:
+            if self.kind == "pages":
+                sizes = self.store.write_pages(rows)
+            else:
+                index_rows = {key: self.index_rows.pop(key) for key, _ in rows if key in self.index_rows}
+                sizes = self.store.write_documents(rows, index_rows)
+        except Exception as e:
+            logger.error(f"SQLite yazma hatası ({self.kind}, {len(jobs)} satır): {str(e)}")
+            with self._dir_lock:
+                self.stats['batches'] += 1
+                self.stats['errors'] += len(jobs)
+            return [e] * len(jobs)
+
+        with self._dir_lock:
+            self.stats['files'] += len(jobs)
+            self.stats['chars'] += sum(len(content) for _, content in jobs)
+            self.stats['bytes'] += sum(sizes)
+            self.stats['batches'] += 1
+        return list(sizes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Yazma istatistiklerini döndür"""
+        return dict(self.stats, backend="sqlite", table=self.kind)
+
+
+async def export_layout(store: SQLiteStore, html_dir: Union[str, Path] = "db",
+                        json_dir: Union[str, Path] = "json_output", full: bool = False,
+                        fsync_policy: str = "none") -> Dict[str, int]:
+    """Veritabanından mevcut dosya düzenini (db/, json_output/, indeksler) üret
+
+    Yalnızca son dışa aktarımdan sonra değişen satırlar yazılır ve silinen satırların
+    dosyaları kaldırılır (full=True ile hepsi yeniden yazılır). Dosyalar AsyncFileWriter
+    üzerinden atomik olarak yazılır; ana indeks en son yazıldığından görüntüleyici henüz
+    yazılmamış bir dokümana işaret eden indeks görmez.
+    """
+    loop = asyncio.get_running_loop()
+    # Dışa aktarım sırasında yapılan yazımlar bir sonraki çalıştırmaya kalır
+    until = store.current_version()
+    since = 0 if full else store.get_meta("exported_version", 0)
+    roots = {"pages": Path(html_dir), "documents": Path(json_dir)}
+    result = {'pages': 0, 'documents': 0, 'removed': 0}
+
+    async with AsyncFileWriter(fsync_policy=fsync_policy) as writer:
+        for kind, root in roots.items():
+            rows, removed = await loop.run_in_executor(None, store.changed_since, kind, since, until)
+            futures = [await writer.submit(root / path, content) for path, content in rows]
+            await asyncio.gather(*futures)
+            result[kind] = len(rows)
+
+            for path in removed:
+                file_path = root / path
+                if file_path.exists():
+                    file_path.unlink()
+                    result['removed'] += 1
+
+        # Yol eşlemesi ve ana indeks sorgudan üretilir
+        url_mappings = await loop.run_in_executor(None, store.url_mappings)
+        await writer.write(Path(html_dir) / "file_index.json", json.dumps({
+            'created_at': datetime.now().isoformat(),
+            'file_count': len(url_mappings),
+            'path_mapping': url_mappings,
+            'file_counter': store.get_meta("file_counter", {})
+        }, ensure_ascii=False, indent=2))
+
+        entries = await loop.run_in_executor(None, store.index_rows)
+        await writer.write(Path(json_dir) / "master_index.json", json.dumps({
+            'created_at': datetime.now().isoformat(),
+            'total_files': len(entries),
+            'files': entries
+        }, ensure_ascii=False, indent=2))
+
+    store.set_meta("exported_version", until)
+    logger.info(f"Dosya düzeni dışa aktarıldı: {result['pages']} sayfa, {result['documents']} doküman, "
+                f"{result['removed']} silinen dosya")
+    return result
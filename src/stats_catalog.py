@@ -0,0 +1,309 @@
+"""
+İstatistik Kataloğu
+Bu modül scraper ve dönüştürücünün yazdığı dosyaların sayı, bayt ve dizin bazlı
+toplamlarını, ayrıca her çalıştırmanın süre ve hız geçmişini küçük bir JSON kataloğunda
+tutar. Katalog dosyalar yazıldıkça artımlı güncellenir; istatistikler dosya sistemi
+taranmadan okunur (yalnızca ilk oluşturmada dizin bir kez taranır).
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = "stats_catalog.json"
+SIZES_NAME = "stats_catalog.sizes"
+
+# Boyut günlüğünde silinen dosyayı gösteren değer
+REMOVED = "-"
+
+# Katalog türüne göre sayılan dosyalar ve hiçbir zaman sayılmayan indeks dosyaları
+KIND_PATTERNS = {"html": ["*.html"], "json": ["*.json"]}
+INDEX_FILES = ("master_index.json", "file_index.json", CATALOG_NAME)
+
+# Günlükteki satır sayısı dosya sayısının bu katını aşınca save() günlüğü sıkıştırır
+SIZES_COMPACT_RATIO = 2
+
+
+def _atomic_write(path: Path, content: str):
+    """Dosyayı geçici dosyaya yazıp atomik olarak yeniden adlandır"""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _parse_log(data: bytes) -> Iterator[Tuple[str, Optional[int]]]:
+    """Boyut günlüğü satırlarını (yol, bayt veya silme için None) olarak çöz"""
+    for line in data.decode('utf-8', errors='replace').splitlines():
+        parts = line.split('\t')
+        if len(parts) != 2:
+            continue
+        path, size = parts
+        if size == REMOVED:
+            yield path, None
+        elif size.isdigit():
+            yield path, int(size)
+
+
+def read_catalog(directory: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Kataloğun özetini oku (dosya başına boyut tablosu yüklenmez)"""
+    path = Path(directory) / CATALOG_NAME
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"İstatistik kataloğu okuma hatası ({path}): {str(e)}")
+        return None
+
+
+class StatsCatalog:
+    """Artımlı güncellenen dosya ve çalıştırma istatistikleri
+
+    Yazılan ve silinen dosyalar, yazıldıkları sırada küçük batch'ler halinde yalnızca sona
+    eklenen boyut günlüğüne (stats_catalog.sizes, "yol<TAB>bayt" veya silme için "yol<TAB>-")
+    yazılır; aynı yol için son satır geçerlidir. Katalog, günlüğün hangi bayta kadar
+    toplamlara işlendiğini (sizes_offset) tutar; save() yalnızca bu noktadan sonraki satırları
+    önceki boyutlarla karşılaştırarak uygular. Süreç çökse bile günlüğe düşen kayıtlar bir
+    sonraki save() ile işlenir. Günlüğün satır sayısı dosya sayısının SIZES_COMPACT_RATIO katını
+    aşınca save() onu güncel boyut tablosuyla yeniden yazar. Aynı dizine birden fazla süreç
+    (ör. shard işçileri) ekleme yapabilir; toplamları tek bir süreç işlemelidir.
+    """
+
+    def __init__(self, directory: Union[str, Path], kind: str, history_size: int = 50,
+                 flush_every: int = 256, flush_interval: float = 5.0):
+        self.directory = Path(directory)
+        self.kind = kind
+        self.history_size = history_size
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._run: Optional[Dict[str, Any]] = None
+        self._completed_run: Optional[Dict[str, Any]] = None
+
+        # Katalog yoksa (veya günlük ofseti olmayan eski biçimdeyse) mevcut dosyalar bir kez
+        # taranarak sayılır; aksi halde önceki çalıştırmalardan kalan dosyalar hiç görülmez
+        # Sıkıştırma sırasında çökme sonrası günlük, katalogdaki ofsetten kısa kalabilir
+        summary = read_catalog(self.directory)
+        sizes_path = self.directory / SIZES_NAME
+        log_size = sizes_path.stat().st_size if sizes_path.exists() else 0
+        if summary is None or 'sizes_offset' not in summary or log_size < summary['sizes_offset']:
+            self.rebuild()
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        """Yolu katalog dizinine göreli, '/' ayraçlı anahtara çevir"""
+        path = Path(path)
+        try:
+            path = path.relative_to(self.directory)
+        except ValueError:
+            pass
+        return path.as_posix()
+
+    def record_file(self, path: Union[str, Path], size: int):
+        """Yazılan (veya üzerine yazılan) dosyayı kaydet"""
+        self._append(f"{self._relative(path)}\t{size}\n")
+        if self._run is not None:
+            self._run['files'] += 1
+            self._run['bytes'] += size
+
+    def remove_file(self, path: Union[str, Path]):
+        """Silinen dosyayı kaydet"""
+        self._append(f"{self._relative(path)}\t{REMOVED}\n")
+
+    def count_written(self, files: int, size: int):
+        """Başka bir süreçte (ör. shard işçisi) yazılan dosyaları çalıştırma sayaçlarına ekle"""
+        if self._run is not None:
+            self._run['files'] += files
+            self._run['bytes'] += size
+
+    def _append(self, line: str):
+        """Kaydı tampona ekle, tampon dolduysa veya süre aşıldıysa günlüğe yaz"""
+        self._buffer.append(line)
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Tampondaki kayıtları boyut günlüğünün sonuna ekle"""
+        if not self._buffer:
+            return
+
+        data = ''.join(self._buffer).encode('utf-8')
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # O_APPEND ile tek write çağrısı: eşzamanlı ekleyen süreçlerin satırları birbirine karışmaz
+        fd = os.open(self.directory / SIZES_NAME, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = os.write(fd, data)
+            while written < len(data):
+                written += os.write(fd, data[written:])
+        finally:
+            os.close(fd)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def begin_run(self, operation: str):
+        """Çalıştırma süresi ve hız ölçümünü başlat"""
+        self._run = {
+            'operation': operation,
+            'started_at': datetime.now().isoformat(),
+            'files': 0,
+            'bytes': 0,
+            '_start': time.perf_counter()
+        }
+
+    def end_run(self, **counters: Any) -> Dict[str, Any]:
+        """Çalıştırmayı bitir ve geçmişe eklenecek kaydı döndür"""
+        if self._run is None:
+            raise RuntimeError("end_run, begin_run çağrılmadan kullanıldı")
+
+        run = self._run
+        duration = time.perf_counter() - run.pop('_start')
+        run.update(counters)
+        run['finished_at'] = datetime.now().isoformat()
+        run['duration'] = round(duration, 3)
+        run['files_per_sec'] = round(run['files'] / duration, 2) if duration > 0 else 0.0
+        run['bytes_per_sec'] = round(run['bytes'] / duration, 1) if duration > 0 else 0.0
+        self._completed_run = run
+        self._run = None
+        return run
+
+    def _read_log(self, applied: int) -> Tuple[Dict[str, int], List[Tuple[str, Optional[int]]], int, int]:
+        """Günlüğü oku: işlenmiş kısmın son boyutları, işlenmemiş kayıtlar, yeni ofset ve satır sayısı
+
+        Sondaki tamamlanmamış satır (yazım sürerken veya çökme sonrası) işlenmez; bozuk satırlar atlanır.
+        """
+        with open(self.directory / SIZES_NAME, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+
+        sizes: Dict[str, int] = {}
+        for path, size in _parse_log(data[:applied]):
+            if size is None:
+                sizes.pop(path, None)
+            else:
+                sizes[path] = size
+        return sizes, list(_parse_log(data[applied:end])), max(end, applied), data.count(b'\n', 0, end)
+
+    def _compact(self, sizes: Dict[str, int], end: int) -> int:
+        """Günlüğün işlenmiş kısmını güncel boyut tablosuyla değiştir, yeni ofseti döndür
+
+        İşlenmemiş kuyruk yeni günlüğün sonuna taşınır. Bu arada başka bir süreç günlüğe
+        ekleme yaptıysa sıkıştırma bir sonraki save()'e bırakılır.
+        """
+        sizes_path = self.directory / SIZES_NAME
+        content = ''.join(f"{path}\t{size}\n" for path, size in sizes.items()).encode('utf-8')
+        with open(sizes_path, 'rb') as f:
+            f.seek(end)
+            tail = f.read()
+
+        temp_path = sizes_path.with_name(f".{sizes_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(content + tail)
+        if sizes_path.stat().st_size != end + len(tail):
+            os.remove(temp_path)
+            return end
+        os.replace(temp_path, sizes_path)
+        return len(content)
+    @staticmethod
+    def _empty_summary(kind: str) -> Dict[str, Any]:
+        return {'kind': kind, 'updated_at': None, 'files': 0, 'bytes': 0, 'directories': {}, 'runs': [],
+                'sizes_offset': 0}
+
+    @staticmethod
+    def _apply(summary: Dict[str, Any], path: str, previous: Optional[int], size: Optional[int]):
+        """Bir dosyanın boyut değişimini toplamlara ve dizin özetine uygula"""
+        delta_files = (size is not None) - (previous is not None)
+        delta_bytes = (size or 0) - (previous or 0)
+        if not delta_files and not delta_bytes:
+            return
+
+        summary['files'] += delta_files
+        summary['bytes'] += delta_bytes
+        directory = Path(path).parent.as_posix()
+        rollup = summary['directories'].setdefault(directory, {'files': 0, 'bytes': 0})
+        rollup['files'] += delta_files
+        rollup['bytes'] += delta_bytes
+        if rollup['files'] <= 0:
+            del summary['directories'][directory]
+
+    def save(self) -> Dict[str, Any]:
+        """Günlüğün işlenmemiş kısmını ve son çalıştırmayı kataloğa işle, özeti döndür"""
+        self.flush()
+        summary = read_catalog(self.directory) or self._empty_summary(self.kind)
+        applied = summary.get('sizes_offset', 0)
+        sizes_path = self.directory / SIZES_NAME
+        log_size = sizes_path.stat().st_size if sizes_path.exists() else 0
+        completed_run = self._completed_run
+        if log_size <= applied and completed_run is None:
+            return summary
+
+        if log_size > applied:
+            sizes, records, summary['sizes_offset'], lines = self._read_log(applied)
+            for path, size in records:
+                self._apply(summary, path, sizes.get(path), size)
+                if size is None:
+                    sizes.pop(path, None)
+                else:
+                    sizes[path] = size
+            if lines > SIZES_COMPACT_RATIO * summary['files']:
+                summary['sizes_offset'] = self._compact(sizes, summary['sizes_offset'])
+
+        if completed_run is not None:
+            summary['runs'] = (summary['runs'] + [completed_run])[-self.history_size:]
+            self._completed_run = None
+
+        summary['kind'] = self.kind
+        summary['updated_at'] = datetime.now().isoformat()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.directory / CATALOG_NAME, json.dumps(summary, ensure_ascii=False, indent=2))
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Güncel özeti döndür (günlükte işlenmemiş kayıt yoksa dosya yazılmaz)"""
+        return self.save()
+
+    def rebuild(self, patterns: Optional[Iterable[str]] = None, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+        """Kataloğu dizini bir kez tarayarak baştan oluştur ve boyut günlüğünü sıkıştır
+
+        Desenler verilmezse katalog türüne göre seçilir (html: *.html, json: *.json).
+        """
+        patterns = list(patterns) if patterns is not None else KIND_PATTERNS.get(self.kind, ["*"])
+        exclude = set(exclude) | set(INDEX_FILES)
+        previous = read_catalog(self.directory)
+
+        sizes: Dict[str, int] = {}
+        for pattern in patterns:
+            for file_path in self.directory.rglob(pattern):
+                if file_path.is_file() and file_path.name not in exclude:
+                    sizes[self._relative(file_path)] = file_path.stat().st_size
+
+        # Toplamlar sıfırdan hesaplanır, çalıştırma geçmişi korunur
+        summary = self._empty_summary(self.kind)
+        if previous:
+            summary['runs'] = previous.get('runs', [])
+        for path, size in sizes.items():
+            self._apply(summary, path, None, size)
+
+        content = ''.join(f"{path}\t{size}\n" for path, size in sizes.items())
+        summary['sizes_offset'] = len(content.encode('utf-8'))
+        summary['updated_at'] = datetime.now().isoformat()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.directory / SIZES_NAME, content)
+        _atomic_write(self.directory / CATALOG_NAME, json.dumps(summary, ensure_ascii=False, indent=2))
+        self._buffer = []
+        if sizes:
+            logger.info(f"İstatistik kataloğu yeniden oluşturuldu: {self.directory} ({len(sizes)} dosya)")
+        return summary
+
+
+def top_directories(summary: Dict[str, Any], limit: int = 5) -> List[Dict[str, Any]]:
+    """En büyük dizinleri bayta göre döndür"""
+    items = [{'directory': name, **rollup} for name, rollup in summary.get('directories', {}).items()]
+    return sorted(items, key=lambda item: item['bytes'], reverse=True)[:limit]
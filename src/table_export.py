@@ -0,0 +1,509 @@
+"""
+Sütunlu Tablo Dışa Aktarımı
+Bu modül dokümanlardan çıkarılan tüm tabloları tek bir sütunlu depoda normalleştirir:
+başlıklar çıkarılır, sayı ve tarih hücreleri dönüştürülür ve her hücre doküman, tablo,
+satır ve başlık kimlikleriyle NumPy dizilerine yazılır. Toplama sorguları korpus
+yeniden okunmadan, bellek eşlemeli diziler üzerinde vektörize çalışır.
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from corpus import Corpus
+from legal_extractor import MONTHS, tr_lower
+
+logger = logging.getLogger(__name__)
+
+META_NAME = "tables.json"
+TEXTS_NAME = "texts.bin"
+
+# Sütun türleri (columns.type dizisindeki kodlar)
+COLUMN_TYPES = ("text", "number", "date")
+TEXT, NUMBER, DATE = range(len(COLUMN_TYPES))
+
+# Bir sütunun sayı/tarih sayılması için dolu hücrelerin bu oranı dönüştürülebilmeli
+TYPE_THRESHOLD = 0.8
+
+# 1.234,56 (Türkçe), 1234,56, 1234.5 ve 1.234 biçimleri; para birimi ve yüzde işaretleri atılır
+NUMBER_PATTERN = re.compile(
+    r'^(?P<sign>[-+]?)\s*(?:(?P<grouped>\d{1,3}(?:\.\d{3})+)|(?P<plain>\d+))'
+    r'(?:,(?P<comma_frac>\d+)|\.(?P<dot_frac>\d+))?$'
+)
+NUMBER_NOISE = re.compile(r'(?:\s*(?:TL|YTL|TRY|₺|%)\s*)', re.IGNORECASE)
+DATE_NUMERIC = re.compile(r'^(?P<day>\d{1,2})[./-](?P<month>\d{1,2})[./-](?P<year>\d{4})$')
+DATE_ISO = re.compile(r'^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})$')
+DATE_TEXT = re.compile(r'^(?P<day>\d{1,2})\s+(?P<month>\w+)\s+(?P<year>\d{4})$')
+WHITESPACE = re.compile(r'\s+')
+
+NAT = np.datetime64('NaT', 'D')
+
+
+def parse_number(text: str) -> Optional[float]:
+    """Türkçe veya noktalı biçimdeki sayıyı çöz, sayı değilse None döndür"""
+    cleaned = NUMBER_NOISE.sub('', text).replace(' ', '')
+    match = NUMBER_PATTERN.match(cleaned)
+    if not match:
+        return None
+
+    if match.group('grouped'):
+        integer = match.group('grouped').replace('.', '')
+    else:
+        integer = match.group('plain')
+    fraction = match.group('comma_frac') or match.group('dot_frac') or '0'
+    value = float(f"{integer}.{fraction}")
+    return -value if match.group('sign') == '-' else value
+
+
+def parse_date(text: str) -> Optional[np.datetime64]:
+    """gg.aa.yyyy, yyyy-aa-gg veya '12 Mart 2004' biçimindeki tarihi çöz"""
+    match = DATE_NUMERIC.match(text) or DATE_ISO.match(text)
+    if match:
+        day, month = int(match.group('day')), int(match.group('month'))
+    else:
+        match = DATE_TEXT.match(text)
+        if not match:
+            return None
+        month = MONTHS.get(tr_lower(match.group('month')))
+        if month is None:
+            return None
+        day = int(match.group('day'))
+
+    try:
+        return np.datetime64(f"{match.group('year')}-{month:02d}-{day:02d}", 'D')
+    except ValueError:
+        return None
+
+
+def normalize_header(text: str) -> str:
+    """Başlığı sorgularda eşleşecek biçime getir (küçük harf, tek boşluk, sondaki ':' yok)"""
+    return WHITESPACE.sub(' ', tr_lower(text)).strip().rstrip(':').strip()
+
+
+def infer_header(table: Dict[str, Any]) -> Tuple[List[str], List[List[str]]]:
+    """Tablonun başlık satırını ve veri satırlarını belirle
+
+    extract_tables <th> hücrelerini hem headers listesine hem de satırlara koyar; başlıklar
+    ilk satırla aynıysa o satır veriden çıkarılır. <th> yoksa ilk satır, tamamı sayı veya
+    tarih olmayan metinlerden oluşuyor ve altındaki satırlarda sayı/tarih varsa başlık sayılır.
+    """
+    rows = [row for row in table.get("rows", []) if any(cell.strip() for cell in row)]
+    headers = [h for h in table.get("headers", []) if h is not None]
+
+    if headers and rows and rows[0] == headers:
+        return headers, rows[1:]
+
+    if rows and len(rows) > 1:
+        first = rows[0]
+        first_is_text = all(cell.strip() and parse_number(cell) is None and parse_date(cell) is None
+                            for cell in first)
+        body_has_values = any(parse_number(cell) is not None or parse_date(cell) is not None
+                              for row in rows[1:] for cell in row)
+        if first_is_text and body_has_values:
+            return first, rows[1:]
+
+    return [], rows
+
+
+def _versioned(file_name: str, generation: Optional[int]) -> str:
+    """Dosya adına kuşak numarasını ekle (kuşaksız eski depolarda ad değişmez)"""
+    if not generation:
+        return file_name
+    base, ext = file_name.rsplit('.', 1)
+    return f"{base}.{generation}.{ext}"
+
+
+def _read_meta(table_dir: Path) -> Optional[Dict[str, Any]]:
+    """tables.json'ı oku, yoksa None"""
+    path = table_dir / META_NAME
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TableStoreBuilder:
+    """Tabloları hücre bazlı sütun dizilerinde biriktirir"""
+
+    def __init__(self):
+        self.docs: List[str] = []
+        self.headers: List[str] = []
+        self.header_ids: Dict[str, int] = {}
+        self.tables: List[Dict[str, Any]] = []
+        # Tablo sütunları
+        self.column_table: List[int] = []
+        self.column_index: List[int] = []
+        self.column_header: List[int] = []
+        self.column_type: List[int] = []
+        # Hücreler
+        self.cell_table: List[int] = []
+        self.cell_row: List[int] = []
+        self.cell_column: List[int] = []
+        self.cell_number: List[float] = []
+        self.cell_date: List[Any] = []
+        self.cell_text: List[int] = []
+        # Hücre metinleri tekilleştirilir; tekrar eden değerler (işlem adları, birimler) bir kez saklanır
+        self.texts: List[str] = []
+        self.text_ids: Dict[str, int] = {}
+
+    def header_id(self, name: str) -> int:
+        """Normalleştirilmiş başlığın kimliğini döndür, yoksa oluştur"""
+        header = self.header_ids.get(name)
+        if header is None:
+            header = self.header_ids[name] = len(self.headers)
+            self.headers.append(name)
+        return header
+
+    def add_document(self, doc_key: str, tables: Iterable[Dict[str, Any]]):
+        """Bir dokümanın tüm tablolarını ekle"""
+        doc_id = None
+        for table_index, table in enumerate(tables):
+            headers, rows = infer_header(table)
+            if not rows:
+                continue
+            if doc_id is None:
+                doc_id = len(self.docs)
+                self.docs.append(doc_key)
+            self.add_table(doc_id, table_index, table.get("caption", ""), headers, rows)
+
+    def add_table(self, doc_id: int, table_index: int, caption: str, headers: List[str], rows: List[List[str]]):
+        """Tek bir tabloyu hücrelerine ayırıp ekle"""
+        table_id = len(self.tables)
+        width = max(len(headers), max(len(row) for row in rows))
+        first_column = len(self.column_table)
+
+        parsed_numbers = [[0, 0] for _ in range(width)]  # [dolu hücre, dönüşen hücre]
+        parsed_dates = [0] * width
+
+        for row_index, row in enumerate(rows):
+            for column, text in enumerate(row):
+                text = text.strip()
+                if not text:
+                    continue
+                date = parse_date(text)
+                number = None if date is not None else parse_number(text)
+                parsed_numbers[column][0] += 1
+                parsed_numbers[column][1] += number is not None
+                parsed_dates[column] += date is not None
+
+                self.cell_table.append(table_id)
+                self.cell_row.append(row_index)
+                self.cell_column.append(first_column + column)
+                self.cell_number.append(np.nan if number is None else number)
+                self.cell_date.append(NAT if date is None else date)
+                text_id = self.text_ids.get(text)
+                if text_id is None:
+                    text_id = self.text_ids[text] = len(self.texts)
+                    self.texts.append(text)
+                self.cell_text.append(text_id)
+
+        for column in range(width):
+            name = headers[column] if column < len(headers) and headers[column].strip() else f"sütun {column + 1}"
+            filled, numbers = parsed_numbers[column]
+            if filled and numbers / filled >= TYPE_THRESHOLD:
+                column_type = NUMBER
+            elif filled and parsed_dates[column] / filled >= TYPE_THRESHOLD:
+                column_type = DATE
+            else:
+                column_type = TEXT
+            self.column_table.append(table_id)
+            self.column_index.append(column)
+            self.column_header.append(self.header_id(normalize_header(name)))
+            self.column_type.append(column_type)
+
+        self.tables.append({
+            "doc": doc_id,
+            "index": table_index,
+            "caption": caption,
+            "rows": len(rows),
+            "columns": width,
+            "first_column": first_column
+        })
+
+    def save(self, output_dir: Union[str, Path]) -> "TableStore":
+        """Dizileri .npy dosyalarına, sözlükleri tables.json'a yaz
+
+        Diziler yeni bir kuşak numarasıyla adlandırılır ve önceki kuşağın dosyalarına
+        dokunulmaz; tek işlem noktası tables.json'ın atomik olarak yeniden adlandırılmasıdır.
+        Öncesinde çökülürse veya depo okunurken yazılırsa önceki kuşak geçerli kalır.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        previous = _read_meta(output_dir)
+        previous_generation = previous.get("generation") if previous else None
+        generation = (previous_generation or 0) + 1
+
+        # Tekil metinler tek bir UTF-8 blobunda, ofset dizisiyle saklanır
+        encoded = [text.encode('utf-8') for text in self.texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        with open(output_dir / _versioned(TEXTS_NAME, generation), 'wb') as f:
+            f.write(b''.join(encoded))
+
+        column_header = np.asarray(self.column_header, dtype=np.int32)
+        cell_column = np.asarray(self.cell_column, dtype=np.int32)
+        arrays = {
+            "columns.table": np.asarray(self.column_table, dtype=np.int32),
+            "columns.index": np.asarray(self.column_index, dtype=np.int16),
+            "columns.header": column_header,
+            "columns.type": np.asarray(self.column_type, dtype=np.uint8),
+            "cells.table": np.asarray(self.cell_table, dtype=np.int32),
+            "cells.row": np.asarray(self.cell_row, dtype=np.int32),
+            "cells.column": cell_column,
+            # Başlık kimliği hücreye de yazılır; sorgular sütun tablosuyla birleştirme yapmaz
+            "cells.header": column_header[cell_column] if len(cell_column) else np.zeros(0, dtype=np.int32),
+            "cells.number": np.asarray(self.cell_number, dtype=np.float64),
+            "cells.date": np.asarray(self.cell_date, dtype='datetime64[D]'),
+            "cells.text": np.asarray(self.cell_text, dtype=np.int32),
+            "texts.offsets": offsets
+        }
+        for name, array in arrays.items():
+            np.save(output_dir / _versioned(f"{name}.npy", generation), array)
+
+        meta = {
+            "generation": generation,
+            "docs": self.docs,
+            "headers": self.headers,
+            "tables": self.tables,
+            "column_types": list(COLUMN_TYPES)
+        }
+        temp_meta = output_dir / f".{META_NAME}.{os.getpid()}.tmp"
+        with open(temp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temp_meta, output_dir / META_NAME)
+
+        # Önceki kuşak artık referanssız; açık mmap'ler silinen dosyayı okumaya devam edebilir
+        if previous is not None:
+            for file_name in [f"{name}.npy" for name in arrays] + [TEXTS_NAME]:
+                (output_dir / _versioned(file_name, previous_generation)).unlink(missing_ok=True)
+
+        return TableStore(output_dir)
+
+
+class TableStore:
+    """Sütunlu tablo deposu üzerinde sorgular"""
+
+    def __init__(self, table_dir: Union[str, Path]):
+        self.table_dir = Path(table_dir)
+        meta = _read_meta(self.table_dir)
+        if meta is None:
+            raise FileNotFoundError(f"Tablo deposu bulunamadı: {self.table_dir / META_NAME}")
+        self.generation: Optional[int] = meta.get("generation")
+        self.docs: List[str] = meta["docs"]
+        self.headers: List[str] = meta["headers"]
+        self.tables: List[Dict[str, Any]] = meta["tables"]
+        self.header_ids = {name: i for i, name in enumerate(self.headers)}
+
+        def load(name: str) -> np.ndarray:
+            return np.load(self.table_dir / _versioned(f"{name}.npy", self.generation), mmap_mode='r')
+
+        self.column_table = load("columns.table")
+        self.column_index = load("columns.index")
+        self.column_header = load("columns.header")
+        self.column_type = load("columns.type")
+        self.cell_table = load("cells.table")
+        self.cell_row = load("cells.row")
+        self.cell_column = load("cells.column")
+        self.cell_header = load("cells.header")
+        self.cell_number = load("cells.number")
+        self.cell_date = load("cells.date")
+        self.cell_text_id = load("cells.text")
+        self.text_offsets = load("texts.offsets")
+        self._texts: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.cell_table)
+
+    @property
+    def texts(self) -> List[str]:
+        """Tekil hücre metinleri (ilk erişimde çözülür)"""
+        if self._texts is None:
+            blob = (self.table_dir / _versioned(TEXTS_NAME, self.generation)).read_bytes()
+            offsets = self.text_offsets.tolist()
+            self._texts = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+        return self._texts
+
+    def cell_text(self, cell: int) -> str:
+        """Hücrenin ham metni"""
+        return self.texts[self.cell_text_id[cell]]
+
+    def find_headers(self, query: str) -> List[int]:
+        """Normalleştirilmiş adı sorguyu içeren başlık kimlikleri"""
+        query = normalize_header(query)
+        if query in self.header_ids:
+            return [self.header_ids[query]]
+        return [i for i, name in enumerate(self.headers) if query in name]
+
+    def _header_mask(self, header: Union[str, int, Iterable[int]]) -> np.ndarray:
+        """Başlığa ait hücreler için maske"""
+        if isinstance(header, str):
+            header_ids = self.find_headers(header)
+        elif isinstance(header, (int, np.integer)):
+            header_ids = [int(header)]
+        else:
+            header_ids = list(header)
+
+        if len(header_ids) == 1:
+            return self.cell_header == header_ids[0]
+        return np.isin(self.cell_header, header_ids)
+
+    def values(self, header: Union[str, int, Iterable[int]], kind: str = "number") -> Tuple[np.ndarray, np.ndarray]:
+        """Başlığa ait (hücre konumları, sayı veya tarih değerleri) çiftini döndür, boş değerler atılır"""
+        mask = self._header_mask(header)
+        source = self.cell_number if kind == "number" else self.cell_date
+        cells = np.flatnonzero(mask)
+        values = source[cells]
+        valid = ~np.isnan(values) if kind == "number" else ~np.isnat(values)
+        return cells[valid], values[valid]
+
+    def aggregate(self, header: Union[str, int, Iterable[int]], func: str = "sum",
+                  group_by: Optional[str] = None) -> Union[float, Dict[str, float]]:
+        """Başlığa ait sayısal hücreleri topla
+
+        func: sum, mean, min, max veya count.
+        group_by: None, "doc", "table" ya da aynı satırdaki başka bir başlık (ör. "işlem").
+        """
+        cells, values = self.values(header)
+
+        if func not in ("sum", "mean", "min", "max", "count"):
+            raise ValueError(f"Geçersiz toplama fonksiyonu: {func}")
+
+        if group_by is None:
+            if func == "count":
+                return float(len(values))
+            if not len(values):
+                return float('nan')
+            return float(getattr(np, func)(values))
+
+        if group_by == "table":
+            labels = np.asarray(self.cell_table[cells])
+            names = [str(i) for i in range(len(self.tables))]
+        elif group_by == "doc":
+            table_docs = np.asarray([table["doc"] for table in self.tables], dtype=np.int64)
+            labels = table_docs[self.cell_table[cells]]
+            names = self.docs
+        else:
+            labels, names = self._row_labels(cells, group_by)
+            keep = labels >= 0
+            labels, values = labels[keep], values[keep]
+
+        return self._grouped(labels, values, names, func)
+
+    def _row_labels(self, cells: np.ndarray, group_by: str) -> Tuple[np.ndarray, List[str]]:
+        """Aynı (tablo, satır) üzerindeki group_by başlıklı hücrenin metnini etiket olarak eşle"""
+        label_cells = np.flatnonzero(self._header_mask(group_by))
+        labels = np.full(len(cells), -1, dtype=np.int64)
+        if not len(label_cells) or not len(cells):
+            return labels, []
+
+        # (tablo, satır) anahtarları üzerinde sıralı arama ile satır birleştirme
+        row_span = np.int64(int(self.cell_row.max()) + 1)
+        label_keys = self.cell_table[label_cells].astype(np.int64) * row_span + self.cell_row[label_cells]
+        order = np.argsort(label_keys, kind='stable')
+        label_keys, label_cells = label_keys[order], label_cells[order]
+
+        keys = self.cell_table[cells].astype(np.int64) * row_span + self.cell_row[cells]
+        positions = np.minimum(np.searchsorted(label_keys, keys), len(label_keys) - 1)
+        found = label_keys[positions] == keys
+
+        text_ids, inverse = np.unique(self.cell_text_id[label_cells[positions[found]]], return_inverse=True)
+        labels[found] = inverse
+        return labels, [self.texts[i] for i in text_ids]
+
+    @staticmethod
+    def _grouped(labels: np.ndarray, values: np.ndarray, names: List[str], func: str) -> Dict[str, float]:
+        """Etiketlere göre vektörize toplama"""
+        if not len(labels):
+            return {}
+        size = len(names)
+        counts = np.bincount(labels, minlength=size)
+        if func == "count":
+            result = counts.astype(np.float64)
+        elif func in ("sum", "mean"):
+            result = np.bincount(labels, weights=values, minlength=size)
+            if func == "mean":
+                result = np.divide(result, counts, out=np.full(size, np.nan), where=counts > 0)
+        elif func in ("min", "max"):
+            fill = np.inf if func == "min" else -np.inf
+            result = np.full(size, fill)
+            (np.minimum if func == "min" else np.maximum).at(result, labels, values)
+        return {names[i]: float(result[i]) for i in np.flatnonzero(counts)}
+
+    def table(self, table_id: int) -> Dict[str, Any]:
+        """Tabloyu başlıklar ve satırlar halinde yeniden kur"""
+        info = self.tables[table_id]
+        first = info["first_column"]
+        headers = [self.headers[h] for h in self.column_header[first:first + info["columns"]]]
+        types = [COLUMN_TYPES[t] for t in self.column_type[first:first + info["columns"]]]
+        rows = [[""] * info["columns"] for _ in range(info["rows"])]
+
+        # Hücreler tablo sırasıyla yazıldığından tablonun hücreleri ardışıktır
+        start, end = np.searchsorted(self.cell_table, [table_id, table_id + 1])
+        for cell in range(start, end):
+            rows[self.cell_row[cell]][self.cell_column[cell] - first] = self.cell_text(cell)
+
+        return {
+            "doc": self.docs[info["doc"]],
+            "caption": info["caption"],
+            "headers": headers,
+            "types": types,
+            "rows": rows
+        }
+
+    def write_csv(self, path: Union[str, Path]):
+        """Tüm hücreleri uzun biçimde (doküman, tablo, satır, başlık, değerler) CSV'ye yaz"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["doc", "table", "row", "column", "header", "type", "text", "number", "date"])
+            for cell in range(self.cell_count):
+                table_id = int(self.cell_table[cell])
+                column = int(self.cell_column[cell])
+                number = self.cell_number[cell]
+                date = self.cell_date[cell]
+                writer.writerow([
+                    self.docs[self.tables[table_id]["doc"]],
+                    table_id,
+                    int(self.cell_row[cell]),
+                    int(self.column_index[column]),
+                    self.headers[self.cell_header[cell]],
+                    COLUMN_TYPES[self.column_type[column]],
+                    self.cell_text(cell),
+                    "" if np.isnan(number) else repr(float(number)),
+                    "" if np.isnat(date) else str(date)
+                ])
+
+
+def build_table_export(json_dir: str = "json_output", output_dir: str = "tables",
+                       html_dir: str = "db") -> Dict[str, Any]:
+    """Korpustaki tüm tabloları sütunlu depoya dönüştür"""
+    builder = TableStoreBuilder()
+    with Corpus(json_dir, html_dir) as corpus:
+        # Tablosu olmayan dokümanlar indeks üzerinden atlanır
+        keys = [key for key, entry in corpus.entries.items() if entry.get("table_count") != 0]
+        for doc_key, document in corpus.iter_documents(fields=["content.tables"], keys=keys):
+            builder.add_document(doc_key, (document.get("content") or {}).get("tables") or [])
+
+    store = builder.save(output_dir)
+    logger.info(f"{len(store)} tablo ve {store.cell_count} hücre dışa aktarıldı: {output_dir}")
+    return {"documents": len(store.docs), "tables": len(store), "cells": store.cell_count,
+            "headers": len(store.headers)}
+
+
+def main():
+    """Ana fonksiyon"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    build_table_export("json_output", "tables")
+
+
+if __name__ == "__main__":
+    main()
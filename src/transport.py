@@ -0,0 +1,253 @@
+"""
+HTTP Taşıma Katmanı
+Bu modül scraper'ın HTTP isteklerini değiştirilebilir bir taşıma katmanının arkasına alır.
+`AiohttpTransport` bağlantı havuzu boyutu, DNS önbellek süresi, keep-alive ve bağlantı
+ön ısıtması ayarlanabilir bir aiohttp oturumu kullanır; `FakeTransport` ağ kullanmadan,
+süreç içinde belirlenimci yanıtlar döndürür. `run()` uvloop kuruluysa onu, değilse
+standart asyncio döngüsünü kullanır.
+"""
+
+import abc
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple, TypedDict, Union
+
+import aiohttp
+from multidict import CIMultiDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Profil ayarları DEFAULT_OPTIONS'ın üzerine yazılır; None değerleri eşzamanlılıktan türetilir
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    'limit': 100,               # havuzdaki toplam bağlantı sayısı (0 = sınırsız)
+    'limit_per_host': 30,       # host başına bağlantı sayısı
+    'ttl_dns_cache': 10,        # DNS önbellek süresi (sn, None = süresiz)
+    'use_dns_cache': True,
+    'keepalive_timeout': 15.0,  # boştaki bağlantının açık tutulma süresi (sn)
+    'force_close': False,       # True: her istekten sonra bağlantıyı kapat (keep-alive yok)
+    'total_timeout': 30,
+    'connect_timeout': 10,
+    'user_agent': DEFAULT_USER_AGENT,
+    'prewarm': 0,               # taramadan önce açılacak bağlantı sayısı
+}
+
+TRANSPORT_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Önceki sabit ayarlar
+    'basic': {},
+    # Havuz eşzamanlılığa eşit, uzun DNS önbelleği ve keep-alive, ön ısıtılmış bağlantılar
+    'pooled': {'limit': None, 'limit_per_host': None, 'ttl_dns_cache': 300,
+               'keepalive_timeout': 60.0, 'prewarm': None},
+    # Karşılaştırma için: her istekte yeni bağlantı
+    'no_keepalive': {'force_close': True},
+}
+DEFAULT_PROFILE = 'pooled'
+
+
+class TransportResponse(TypedDict):
+    """Taşıma katmanından dönen yanıt"""
+    status: int
+    headers: Mapping[str, str]
+    text: str
+
+
+class HTTPTransport(abc.ABC):
+    """Taşıma katmanı arayüzü (alt sınıflar en az get() uygulamalıdır)"""
+
+    async def start(self):
+        """Oturumu aç"""
+
+    async def close(self):
+        """Oturumu kapat"""
+
+    async def prewarm(self, url: str, count: Optional[int] = None) -> int:
+        """Taramadan önce en fazla `count` bağlantı aç, açılan bağlantı sayısını döndür"""
+        return 0
+
+    @abc.abstractmethod
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """GET isteği gönder, yanıtı gövdesiyle birlikte döndür"""
+
+    async def __aenter__(self):
+        """Async context manager girişi"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager çıkışı"""
+        await self.close()
+
+
+def transport_options(profile: str = DEFAULT_PROFILE, max_concurrent: int = 50,
+                      **overrides) -> Dict[str, Any]:
+    """Profil ve eşzamanlılıktan bağlantı ayarlarını oluştur"""
+    if profile not in TRANSPORT_PROFILES:
+        raise ValueError(f"Bilinmeyen taşıma profili: {profile} ({', '.join(TRANSPORT_PROFILES)})")
+
+    options = {**DEFAULT_OPTIONS, **TRANSPORT_PROFILES[profile], **overrides}
+    for key in ('limit', 'limit_per_host', 'prewarm'):
+        if options[key] is None:
+            options[key] = max_concurrent
+    if options['limit_per_host'] and options['prewarm']:
+        options['prewarm'] = min(options['prewarm'], options['limit_per_host'])
+    return options
+
+
+class AiohttpTransport(HTTPTransport):
+    """Ayarlanabilir bağlantı havuzlu aiohttp taşıma katmanı"""
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Bağlayıcıyı ve oturumu oluştur"""
+        if self.session is not None:
+            return
+
+        options = self.options
+        connector_args = {
+            'limit': options['limit'],
+            'limit_per_host': options['limit_per_host'],
+            'ttl_dns_cache': options['ttl_dns_cache'],
+            'use_dns_cache': options['use_dns_cache'],
+        }
+        # aiohttp force_close ile keepalive_timeout'un birlikte verilmesine izin vermez
+        if options['force_close']:
+            connector_args['force_close'] = True
+        else:
+            connector_args['keepalive_timeout'] = options['keepalive_timeout']
+
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=options['total_timeout'], connect=options['connect_timeout']),
+            connector=aiohttp.TCPConnector(**connector_args),
+            headers={'User-Agent': options['user_agent']}
+        )
+
+    async def close(self):
+        """Oturumu ve havuzdaki bağlantıları kapat"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def prewarm(self, url: str, count: Optional[int] = None) -> int:
+        """DNS önbelleğini doldur ve havuza `prewarm` (en fazla `count`) kadar keep-alive bağlantı aç"""
+        count = self.options['prewarm'] if count is None else min(count, self.options['prewarm'])
+        if not count or self.options['force_close']:
+            return 0
+        await self.start()
+
+        async def head():
+            async with self.session.head(url, allow_redirects=False) as response:
+                await response.read()
+
+        results = await asyncio.gather(*[head() for _ in range(count)], return_exceptions=True)
+        opened = sum(1 for result in results if not isinstance(result, Exception))
+        if opened < count:
+            logger.warning(f"Bağlantı ön ısıtması kısmen başarısız ({opened}/{count}): {url}")
+        return opened
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """GET isteği gönder; bağlantının havuza dönebilmesi için gövde her zaman okunur"""
+        await self.start()
+        async with self.session.get(url, headers=headers) as response:
+            text = await response.text()
+            return {'status': response.status, 'headers': response.headers, 'text': text}
+
+
+FakeRoute = Union[str, Dict[str, Any]]
+FakeHandler = Callable[[str, Dict[str, str]], Union[Optional[FakeRoute], Awaitable[Optional[FakeRoute]]]]
+
+
+class FakeTransport(HTTPTransport):
+    """Ağ kullanmayan, süreç içi belirlenimci taşıma katmanı
+
+    `routes` URL'den yanıta eşlemedir: düz metin 200 yanıtıdır, sözlük ise `status`, `text`
+    ve `headers` anahtarlarını içerebilir. `handler` verilmişse eşlemede olmayan URL'ler için
+    çağrılır (coroutine de olabilir). Bulunamayan URL'ler 404 döner. Yanıt başlıklarındaki
+    `ETag` / `Last-Modified` koşullu istekle eşleşirse 304 döner. Gönderilen istekler
+    `requests` listesinde tutulur.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, FakeRoute]] = None,
+                 handler: Optional[FakeHandler] = None, latency: float = 0.0):
+        self.routes: Dict[str, FakeRoute] = dict(routes or {})
+        self.handler = handler
+        self.latency = latency
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """Eşlemeden veya işleyiciden yanıt üret"""
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        route = self.routes.get(url)
+        if route is None and self.handler is not None:
+            route = self.handler(url, headers)
+            if inspect.isawaitable(route):
+                route = await route
+        if route is None:
+            return {'status': 404, 'headers': CIMultiDict(), 'text': ''}
+        if isinstance(route, str):
+            route = {'text': route}
+
+        response_headers = CIMultiDict(route.get('headers', {}))
+        status = route.get('status', 200)
+        if status == 200 and self.not_modified(headers, response_headers):
+            return {'status': 304, 'headers': response_headers, 'text': ''}
+        return {'status': status, 'headers': response_headers, 'text': route.get('text', '')}
+
+    @staticmethod
+    def not_modified(request_headers: Dict[str, str], response_headers: Mapping[str, str]) -> bool:
+        """Koşullu istek başlıkları yanıtın doğrulayıcılarıyla eşleşiyor mu"""
+        etag = response_headers.get('ETag')
+        if etag and request_headers.get('If-None-Match') == etag:
+            return True
+        last_modified = response_headers.get('Last-Modified')
+        return bool(last_modified) and request_headers.get('If-Modified-Since') == last_modified
+
+
+def create_transport(transport: Union[str, HTTPTransport, None] = None, max_concurrent: int = 50,
+                     **overrides) -> HTTPTransport:
+    """Profil adından (veya hazır nesneden) taşıma katmanı oluştur"""
+    if isinstance(transport, HTTPTransport):
+        return transport
+    return AiohttpTransport(transport_options(transport or DEFAULT_PROFILE, max_concurrent, **overrides))
+
+
+def uvloop_available() -> bool:
+    """uvloop kurulu mu"""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run(coroutine, use_uvloop: Optional[bool] = None):
+    """Coroutine'i çalıştır; uvloop kuruluysa (veya istenmişse) onun döngüsünü kullan
+
+    use_uvloop=None: kuruluysa kullan, True: kurulu değilse uyarıp asyncio'ya dön, False: asyncio.
+    """
+    if use_uvloop is not False:
+        try:
+            import uvloop
+        except ImportError:
+            if use_uvloop:
+                logger.warning("uvloop kurulu değil, standart asyncio döngüsü kullanılıyor (pip install uvloop)")
+        else:
+            if hasattr(asyncio, 'Runner'):
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    return runner.run(coroutine)
+            # Python < 3.11: asyncio.Runner yok, döngü politikası geçici olarak uvloop'a alınır
+            previous = asyncio.get_event_loop_policy()
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            try:
+                return asyncio.run(coroutine)
+            finally:
+                asyncio.set_event_loop_policy(previous)
+    return asyncio.run(coroutine)
@@ -3,12 +3,40 @@
  * Basit ve işlevsel veri görüntüleme arayüzü
  */
 
+const SEARCH_DEBOUNCE_MS = 150;
+const RENDER_OVERSCAN = 6;
+const LATENCY_SAMPLES = 100;
+
 class NoterlikViewer {
     constructor() {
         this.data = [];
         this.filteredData = [];
+        this.filteredIndices = new Int32Array(0);
         this.currentCategory = 'all';
         this.searchTerm = '';
+
+        // Arama durumu: en son gönderilen sorgu dışındaki yanıtlar atılır
+        this.worker = null;
+        this.searchIndex = null;
+        this.queryId = 0;
+        this.pendingQuery = null;
+        this.debounceTimer = null;
+        this.workerReady = null;
+        this.inputStart = null;
+
+        // Sanal liste durumu
+        this.rowHeight = 0;
+        this.rowPool = [];
+        this.firstVisible = -1;
+        this.scrollFrame = null;
+
+        // Gecikme ölçümleri (ms)
+        this.metrics = {
+            startup: {},
+            queries: [],
+            inputToRender: []
+        };
+        this.startTime = performance.now();
         
         this.initializeElements();
         this.bindEvents();
@@ -21,17 +49,39 @@ class NoterlikViewer {
         this.resultsList = document.getElementById('resultsList');
         this.loadingIndicator = document.getElementById('loadingIndicator');
         this.noResults = document.getElementById('noResults');
+        this.errorMessage = document.getElementById('errorMessage');
         this.categoryBtns = document.querySelectorAll('.category-btn');
+        this.searchStats = document.getElementById('searchStats');
+        this.scrollContainer = this.resultsList.parentElement;
+
+        // Sanal liste: toplam yüksekliği taşıyan boşluk ve görünen satırların penceresi
+        this.resultsList.classList.add('virtual-list');
+        this.resultsSpacer = document.createElement('div');
+        this.resultsWindow = document.createElement('div');
+        this.resultsWindow.className = 'virtual-window';
+        this.resultsSpacer.appendChild(this.resultsWindow);
+        this.resultsList.appendChild(this.resultsSpacer);
     }
 
     bindEvents() {
-        // Arama
-        this.searchInput.addEventListener('input', () => this.handleSearch());
+        // Arama: yazarken gecikmeli, Enter ve butonla hemen
+        this.searchInput.addEventListener('input', () => this.scheduleSearch());
         this.searchBtn.addEventListener('click', () => this.handleSearch());
         this.searchInput.addEventListener('keypress', (e) => {
             if (e.key === 'Enter') this.handleSearch();
         });
 
+        // Kaydırmada yalnızca görünen satırlar, kare başına en fazla bir kez çizilir
+        this.scrollContainer.addEventListener('scroll', () => {
+            if (this.scrollFrame === null) {
+                this.scrollFrame = requestAnimationFrame(() => {
+                    this.scrollFrame = null;
+                    this.renderVisibleRows();
+                });
+            }
+        }, { passive: true });
+        window.addEventListener('resize', () => this.renderVisibleRows(true));
+
         // Kategori filtreleri
         this.categoryBtns.forEach(btn => {
             btn.addEventListener('click', () => this.handleCategoryFilter(btn));
@@ -45,9 +95,14 @@ class NoterlikViewer {
             
             // Gerçek implementasyonda JSON dosyalarını yükleyecek
             await this.loadMockData();
+            this.metrics.startup.dataLoaded = performance.now() - this.startTime;
+            
+            await this.initializeSearch();
             
             this.hideLoading();
             this.displayResults();
+            this.metrics.startup.firstRender = performance.now() - this.startTime;
+            console.log('Başlangıç süreleri (ms):', this.metrics.startup);
             
         } catch (error) {
             console.error('Veri yükleme hatası:', error);
@@ -73,8 +128,11 @@ class NoterlikViewer {
 
             // Master index'ten verileri yükle
             this.data = masterIndex.files.map(file => {
-                const category = this.categorizeFile(file.file_path);
-                const year = this.extractYear(file.file_path);
+                // Dönüştürücünün çıkardığı hukuki şema varsa dosya adından tahmin etme
+                const category = (file.doc_type && file.doc_type !== 'diger')
+                    ? file.doc_type
+                    : this.categorizeFile(file.file_path);
+                const year = file.doc_year ? String(file.doc_year) : this.extractYear(file.file_path);
                 
                 return {
                     title: file.title || this.extractTitleFromPath(file.file_path),
@@ -85,7 +143,10 @@ class NoterlikViewer {
                     keywords: file.keywords || [],
                     wordCount: file.word_count || 0,
                     linkCount: file.link_count || 0,
-                    imageCount: file.image_count || 0
+                    imageCount: file.image_count || 0,
+                    docNumber: file.doc_number || '',
+                    articleCount: file.article_count || 0,
+                    rank: file.pagerank || 0
                 };
             });
 
@@ -205,8 +266,58 @@ class NoterlikViewer {
         return fileName.replace(/-/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
     }
 
+    async initializeSearch() {
+        const start = performance.now();
+        const items = this.data.map(item => ({
+            title: item.title,
+            description: item.description,
+            keywords: item.keywords,
+            year: item.year,
+            category: item.category,
+            rank: item.rank || 0
+        }));
+
+        try {
+            this.worker = new Worker('src/search_worker.js');
+            this.worker.addEventListener('message', (event) => this.handleWorkerMessage(event.data));
+            await new Promise((resolve, reject) => {
+                this.workerReady = resolve;
+                this.worker.addEventListener('error', reject, { once: true });
+                this.worker.postMessage({ type: 'index', items });
+            });
+        } catch (error) {
+            // file:// veya Worker desteği olmayan ortamlarda aynı indeks ana thread'de çalışır
+            console.warn('Arama worker\'ı başlatılamadı, ana thread kullanılıyor:', error);
+            if (this.worker) this.worker.terminate();
+            this.worker = null;
+            this.searchIndex = typeof SearchIndex !== 'undefined' ? new SearchIndex(items) : null;
+            if (!this.searchIndex) console.warn('SearchIndex yüklenemedi, doğrusal filtre kullanılıyor');
+        }
+
+        this.filteredIndices = Int32Array.from(this.data.keys());
+        this.metrics.startup.searchIndex = performance.now() - start;
+    }
+
+    handleWorkerMessage(message) {
+        if (message.type === 'ready') {
+            this.metrics.startup.workerIndex = message.elapsed;
+            if (this.workerReady) this.workerReady();
+        } else if (message.type === 'results') {
+            // Daha yeni bir sorgu gönderildiyse eski sonucu çizme
+            if (!this.pendingQuery || message.id !== this.pendingQuery.id) return;
+            this.finishQuery(message.indices, message.elapsed);
+        }
+    }
+
+    scheduleSearch() {
+        if (this.inputStart === null) this.inputStart = performance.now();
+        clearTimeout(this.debounceTimer);
+        this.debounceTimer = setTimeout(() => this.handleSearch(), SEARCH_DEBOUNCE_MS);
+    }
+
     handleSearch() {
-        this.searchTerm = this.searchInput.value.toLowerCase().trim();
+        clearTimeout(this.debounceTimer);
+        this.searchTerm = this.searchInput.value.trim();
         this.applyFilters();
     }
 
@@ -220,21 +331,77 @@ class NoterlikViewer {
     }
 
     applyFilters() {
-        this.filteredData = this.data.filter(item => {
-            // Kategori filtresi
-            const categoryMatch = this.currentCategory === 'all' || item.category === this.currentCategory;
-            
-            // Arama filtresi
-            const searchMatch = !this.searchTerm || 
-                item.title.toLowerCase().includes(this.searchTerm) ||
-                item.description.toLowerCase().includes(this.searchTerm) ||
-                item.keywords.some(keyword => keyword.toLowerCase().includes(this.searchTerm)) ||
-                item.year.includes(this.searchTerm);
-            
-            return categoryMatch && searchMatch;
+        const query = {
+            id: ++this.queryId,
+            term: this.searchTerm,
+            category: this.currentCategory,
+            start: performance.now()
+        };
+        this.pendingQuery = query;
+
+        if (this.worker) {
+            this.worker.postMessage({ type: 'search', id: query.id, term: query.term, category: query.category });
+        } else {
+            const indices = this.searchIndex
+                ? this.searchIndex.search(query.term, query.category)
+                : this.linearSearch(query.term, query.category);
+            this.finishQuery(indices, performance.now() - query.start);
+        }
+    }
+
+    linearSearch(term, category) {
+        // İndeks yoksa eski doğrusal filtre: her sorguda tüm kayıtlar taranır
+        term = term.toLowerCase();
+        const indices = [];
+        this.data.forEach((item, i) => {
+            const categoryMatch = category === 'all' || item.category === category;
+            const searchMatch = !term ||
+                item.title.toLowerCase().includes(term) ||
+                item.description.toLowerCase().includes(term) ||
+                item.keywords.some(keyword => keyword.toLowerCase().includes(term)) ||
+                item.year.includes(term);
+            if (categoryMatch && searchMatch) indices.push(i);
         });
+        return Int32Array.from(indices);
+    }
 
+    finishQuery(indices, searchElapsed) {
+        const query = this.pendingQuery;
+        this.pendingQuery = null;
+        this.filteredIndices = indices;
+        this.filteredData = Array.from(indices, i => this.data[i]);
         this.displayResults();
+
+        // Ölçümler: sorgu gönderiminden ve ilk tuş vuruşundan çizime kadar geçen süre
+        const rendered = performance.now();
+        this.recordLatency(this.metrics.queries, rendered - query.start);
+        if (this.inputStart !== null) {
+            this.recordLatency(this.metrics.inputToRender, rendered - this.inputStart);
+            this.inputStart = null;
+        }
+        if (this.searchStats) {
+            this.searchStats.textContent = `${indices.length.toLocaleString('tr-TR')} sonuç · ` +
+                `arama ${searchElapsed.toFixed(1)} ms · toplam ${(rendered - query.start).toFixed(1)} ms`;
+        }
+    }
+
+    recordLatency(samples, value) {
+        samples.push(value);
+        if (samples.length > LATENCY_SAMPLES) samples.shift();
+    }
+
+    latencySummary() {
+        const summarize = (samples) => {
+            if (samples.length === 0) return null;
+            const sorted = [...samples].sort((a, b) => a - b);
+            const pick = (q) => sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))];
+            return { count: sorted.length, p50: pick(0.5), p95: pick(0.95), max: sorted[sorted.length - 1] };
+        };
+        return {
+            startup: this.metrics.startup,
+            query: summarize(this.metrics.queries),
+            inputToRender: summarize(this.metrics.inputToRender)
+        };
     }
 
     displayResults() {
@@ -243,19 +410,90 @@ class NoterlikViewer {
             return;
         }
 
-        this.resultsList.innerHTML = '';
-        
-        this.filteredData.slice(0, 50).forEach(item => {
-            const resultElement = this.createResultElement(item);
-            this.resultsList.appendChild(resultElement);
-        });
-
         this.showResults();
+        if (!this.rowHeight) this.measureRowHeight();
+
+        this.resultsSpacer.style.height = `${this.filteredData.length * this.rowHeight}px`;
+        this.scrollContainer.scrollTop = 0;
+        this.renderVisibleRows(true);
+    }
+
+    measureRowHeight() {
+        // Satırlar sabit yükseklikte çizilir; ilk satırı ölçüp tüm liste için kullan
+        const probe = this.createResultElement();
+        this.fillResultElement(probe, this.filteredData[0]);
+        this.resultsWindow.appendChild(probe);
+        const style = getComputedStyle(probe);
+        this.rowHeight = probe.offsetHeight + parseFloat(style.marginTop) + parseFloat(style.marginBottom);
+        this.resultsWindow.removeChild(probe);
+    }
+
+    renderVisibleRows(force = false) {
+        if (!this.rowHeight || this.filteredData.length === 0) return;
+
+        const listTop = this.resultsList.offsetTop;
+        const scrollTop = Math.max(0, this.scrollContainer.scrollTop - listTop);
+        const viewportRows = Math.ceil(this.scrollContainer.clientHeight / this.rowHeight);
+        const first = Math.max(0, Math.floor(scrollTop / this.rowHeight) - RENDER_OVERSCAN);
+        if (!force && first === this.firstVisible) return;
+        this.firstVisible = first;
+
+        const last = Math.min(this.filteredData.length, first + viewportRows + 2 * RENDER_OVERSCAN);
+        const needed = last - first;
+
+        // Satır elemanları yeniden kullanılır; yalnızca içerikleri güncellenir
+        while (this.rowPool.length < needed) {
+            const element = this.createResultElement();
+            this.rowPool.push(element);
+            this.resultsWindow.appendChild(element);
+        }
+        for (let i = 0; i < this.rowPool.length; i++) {
+            const element = this.rowPool[i];
+            if (i < needed) {
+                element.style.display = '';
+                this.fillResultElement(element, this.filteredData[first + i]);
+            } else {
+                element.style.display = 'none';
+            }
+        }
+        this.resultsWindow.style.transform = `translateY(${first * this.rowHeight}px)`;
     }
 
-    createResultElement(item) {
+    createResultElement() {
         const div = document.createElement('div');
         div.className = 'result-item';
+        div.innerHTML = `
+            <div class="result-title"></div>
+            <div class="result-meta">
+                <span class="category-badge"></span>
+                <span><i class="fas fa-calendar me-1"></i><span class="result-year"></span></span>
+                <span class="ms-3 result-number"><i class="fas fa-hashtag me-1"></i><span></span></span>
+                <span class="ms-3 result-articles"><i class="fas fa-list-ol me-1"></i><span></span></span>
+                <span class="ms-3"><i class="fas fa-file me-1"></i><span class="result-file"></span></span>
+            </div>
+            <div class="result-description"></div>
+        `;
+        div.refs = {
+            title: div.querySelector('.result-title'),
+            badge: div.querySelector('.category-badge'),
+            year: div.querySelector('.result-year'),
+            number: div.querySelector('.result-number'),
+            articles: div.querySelector('.result-articles'),
+            file: div.querySelector('.result-file'),
+            description: div.querySelector('.result-description')
+        };
+
+        // Tıklama, satıra o anda bağlı kayda göre çözülür
+        div.addEventListener('click', () => {
+            if (div.item) this.openDocument(div.item);
+        });
+        
+        return div;
+    }
+
+    fillResultElement(div, item) {
+        if (div.item === item) return;
+        div.item = item;
         
         const categoryBadges = {
             'genelge': 'Genelge',
@@ -263,22 +501,24 @@ class NoterlikViewer {
             'mahkeme': 'Mahkeme Kararı',
             'sozlesme': 'Sözleşme',
             'vekalet': 'Vekaletname',
-            'noterlik': 'Noterlik'
+            'noterlik': 'Noterlik',
+            'yonetmelik': 'Yönetmelik',
+            'teblig': 'Tebliğ',
+            'tuzuk': 'Tüzük',
+            'diger': 'Diğer'
         };
 
-        div.innerHTML = `
-            <div class="result-title">${item.title}</div>
-            <div class="result-meta">
-                <span class="category-badge">${categoryBadges[item.category]}</span>
-                <span><i class="fas fa-calendar me-1"></i>${item.year}</span>
-                <span class="ms-3"><i class="fas fa-file me-1"></i>${item.file}</span>
-            </div>
-            <div class="result-description">${item.description}</div>
-        `;
-
-        div.addEventListener('click', () => this.openDocument(item));
-        
-        return div;
+        // innerHTML yerine textContent: kaydırma sırasında ayrıştırma yapılmaz
+        const refs = div.refs;
+        refs.title.textContent = item.title;
+        refs.badge.textContent = categoryBadges[item.category] || categoryBadges.diger;
+        refs.year.textContent = item.year;
+        refs.number.style.display = item.docNumber ? '' : 'none';
+        refs.number.lastElementChild.textContent = item.docNumber || '';
+        refs.articles.style.display = item.articleCount ? '' : 'none';
+        refs.articles.lastElementChild.textContent = item.articleCount ? `${item.articleCount} madde` : '';
+        refs.file.textContent = item.file;
+        refs.description.textContent = item.description;
     }
 
     openDocument(item) {
@@ -293,6 +533,7 @@ class NoterlikViewer {
         this.loadingIndicator.style.display = 'block';
         this.resultsList.style.display = 'none';
         this.noResults.style.display = 'none';
+        this.errorMessage.style.display = 'none';
     }
 
     hideLoading() {
@@ -302,22 +543,23 @@ class NoterlikViewer {
     showResults() {
         this.resultsList.style.display = 'block';
         this.noResults.style.display = 'none';
+        this.errorMessage.style.display = 'none';
     }
 
     showNoResults() {
         this.resultsList.style.display = 'none';
         this.noResults.style.display = 'block';
+        this.errorMessage.style.display = 'none';
     }
 
     showError(message) {
+        // Hata ayrı bir öğede gösterilir; sanal listenin boşluk ve pencere öğeleri korunur,
+        // böylece sonraki arama sonuçları aynı satır havuzuyla çizilebilir
         this.hideLoading();
-        this.resultsList.innerHTML = `
-            <div class="alert alert-danger" role="alert">
-                <i class="fas fa-exclamation-triangle me-2"></i>
-                ${message}
-            </div>
-        `;
-        this.showResults();
+        this.resultsList.style.display = 'none';
+        this.noResults.style.display = 'none';
+        this.errorMessage.querySelector('.error-text').textContent = message;
+        this.errorMessage.style.display = 'block';
     }
 
     // Utility methods
@@ -343,6 +585,6 @@ document.addEventListener('DOMContentLoaded', () => {
 // Sayfa kapatılırken temizlik
 window.addEventListener('beforeunload', () => {
     if (window.noterlikViewer) {
-        // Gerekli temizlik işlemleri
+        if (window.noterlikViewer.worker) window.noterlikViewer.worker.terminate();
     }
 });
@@ -0,0 +1,261 @@
+"""
+Dizin İzleyici
+Bu modül bir dizin ağacındaki dosya değişikliklerini (oluşturma, üzerine yazma, silme)
+toplu olarak bildirir. Linux'ta inotify (ctypes ile, ek bağımlılık olmadan) kullanılır;
+dizin değişmediği sürece süreç olay beklerken CPU harcamaz. inotify olmayan sistemlerde
+dosya boyutu ve değişiklik zamanını karşılaştıran yoklama (polling) yöntemine geçilir.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# inotify olay maskeleri (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def _load_inotify():
+    """libc'deki inotify fonksiyonlarını yükle, desteklenmiyorsa None döndür"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """Dizin ağacındaki dosya değişikliklerini toplu olarak bildiren izleyici
+
+    Değişiklikler `debounce` saniyelik sessizlik oluşana kadar (en fazla `max_delay` saniye)
+    biriktirilir; böylece bir tarama onlarca dosya yazarken dönüştürücü her dosya için ayrı
+    ayrı tetiklenmez, uzun taramalarda da dönüştürme taramanın bitmesini beklemez.
+    Geçici dosyalar (AsyncFileWriter'ın `.ad.tmp` dosyaları) desenlere uymadığı için
+    görülmez, yalnızca atomik yeniden adlandırmanın sonucu bildirilir.
+    """
+
+    def __init__(self, directory: Union[str, Path], patterns: Iterable[str] = ("*.html",),
+                 debounce: float = 1.0, max_delay: float = 30.0, poll_interval: float = 5.0,
+                 use_inotify: Optional[bool] = None):
+        self.directory = Path(directory)
+        self.patterns = tuple(patterns)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        self.stats = {'events': 0, 'batches': 0, 'polls': 0, 'overflows': 0}
+
+        self._dirty: Set[str] = set()
+        self._changed: Optional[asyncio.Event] = None
+        self._fd: Optional[int] = None
+        self._libc = None
+        self._watches: Dict[int, str] = {}
+        self._snapshot: Snapshot = {}
+
+    def matches(self, name: str) -> bool:
+        """Dosya adı izlenen desenlerden birine uyuyor mu"""
+        return not name.startswith('.') and any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def start(self):
+        """İzlemeyi başlat (inotify mümkünse inotify, değilse yoklama)"""
+        if self.backend is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._changed = asyncio.Event()
+
+        libc = _load_inotify() if self.use_inotify in (None, True) else None
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._libc = libc
+                self._fd = fd
+                self._add_tree(self.directory)
+                asyncio.get_running_loop().add_reader(fd, self._read_events)
+                self.backend = "inotify"
+                logger.info(f"Dizin izleniyor (inotify): {self.directory} ({len(self._watches)} dizin)")
+                return
+            logger.warning(f"inotify başlatılamadı (errno {ctypes.get_errno()}), yoklamaya geçiliyor")
+        elif self.use_inotify:
+            logger.warning("inotify bu sistemde desteklenmiyor, yoklamaya geçiliyor")
+
+        self._snapshot = self.scan()
+        self.backend = "poll"
+        logger.info(f"Dizin izleniyor (yoklama, {self.poll_interval} sn): {self.directory}")
+
+    def close(self):
+        """İzlemeyi durdur"""
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._watches = {}
+        self.backend = None
+
+    async def __aenter__(self):
+        """Async context manager girişi"""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager çıkışı"""
+        self.close()
+
+    def scan(self) -> Snapshot:
+        """Desenlere uyan dosyaların (değişiklik zamanı, boyut) anlık görüntüsünü al"""
+        snapshot: Snapshot = {}
+        stack = [str(self.directory)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif self.matches(entry.name):
+                            stat = entry.stat(follow_symlinks=False)
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return snapshot
+
+    def _add_tree(self, root: Path):
+        """Dizini ve tüm alt dizinlerini izlemeye ekle"""
+        for directory, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+            if wd < 0:
+                logger.warning(f"Dizin izlemeye eklenemedi ({directory}): errno {ctypes.get_errno()}")
+                continue
+            self._watches[wd] = directory
+
+    def _read_events(self):
+        """inotify tamponundaki olayları oku ve kirli yollar kümesine ekle"""
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        before = len(self._dirty)
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Olaylar kaçırıldı: ağaçtaki tüm dosyalar değişmiş sayılır
+                self.stats['overflows'] += 1
+                logger.warning(f"inotify kuyruğu taştı, dizin yeniden taranıyor: {self.directory}")
+                self._dirty.update(self.scan())
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Yeni dizin: izlemeye ekle ve izleme başlamadan yazılmış dosyaları da al
+                    self._add_tree(Path(path))
+                    self._dirty.update(self._scan_paths(path))
+                continue
+
+            if self.matches(name) and mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM):
+                self._dirty.add(path)
+                self.stats['events'] += 1
+
+        # Geçici dosya olayları gibi ilgisiz olaylar bekleme süresini uzatmaz
+        if len(self._dirty) != before:
+            self._changed.set()
+
+    def _scan_paths(self, root: str) -> Set[str]:
+        """Alt ağaçtaki desenlere uyan dosya yolları"""
+        return {
+            os.path.join(directory, name)
+            for directory, _, names in os.walk(root)
+            for name in names if self.matches(name)
+        }
+
+    def _poll(self) -> bool:
+        """Anlık görüntüyü yenile, farkları kirli yollara ekle; fark varsa True döndür"""
+        self.stats['polls'] += 1
+        snapshot = self.scan()
+        previous = self._snapshot
+        before = len(self._dirty)
+        for path, signature in snapshot.items():
+            if previous.get(path) != signature:
+                self._dirty.add(path)
+        self._dirty.update(path for path in previous if path not in snapshot)
+        self._snapshot = snapshot
+        return len(self._dirty) != before
+
+    async def _wait_for_event(self, timeout: Optional[float]) -> bool:
+        """Yeni değişiklik gelene kadar (veya zaman aşımına kadar) bekle"""
+        if self.backend == "poll":
+            await asyncio.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+            return self._poll()
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def wait_for_changes(self) -> Tuple[Set[Path], Set[Path]]:
+        """Bir değişiklik grubu oluşana kadar bekle, (değişen, silinen) dosyaları döndür"""
+        self.start()
+
+        while not self._dirty:
+            self._changed.clear()
+            await self._wait_for_event(None)
+
+        # Yazımlar sürerken beklemeye devam et; debounce süresince sessizlik olunca teslim et
+        deadline = time.monotonic() + self.max_delay
+        while time.monotonic() < deadline:
+            self._changed.clear()
+            if not await self._wait_for_event(min(self.debounce, max(deadline - time.monotonic(), 0.0))):
+                break
+
+        dirty, self._dirty = self._dirty, set()
+        self._changed.clear()
+        changed = {Path(path) for path in dirty if os.path.isfile(path)}
+        removed = {Path(path) for path in dirty} - changed
+        self.stats['batches'] += 1
+        return changed, removed
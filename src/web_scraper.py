@@ -4,20 +4,28 @@ Bu modül localhost'taki HTML dosyalarını recursive olarak indirir ve hiyerar
 """
 
 import asyncio
-import aiohttp
-import aiofiles
 import os
 import json
 import time
 from urllib.parse import urljoin, urlparse, unquote
 from bs4 import BeautifulSoup
-from typing import Set, Dict, List, Optional
+from typing import Callable, Set, Dict, List, Optional, Union
 from pathlib import Path
 from tqdm.asyncio import tqdm
 import logging
 from datetime import datetime
 import hashlib
 
+from file_writer import AsyncFileWriter
+from frontier import PriorityFrontier, ScoreFunction
+from link_graph import LinkGraph, LinkGraphBuilder, GRAPH_NAME
+from stats_catalog import StatsCatalog
+from sqlite_store import SQLiteStore
+from transport import HTTPTransport, create_transport, run
+
+# Artımlı taramada koşullu istekler için ETag / Last-Modified değerleri
+VALIDATORS_NAME = "http_validators.json"
+
 # Logging konfigürasyonu
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +48,10 @@ class HierarchicalIndexer:
         
     def generate_unique_filename(self, original_path: str, content: str = None) -> str:
         """Benzersiz dosya adı oluştur"""
+        # Daha önce indirilmiş URL aynı dosya yolunu korur (yeniden taramada dosyalar yer değiştirmez)
+        if original_path in self.path_mapping:
+            return self.path_mapping[original_path]
+        
         # URL'den dosya adını çıkar
         parsed = urlparse(original_path)
         path_parts = parsed.path.strip('/').split('/')
@@ -73,6 +85,21 @@ class HierarchicalIndexer:
         
         return final_path
     
+    def load_index(self, filepath: str) -> bool:
+        """Önceki taramanın indeksini yükle"""
+        if not os.path.exists(filepath):
+            return False
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            index_data = json.load(f)
+        self.path_mapping.update(index_data.get('path_mapping', {}))
+        self.file_counter.update(index_data.get('file_counter', {}))
+        return True
+    
+    def remove(self, original_path: str) -> Optional[str]:
+        """URL'yi indeksten çıkar, dosya yolunu döndür"""
+        return self.path_mapping.pop(original_path, None)
+    
     def save_index(self, filepath: str):
         """İndeksi JSON dosyasına kaydet"""
         index_data = {
@@ -82,25 +109,58 @@ class HierarchicalIndexer:
             'file_counter': self.file_counter
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
+        # Geçici dosya + yeniden adlandırma: dönüştürücü yarım yazılmış indeksi okumaz
+        temp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
             json.dump(index_data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, filepath)
 
 
 class AsyncWebScraper:
     """Asenkron web scraper - recursive HTML indirici"""
     
-    def __init__(self, base_url: str, output_dir: str = "db", max_concurrent: int = 50):
+    def __init__(self, base_url: str, output_dir: str = "db", max_concurrent: int = 50,
+                 fsync_policy: str = "none", incremental: bool = False,
+                 store: Optional[SQLiteStore] = None, score: Optional[ScoreFunction] = None,
+                 transport: Union[str, HTTPTransport, None] = None,
+                 owns: Optional[Callable[[str], bool]] = None, prewarm: Optional[int] = None):
         self.base_url = base_url.rstrip('/')
         self.output_dir = Path(output_dir)
         self.max_concurrent = max_concurrent
         self.visited_urls: Set[str] = set()
-        self.pending_urls: Set[str] = set()
+        # Kuyruk puana göre sıralıdır: dokümanlar listeleme sayfalarından önce indirilir
+        self.pending_urls = PriorityFrontier(score)
+        # Dağıtık taramada bu taramacıya ait olmayan linkler kuyruğa girmez, iletilmek üzere toplanır
+        self.owns = owns
+        self.foreign_urls: Set[str] = set()
+        self.outgoing_urls: List[str] = []
         self.failed_urls: Set[str] = set()
         self.indexer = HierarchicalIndexer()
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.link_graph = LinkGraphBuilder()
+        # Taşıma katmanı: profil adı ("pooled", "basic", ...) veya hazır nesne (örn. FakeTransport)
+        self.transport = create_transport(transport, max_concurrent)
+        # Ön ısıtılacak en fazla bağlantı (None: eşzamanlılık kadar, 0: ısıtma yok). Paylaşımlı
+        # havuzu olmayan shard'lar ve daemon'un sonraki taramaları bunu düşürür
+        self.prewarm = max_concurrent if prewarm is None else min(prewarm, max_concurrent)
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.catalog = StatsCatalog(self.output_dir, kind="html")
+        # SQLite deposu verilmişse sayfalar dosyalar yerine veritabanına yazılır
+        self.store = store
+        if store is not None:
+            self.writer = store.writer("pages", self.output_dir, on_written=self.catalog.record_file)
+        else:
+            self.writer = AsyncFileWriter(fsync_policy=fsync_policy, on_written=self.catalog.record_file)
+        # Artımlı mod: önceki taramanın dosya yolları, link grafiği ve HTTP doğrulayıcıları
+        # kullanılır; değişmeyen sayfalar yeniden yazılmaz
+        self.incremental = incremental
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.previous_graph: Optional[LinkGraph] = None
+        self.not_modified: Set[str] = set()
+        self.gone_urls: Set[str] = set()
         self.stats = {
             'downloaded': 0,
+            'unchanged': 0,
+            'removed': 0,
             'failed': 0,
             'skipped': 0,
             'start_time': None,
@@ -112,45 +172,94 @@ class AsyncWebScraper:
         
     async def __aenter__(self):
         """Async context manager girişi"""
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
-        self.session = aiohttp.ClientSession(
-            timeout=timeout,
-            connector=connector,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-        )
+        await self.transport.start()
+        opened = await self.transport.prewarm(self.base_url, self.prewarm) if self.prewarm else 0
+        if opened:
+            logger.info(f"Bağlantı havuzu ısıtıldı: {opened} bağlantı")
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager çıkışı"""
-        if self.session:
-            await self.session.close()
+        await self.writer.close()
+        await self.transport.close()
     
     async def fetch_html(self, url: str) -> Optional[str]:
         """Tek bir HTML sayfasını indir"""
         async with self.semaphore:
             try:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        logger.info(f"İndirildi: {url}")
-                        return content
-                    else:
-                        logger.warning(f"HTTP {response.status}: {url}")
-                        self.failed_urls.add(url)
-                        return None
+                response = await self.transport.get(url, headers=self.conditional_headers(url))
+                if response['status'] == 200:
+                    self.remember_validators(url, response['headers'])
+                    logger.info(f"İndirildi: {url}")
+                    return response['text']
+                elif response['status'] == 304:
+                    self.not_modified.add(url)
+                    return None
+                else:
+                    if response['status'] in (404, 410):
+                        self.gone_urls.add(url)
+                    logger.warning(f"HTTP {response['status']}: {url}")
+                    self.failed_urls.add(url)
+                    return None
             except Exception as e:
                 logger.error(f"Hata ({url}): {str(e)}")
                 self.failed_urls.add(url)
                 return None
     
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Önceki yanıtın doğrulayıcılarından koşullu istek başlıkları oluştur"""
+        validators = self.validators.get(url)
+        if not self.incremental or not validators:
+            return {}
+        
+        headers = {}
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def remember_validators(self, url: str, headers):
+        """Yanıttaki ETag / Last-Modified değerlerini sakla"""
+        validators = {}
+        if headers.get('ETag'):
+            validators['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['last_modified'] = headers['Last-Modified']
+        if validators:
+            self.validators[url] = validators
+        else:
+            self.validators.pop(url, None)
+    
+    def load_previous_crawl(self):
+        """Artımlı tarama için önceki indeksi, link grafiğini ve doğrulayıcıları yükle"""
+        self.indexer.load_index(str(self.output_dir / "file_index.json"))
+        
+        validators_path = self.output_dir / VALIDATORS_NAME
+        if validators_path.exists():
+            with open(validators_path, 'r', encoding='utf-8') as f:
+                self.validators = json.load(f)
+        
+        graph_path = self.output_dir / GRAPH_NAME
+        if graph_path.exists():
+            try:
+                self.previous_graph = LinkGraph.load(graph_path)
+            except Exception as e:
+                logger.error(f"Önceki link grafiği yüklenemedi ({graph_path}): {str(e)}")
+        
+        # Grafik olmadan 304 yanıtlarının linkleri bilinemez, doğrulayıcılar kullanılmaz
+        if self.previous_graph is None:
+            self.validators = {}
+    
     def extract_links(self, html_content: str, current_url: str) -> List[str]:
         """HTML içeriğinden linkleri çıkar"""
+        return list(self.extract_link_texts(html_content, current_url))
+    
+    def extract_link_texts(self, html_content: str, current_url: str) -> Dict[str, str]:
+        """HTML içeriğinden linkleri ve link metinlerini çıkar"""
         try:
             soup = BeautifulSoup(html_content, 'html.parser')
-            links = []
+            links: Dict[str, str] = {}
             
             # Tüm href linklerini bul
             for link in soup.find_all('a', href=True):
@@ -163,13 +272,15 @@ class AsyncWebScraper:
                     if urlparse(absolute_url).netloc == urlparse(self.base_url).netloc:
                         # Fragment'ları kaldır
                         absolute_url = absolute_url.split('#')[0]
-                        links.append(absolute_url)
+                        # Aynı hedefe birden çok link varsa ilk boş olmayan metin tutulur
+                        if not links.get(absolute_url):
+                            links[absolute_url] = link.get_text(" ", strip=True)
             
-            return list(set(links))  # Duplikatları kaldır
+            return links
             
         except Exception as e:
             logger.error(f"Link çıkarma hatası ({current_url}): {str(e)}")
-            return []
+            return {}
     
     async def save_html_file(self, url: str, content: str) -> str:
         """HTML içeriğini dosyaya kaydet"""
@@ -178,12 +289,15 @@ class AsyncWebScraper:
             relative_path = self.indexer.generate_unique_filename(url, content)
             file_path = self.output_dir / relative_path
             
-            # Dizin yapısını oluştur
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Artımlı modda içeriği aynı olan dosya yeniden yazılmaz (izleyici değişiklik görmez)
+            if self.incremental:
+                loop = asyncio.get_running_loop()
+                if await loop.run_in_executor(None, self.is_unchanged, relative_path, content):
+                    self.stats['unchanged'] += 1
+                    return str(file_path)
             
-            # Dosyayı kaydet
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+            # Dosyayı yazma kuyruğu üzerinden kaydet (dizinler önbellekli oluşturulur)
+            await self.writer.write(file_path, content)
             
             self.stats['downloaded'] += 1
             logger.info(f"Kaydedildi: {file_path}")
@@ -195,6 +309,47 @@ class AsyncWebScraper:
             self.stats['failed'] += 1
             return ""
     
+    def is_unchanged(self, relative_path: str, content: str) -> bool:
+        """Kayıtlı sayfanın içeriği aynı mı (boyut farklıysa dosya okunmaz)"""
+        encoded = content.encode('utf-8')
+        if self.store is not None:
+            return self.store.page_sha256(relative_path) == hashlib.sha256(encoded).hexdigest()
+        
+        file_path = self.output_dir / relative_path
+        try:
+            if file_path.stat().st_size != len(encoded):
+                return False
+            with open(file_path, 'rb') as f:
+                return f.read() == encoded
+        except OSError:
+            return False
+    
+    def has_local_copy(self, relative_path: str) -> bool:
+        """Sayfanın kayıtlı bir kopyası var mı"""
+        if self.store is not None:
+            return self.store.page_sha256(relative_path) is not None
+        return (self.output_dir / relative_path).exists()
+    
+    def remove_gone_pages(self) -> int:
+        """Sunucuda artık bulunmayan (404/410) sayfaların yerel dosyalarını sil"""
+        removed = 0
+        for url in self.gone_urls:
+            relative_path = self.indexer.remove(url)
+            self.validators.pop(url, None)
+            if relative_path is None:
+                continue
+            file_path = self.output_dir / relative_path
+            if self.store is not None:
+                if self.store.delete("pages", [relative_path]):
+                    self.catalog.remove_file(file_path)
+                    removed += 1
+            elif file_path.exists():
+                file_path.unlink()
+                self.catalog.remove_file(file_path)
+                removed += 1
+                logger.info(f"Silindi (sunucuda yok): {file_path}")
+        return removed
+    
     async def process_url(self, url: str) -> List[str]:
         """Tek bir URL'yi işle ve yeni linkleri döndür"""
         if url in self.visited_urls:
@@ -205,31 +360,115 @@ class AsyncWebScraper:
         
         # HTML içeriğini indir
         content = await self.fetch_html(url)
-        if not content:
+        if content:
+            # Dosyayı kaydet
+            await self.save_html_file(url, content)
+            
+            # Linkleri metinleriyle birlikte çıkar
+            anchors = self.extract_link_texts(content, url)
+            new_links = list(anchors)
+        elif url in self.not_modified:
+            # Sayfa değişmemiş (304): linkler ayrıştırma yapılmadan önceki grafikten alınır
+            new_links = self.previous_graph.links_of(url) if self.previous_graph else None
+            relative_path = self.indexer.path_mapping.get(url)
+            if new_links is None or relative_path is None or not self.has_local_copy(relative_path):
+                # Grafikte kaydı veya yerel kopyası yok: doğrulayıcı bırakılıp sayfa koşulsuz
+                # indirilmek üzere kuyruğa döner
+                self.validators.pop(url, None)
+                self.visited_urls.discard(url)
+                self.not_modified.discard(url)
+                return [url]
+            anchors = {}
+            self.stats['unchanged'] += 1
+        else:
             return []
         
-        # Dosyayı kaydet
-        await self.save_html_file(url, content)
-        
-        # Linkleri çıkar
-        new_links = self.extract_links(content, url)
+        self.link_graph.add_page(url, new_links)
         
-        # Yeni linkleri filtrele
+        # Yeni linkleri filtrele; kuyrukta bekleyen linklerin giriş derecesi artar
+        depth = self.pending_urls.depth(url) + 1
         filtered_links = []
         for link in new_links:
             if (link not in self.visited_urls and 
-                link not in self.pending_urls and 
-                link not in self.failed_urls):
+                link not in self.failed_urls and
+                not self.forward_foreign(link) and
+                self.pending_urls.add(link, depth=depth, anchor=anchors.get(link, ""))):
                 filtered_links.append(link)
-                self.pending_urls.add(link)
         
         return filtered_links
     
+    def forward_foreign(self, url: str, owns: Optional[Callable[[str], bool]] = None) -> bool:
+        """URL başka bir taramacıya aitse iletilmek üzere kaydet ve True döndür"""
+        owns = owns or self.owns
+        if owns is None or owns(url):
+            return False
+        if url not in self.foreign_urls:
+            self.foreign_urls.add(url)
+            self.outgoing_urls.append(url)
+        return True
+    
+    def take_foreign_urls(self) -> List[str]:
+        """Henüz iletilmemiş yabancı URL'leri döndür ve listeyi boşalt"""
+        urls, self.outgoing_urls = self.outgoing_urls, []
+        return urls
+    
+    def enqueue(self, urls: List[str], owns: Optional[Callable[[str], bool]] = None) -> int:
+        """Dışarıdan gelen URL'leri kuyruğa ekle, eklenen sayısını döndür
+
+        owns verilirse (varsayılan: taramacının kendi yüklemi) ait olmayan URL'ler kuyruğa
+        girmez, take_foreign_urls() ile alınmak üzere toplanır.
+        """
+        added = 0
+        for url in urls:
+            if (url not in self.visited_urls and
+                url not in self.pending_urls and
+                url not in self.failed_urls and
+                not self.forward_foreign(url, owns)):
+                self.pending_urls.add(url)
+                added += 1
+        return added
+    
+    async def process_batch(self) -> int:
+        """Kuyruktan bir batch URL işle, işlenen URL sayısını döndür"""
+        # Batch işleme için URL'leri al
+        current_batch = self.pending_urls.pop_batch(self.max_concurrent * 2)
+        
+        if not current_batch:
+            return 0
+        
+        # Paralel işleme
+        tasks = []
+        for url in current_batch:
+            task = self.process_url(url)
+            tasks.append(task)
+        
+        # Tüm görevleri çalıştır
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Sonuçları işle
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Görev hatası: {str(result)}")
+            elif isinstance(result, list):
+                # Yeni linkler bulundu, onları da ekle
+                for new_url in result:
+                    if new_url not in self.visited_urls and new_url not in self.pending_urls:
+                        self.pending_urls.add(new_url)
+        
+        # Kuyruğa geri dönen URL'ler derinliklerini koruduktan sonra kayıtlar bırakılır
+        self.pending_urls.release(current_batch)
+        return len(current_batch)
+    
     async def scrape_recursive(self, start_url: str, max_depth: int = None):
         """Recursive olarak tüm HTML dosyalarını indir"""
         self.stats['start_time'] = datetime.now()
+        self.catalog.begin_run("scrape")
         logger.info(f"Scraping başlatılıyor: {start_url}")
         
+        if self.incremental:
+            self.load_previous_crawl()
+            previous_validators = dict(self.validators)
+        
         # Başlangıç URL'ini kuyruğa ekle
         self.pending_urls.add(start_url)
         
@@ -237,34 +476,13 @@ class AsyncWebScraper:
         pbar = tqdm(desc="İndiriliyor", unit="dosya")
         
         while self.pending_urls:
-            # Batch işleme için URL'leri al
-            current_batch = list(self.pending_urls)[:self.max_concurrent * 2]
-            self.pending_urls -= set(current_batch)
+            batch_size = await self.process_batch()
             
-            if not current_batch:
+            if not batch_size:
                 break
             
-            # Paralel işleme
-            tasks = []
-            for url in current_batch:
-                task = self.process_url(url)
-                tasks.append(task)
-            
-            # Tüm görevleri çalıştır
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Sonuçları işle
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Görev hatası: {str(result)}")
-                elif isinstance(result, list):
-                    # Yeni linkler bulundu, onları da ekle
-                    for new_url in result:
-                        if new_url not in self.visited_urls and new_url not in self.pending_urls:
-                            self.pending_urls.add(new_url)
-            
             # Progress bar güncelle
-            pbar.update(len(current_batch))
+            pbar.update(batch_size)
             pbar.set_postfix({
                 'İndirilen': self.stats['downloaded'],
                 'Başarısız': self.stats['failed'],
@@ -272,6 +490,9 @@ class AsyncWebScraper:
             })
         
         pbar.close()
+        
+        if self.incremental:
+            self.stats['removed'] = self.remove_gone_pages()
         self.stats['end_time'] = datetime.now()
         
         # İstatistikleri yazdır
@@ -279,14 +500,52 @@ class AsyncWebScraper:
         logger.info(f"Scraping tamamlandı!")
         logger.info(f"Toplam süre: {duration:.2f} saniye")
         logger.info(f"İndirilen dosya: {self.stats['downloaded']}")
+        if self.incremental:
+            logger.info(f"Değişmeyen: {self.stats['unchanged']}")
+            logger.info(f"Silinen: {self.stats['removed']}")
         logger.info(f"Başarısız: {self.stats['failed']}")
         logger.info(f"Atlandı: {self.stats['skipped']}")
         logger.info(f"Toplam ziyaret edilen URL: {len(self.visited_urls)}")
         
-        # İndeksi kaydet
-        index_path = self.output_dir / "file_index.json"
-        self.indexer.save_index(str(index_path))
-        logger.info(f"İndeks kaydedildi: {index_path}")
+        # Artımlı taramada hiçbir dosya değişmediyse indeks ve grafik yeniden yazılmaz
+        changed = (not self.incremental or self.stats['downloaded'] or self.stats['removed']
+                   or not (self.output_dir / GRAPH_NAME).exists())
+        if changed:
+            # İndeksi kaydet
+            index_path = self.output_dir / "file_index.json"
+            self.indexer.save_index(str(index_path))
+            logger.info(f"İndeks kaydedildi: {index_path}")
+            if self.store is not None:
+                self.store.put_url_mappings(self.indexer.path_mapping, self.indexer.file_counter)
+            
+            self.save_link_graph()
+        
+        if self.incremental and self.validators != previous_validators:
+            with open(self.output_dir / VALIDATORS_NAME, 'w', encoding='utf-8') as f:
+                json.dump(self.validators, f, ensure_ascii=False)
+        
+        # İstatistik kataloğunu güncelle
+        counters = {
+            'downloaded': self.stats['downloaded'],
+            'failed': self.stats['failed'],
+            'visited': len(self.visited_urls)
+        }
+        if self.incremental:
+            counters.update(unchanged=self.stats['unchanged'], removed=self.stats['removed'])
+        self.catalog.end_run(**counters)
+        self.catalog.save()
+        return bool(changed)
+    
+    def save_link_graph(self) -> str:
+        """Link grafiğini file_index.json'ın yanına kaydet"""
+        for url in self.failed_urls:
+            self.link_graph.mark_failed(url)
+        
+        graph = self.link_graph.build()
+        graph_path = self.output_dir / GRAPH_NAME
+        graph.save(graph_path)
+        logger.info(f"Link grafiği kaydedildi: {graph_path} ({graph.node_count} düğüm, {graph.edge_count} kenar)")
+        return str(graph_path)
 
 
 async def main():
@@ -299,4 +558,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,26 @@
+"""
+Test ortamı
+src/ modüllerini import yoluna ekler ve ilerleme çubuklarını kapatır.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# İlerleme çubuklarını kapat (tqdm ortam değişkenini import sırasında okur)
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+# web_scraper import edilirken çalışma dizininde scraper.log açılır; testler depo kökünü kirletmesin
+_log_dir = tempfile.mkdtemp(prefix="noterlik-tests-")
+_cwd = os.getcwd()
+os.chdir(_log_dir)
+try:
+    import web_scraper  # noqa: F401
+finally:
+    os.chdir(_cwd)
+    shutil.rmtree(_log_dir, ignore_errors=True)
@@ -0,0 +1,94 @@
+"""Korpus erişimi, filtreleme ve doküman önbelleği"""
+
+import json
+
+import pytest
+
+from corpus import Corpus, DocumentCache, project
+
+BASE = "http://site.test"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    json_dir, html_dir = tmp_path / "json_output", tmp_path / "db"
+    (json_dir / "genelgeler").mkdir(parents=True)
+    html_dir.mkdir()
+    documents = {
+        "genelgeler/2019-45.json": {"metadata": {"title": "Genelge 45", "keywords": ["noter"]},
+                                    "legal": {"doc_type": "genelge", "year": 2019}, "raw_html": "<p>45</p>"},
+        "kanun.json": {"metadata": {"title": "Noterlik Kanunu", "keywords": []},
+                       "legal": {"doc_type": "kanun", "year": 1972}, "raw_html": "<p>kanun</p>"},
+    }
+    for key, document in documents.items():
+        (json_dir / key).write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+    index = {"files": [{"file_path": key, "title": document["metadata"]["title"],
+                        "doc_type": document["legal"]["doc_type"], "doc_year": document["legal"]["year"]}
+                       for key, document in documents.items()]}
+    (json_dir / "master_index.json").write_text(json.dumps(index), encoding="utf-8")
+    (html_dir / "file_index.json").write_text(json.dumps({"path_mapping": {
+        f"{BASE}/genelgeler/2019-45.html": "genelgeler/2019-45.html"}}), encoding="utf-8")
+
+    with Corpus(str(json_dir), str(html_dir)) as corpus:
+        yield corpus
+
+
+def test_resolve_by_path_and_url(corpus):
+    assert len(corpus) == 2
+    assert corpus.resolve("kanun.html") == "kanun.json"
+    assert corpus.resolve(f"{BASE}/genelgeler/2019-45.html#madde-1") == "genelgeler/2019-45.json"
+    assert corpus.resolve(f"{BASE}/yok.html") is None
+    assert corpus.url_of("genelgeler/2019-45.json") == f"{BASE}/genelgeler/2019-45.html"
+    assert "kanun.json" in corpus
+
+
+def test_filter_and_projection(corpus):
+    assert [e["file_path"] for e in corpus.filter(doc_type="kanun")] == ["kanun.json"]
+    assert [e["file_path"] for e in corpus.filter(doc_year=lambda y: y > 2000)] == ["genelgeler/2019-45.json"]
+    assert corpus.get("kanun.json", fields=["metadata.title", "legal.sayi"]) == {
+        "metadata": {"title": "Noterlik Kanunu"}, "legal": {"sayi": None}}
+    assert corpus.get("yok.json", default="-") == "-"
+    assert project({"a": {"b": 1}}, ["a.b.c"]) == {"a": {"b": {"c": None}}}
+
+
+def test_caller_mutations_do_not_leak_into_cache(corpus):
+    document = corpus.load("genelgeler/2019-45.json")
+    document["metadata"]["keywords"].append("değişti")
+    document["legal"] = None
+    assert corpus.load("genelgeler/2019-45.json")["metadata"]["keywords"] == ["noter"]
+
+    keywords = corpus.get("genelgeler/2019-45.json", fields=["metadata.keywords"])
+    keywords["metadata"]["keywords"].clear()
+    cached = dict(corpus.iter_documents(keys=["genelgeler/2019-45.json"]))
+    assert cached["genelgeler/2019-45.json"]["metadata"]["keywords"] == ["noter"]
+    assert corpus.cache_info()["hits"] >= 2
+
+
+def test_iter_documents_does_not_fill_cache_by_default(corpus):
+    assert [key for key, _ in corpus.iter_documents(doc_type="genelge")] == ["genelgeler/2019-45.json"]
+    assert len(corpus.cache) == 0
+    list(corpus.iter_documents(cache=True))
+    assert len(corpus.cache) == 2
+
+
+def test_prefetch_and_raw_html(corpus):
+    assert corpus.prefetch(["kanun.json", f"{BASE}/genelgeler/2019-45.html", "yok.json"]) == 2
+    assert corpus.prefetch(["kanun.json"]) == 0
+    assert corpus.raw_html("kanun.json") == "<p>kanun</p>"
+
+
+def test_cache_evicts_by_count_and_bytes():
+    cache = DocumentCache(max_documents=2, max_bytes=100)
+    cache.put("a", {"n": 1}, 10)
+    cache.put("b", {"n": 2}, 10)
+    cache.get("a")
+    cache.put("c", {"n": 3}, 10)
+    assert "b" not in cache and "a" in cache
+    cache.put("d", {"n": 4}, 95)
+    assert len(cache) == 1 and cache.total_bytes == 95
+    assert cache.stats["evictions"] == 3
+
+    returned = cache.get("d")
+    returned["n"] = 0
+    assert cache.get("d") == {"n": 4}
+    assert cache.get("d", copy=False) is cache.get("d", copy=False)
@@ -0,0 +1,129 @@
+"""Shard anahtarı, tutarlı hash halkası ve shard sonuçlarının birleştirilmesi"""
+
+import json
+import logging
+import queue
+from datetime import datetime
+
+import pytest
+
+import distributed_scraper
+from distributed_scraper import ConsistentHashRing, ShardedCrawlCoordinator, shard_key
+from link_graph import GRAPH_NAME, LinkGraph, LinkGraphBuilder
+from stats_catalog import StatsCatalog, read_catalog
+
+BASE = "http://site.test"
+
+
+def test_shard_key_uses_base_filename():
+    assert shard_key(f"{BASE}/a/b/genelge.html") == "genelge"
+    assert shard_key(f"{BASE}/c/genelge.html") == "genelge"
+    assert shard_key(f"{BASE}/c/genelge") == "genelge"
+    assert shard_key(f"{BASE}/") == "index"
+    assert shard_key(BASE) == "index"
+
+
+def test_same_filename_maps_to_same_shard():
+    ring = ConsistentHashRing(list(range(4)))
+    owners = {ring.owner_of(f"{BASE}/d{i}/karar.html") for i in range(50)}
+    assert len(owners) == 1
+
+
+def test_ring_distribution_is_balanced():
+    ring = ConsistentHashRing(list(range(4)), vnodes=64)
+    counts = [0] * 4
+    for i in range(20000):
+        counts[ring.get_node(f"sayfa{i}")] += 1
+    for count in counts:
+        assert 0.15 < count / 20000 < 0.35
+
+
+def test_adding_node_moves_keys_only_to_new_node():
+    keys = [f"sayfa{i}" for i in range(10000)]
+    ring = ConsistentHashRing(list(range(4)))
+    before = {key: ring.get_node(key) for key in keys}
+
+    ring.add_node(4)
+    moved = [key for key in keys if ring.get_node(key) != before[key]]
+    assert all(ring.get_node(key) == 4 for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.3
+
+    ring.remove_node(4)
+    assert all(ring.get_node(key) == before[key] for key in keys)
+
+
+def test_empty_ring_raises():
+    with pytest.raises(ValueError):
+        ConsistentHashRing([]).get_node("index")
+
+
+def shard_result(path_mapping, file_counter, pages, failed=(), downloaded=0, written=(0, 0)):
+    builder = LinkGraphBuilder()
+    for url, links in pages.items():
+        builder.add_page(url, links)
+    for url in failed:
+        builder.mark_failed(url)
+    return {
+        'stats': {'downloaded': downloaded, 'failed': len(failed), 'skipped': 0,
+                  'start_time': datetime.now(), 'end_time': datetime.now()},
+        'visited': len(pages) + len(failed),
+        'failed_urls': sorted(failed),
+        'path_mapping': path_mapping,
+        'file_counter': file_counter,
+        'link_graph': builder.to_payload(),
+        'written': {'files': written[0], 'bytes': written[1]},
+    }
+
+
+def test_merge_results_combines_index_graph_and_stats(tmp_path):
+    coordinator = ShardedCrawlCoordinator(BASE, str(tmp_path), num_workers=2)
+    coordinator.catalog.begin_run("scrape")
+    # İşçiler yazdıkları dosyaları ortak boyut günlüğüne kendileri ekler
+    for path, size in (("index.html", 10), ("a/genelge.html", 32)):
+        worker_catalog = StatsCatalog(tmp_path, kind="html")
+        worker_catalog.record_file(tmp_path / path, size)
+        worker_catalog.flush()
+    results = {
+        0: shard_result({f"{BASE}/index.html": "index.html"}, {"index": 1},
+                        {f"{BASE}/index.html": [f"{BASE}/a/genelge.html", f"{BASE}/yok.html"]},
+                        failed=[f"{BASE}/yok.html"], downloaded=1, written=(1, 10)),
+        1: shard_result({f"{BASE}/a/genelge.html": "a/genelge.html"}, {"genelge": 1},
+                        {f"{BASE}/a/genelge.html": [f"{BASE}/index.html"]},
+                        downloaded=1, written=(1, 32)),
+    }
+    coordinator.merge_results(results)
+
+    with open(tmp_path / "file_index.json", encoding="utf-8") as f:
+        index = json.load(f)
+    assert index['path_mapping'] == {f"{BASE}/index.html": "index.html",
+                                     f"{BASE}/a/genelge.html": "a/genelge.html"}
+    assert index['file_counter'] == {"index": 1, "genelge": 1}
+
+    graph = LinkGraph.load(tmp_path / GRAPH_NAME)
+    assert graph.node_count == 3
+    assert graph.edge_count == 3
+    assert graph.broken_links() == [(f"{BASE}/index.html", f"{BASE}/yok.html")]
+
+    assert coordinator.stats['downloaded'] == 2
+    assert coordinator.stats['failed'] == 1
+    assert coordinator.stats['visited'] == 3
+    assert set(coordinator.stats['shards']) == {0, 1}
+
+    summary = read_catalog(tmp_path)
+    assert summary['files'] == 2
+    assert summary['bytes'] == 42
+    assert summary['runs'][-1]['workers'] == 2
+    assert (summary['runs'][-1]['files'], summary['runs'][-1]['bytes']) == (2, 42)
+
+
+def test_worker_logging_goes_through_queue(monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [logging.NullHandler()])
+    log_queue = queue.Queue()
+
+    distributed_scraper._setup_worker_logging(3, log_queue)
+    assert all(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers)
+
+    logging.getLogger("web_scraper").warning("deneme")
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "[shard 3] deneme"
@@ -0,0 +1,73 @@
+"""Kuyruklu, batch'li ve atomik dosya yazıcı"""
+
+import asyncio
+
+import pytest
+
+from file_writer import AsyncFileWriter
+
+
+def test_writes_files_atomically_and_reports_sizes(tmp_path):
+    written = {}
+
+    async def scenario():
+        async with AsyncFileWriter(batch_size=8, fsync_policy="full",
+                                   on_written=lambda path, size: written.__setitem__(path, size)) as writer:
+            futures = [await writer.submit(tmp_path / f"d{i % 3}" / f"sayfa{i}.html", "ş" * i) for i in range(50)]
+            await asyncio.gather(*futures)
+        return writer.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['files'] == 50
+    assert stats['errors'] == 0
+    assert stats['dirs_created'] == 3
+    assert len(written) == 50
+    assert written[tmp_path / "d1" / "sayfa7.html"] == len("ş".encode("utf-8")) * 7
+    assert (tmp_path / "d1" / "sayfa7.html").read_text(encoding="utf-8") == "ş" * 7
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_overwrite_replaces_content(tmp_path):
+    async def scenario():
+        async with AsyncFileWriter() as writer:
+            await writer.write(tmp_path / "a.html", "eski")
+            await writer.write(tmp_path / "a.html", "yeni")
+
+    asyncio.run(scenario())
+    assert (tmp_path / "a.html").read_text(encoding="utf-8") == "yeni"
+
+
+def test_failed_write_sets_exception_and_keeps_others(tmp_path):
+    (tmp_path / "dosya").write_text("x")
+
+    async def scenario():
+        async with AsyncFileWriter() as writer:
+            bad = await writer.submit(tmp_path / "dosya" / "alt.html", "x")
+            good = await writer.submit(tmp_path / "iyi.html", "x")
+            return await asyncio.gather(bad, good, return_exceptions=True)
+
+    bad, good = asyncio.run(scenario())
+    assert isinstance(bad, OSError)
+    assert good == str(tmp_path / "iyi.html")
+
+
+def test_invalid_fsync_policy():
+    with pytest.raises(ValueError):
+        AsyncFileWriter(fsync_policy="bazen")
+
+
+def test_cancelled_batch_cancels_waiting_futures(tmp_path):
+    async def scenario():
+        writer = AsyncFileWriter()
+        writer.start()
+        loop = asyncio.get_running_loop()
+        await writer._in_flight.acquire()
+        task = loop.create_future()
+        task.cancel()
+        futures = [loop.create_future() for _ in range(3)]
+        writer._finish_batch(task, [(tmp_path / f"{i}.html", "x", future) for i, future in enumerate(futures)])
+        await writer.close()
+        return futures
+
+    futures = asyncio.run(scenario())
+    assert all(future.cancelled() for future in futures)
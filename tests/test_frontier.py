@@ -0,0 +1,120 @@
+"""Öncelikli tarama sınırı ve tarama sırası"""
+
+import asyncio
+
+from frontier import PriorityFrontier, anchor_score, fifo_score, url_pattern_score
+from transport import FakeTransport
+from web_scraper import AsyncWebScraper
+
+BASE = "http://site.test"
+
+
+def test_default_score_prefers_documents_over_navigation():
+    assert url_pattern_score(f"{BASE}/genelgeler/2019-45-sayili-genelge.html") > 0
+    assert url_pattern_score(f"{BASE}/liste.html?page=2") < 0
+    assert anchor_score("Sonraki »") < 0 < anchor_score("1512 sayılı Noterlik Kanunu")
+    assert anchor_score("  ") == 0.0
+
+
+def test_fifo_order_and_set_interface():
+    frontier = PriorityFrontier(fifo_score)
+    frontier.update(["c", "a", "b"])
+    assert not frontier.add("a")
+    assert "a" in frontier and len(frontier) == 3 and sorted(frontier) == ["a", "b", "c"]
+    frontier.discard("a")
+    assert frontier.pop_batch(10) == ["c", "b"]
+    assert not frontier and frontier.pop_batch(10) == []
+
+
+def test_in_degree_reprioritizes_and_stale_entries_are_skipped():
+    frontier = PriorityFrontier(lambda url, info: info['in_degree'], directory_penalty=0)
+    for url in ("a", "b", "c"):
+        frontier.add(url)
+    frontier.add("c")
+    frontier.add("c")
+    frontier.add("b")
+    assert frontier.pop_batch(3) == ["c", "b", "a"]
+    assert frontier.pop_batch(1) == []
+
+
+def test_depth_is_bounded_by_the_queue():
+    frontier = PriorityFrontier(fifo_score)
+    frontier.add("a", depth=3)
+    frontier.add("a", depth=1)
+    frontier.add("a", depth=5)
+    assert frontier.depth("a") == 1
+
+    assert frontier.pop_batch(1) == ["a"]
+    # İşlenirken derinlik okunabilir; kuyruğa geri dönen URL derinliğini korur
+    assert frontier.depth("a") == 1
+    frontier.add("a")
+    frontier.release(["a"])
+    assert frontier.depth("a") == 1
+
+    frontier.pop_batch(1)
+    frontier.release(["a"])
+    assert frontier.depth("a") == 0
+    assert not frontier.entries and not frontier.in_flight
+
+
+def test_directory_penalty_shares_batches():
+    frontier = PriorityFrontier(fifo_score, directory_penalty=1.0)
+    frontier.update([f"{BASE}/a/1.html", f"{BASE}/a/2.html", f"{BASE}/a/3.html", f"{BASE}/b/1.html"])
+    assert frontier.pop_batch(2) == [f"{BASE}/a/1.html", f"{BASE}/b/1.html"]
+    assert frontier.pop_batch(5) == [f"{BASE}/a/2.html", f"{BASE}/a/3.html"]
+
+    frontier = PriorityFrontier(fifo_score, directory_penalty=0)
+    frontier.update([f"{BASE}/a/1.html", f"{BASE}/a/2.html", f"{BASE}/b/1.html"])
+    assert frontier.pop_batch(2) == [f"{BASE}/a/1.html", f"{BASE}/a/2.html"]
+
+
+def crawl(routes, **kwargs):
+    transport = FakeTransport(routes)
+
+    async def scenario(output_dir):
+        async with AsyncWebScraper(BASE, output_dir, max_concurrent=1, transport=transport, **kwargs) as scraper:
+            await scraper.scrape_recursive(f"{BASE}/index.html")
+        return scraper
+
+    return transport, scenario
+
+
+def page(*links):
+    return "<html><body>" + "".join(f'<a href="{link}">{text}</a>' for link, text in links) + "</body></html>"
+
+
+def test_documents_are_crawled_before_listing_pages(tmp_path):
+    routes = {
+        f"{BASE}/index.html": page(("/liste/sayfa-2.html", "Sonraki »"), ("/duyuru.html", "Duyuru"),
+                                   ("/genelgeler/2019-45.html", "2019/45 Genelge")),
+        f"{BASE}/liste/sayfa-2.html": page(),
+        f"{BASE}/duyuru.html": page(),
+        f"{BASE}/genelgeler/2019-45.html": page(("/genelgeler/2019-46.html", "2019/46 Genelge")),
+        f"{BASE}/genelgeler/2019-46.html": page(),
+    }
+    transport, scenario = crawl(routes)
+    scraper = asyncio.run(scenario(str(tmp_path)))
+
+    order = [url for url, _ in transport.requests]
+    assert order[:2] == [f"{BASE}/index.html", f"{BASE}/genelgeler/2019-45.html"]
+    assert order.index(f"{BASE}/genelgeler/2019-46.html") < order.index(f"{BASE}/liste/sayfa-2.html")
+    assert sorted(order) == sorted(routes)
+    assert not scraper.pending_urls.in_flight
+
+
+def test_foreign_urls_never_enter_the_local_queue(tmp_path):
+    routes = {
+        f"{BASE}/index.html": page(("/a.html", "a"), ("/dis/b.html", "b")),
+        f"{BASE}/a.html": page(("/dis/b.html", "b"), ("/dis/c.html", "c")),
+    }
+    transport, scenario = crawl(routes, owns=lambda url: "/dis/" not in url)
+    scraper = asyncio.run(scenario(str(tmp_path)))
+
+    assert [url for url, _ in transport.requests] == [f"{BASE}/index.html", f"{BASE}/a.html"]
+    assert scraper.take_foreign_urls() == [f"{BASE}/dis/b.html", f"{BASE}/dis/c.html"]
+    assert scraper.take_foreign_urls() == []
+    assert not any("/dis/" in item[3] for item in scraper.pending_urls._heap)
+
+    assert scraper.enqueue([f"{BASE}/dis/d.html", f"{BASE}/yeni.html"]) == 1
+    assert scraper.take_foreign_urls() == [f"{BASE}/dis/d.html"]
+    assert scraper.enqueue([f"{BASE}/dis/e.html"], owns=lambda url: True) == 1
@@ -0,0 +1,113 @@
+"""HTML -> JSON dönüştürme, ham HTML paketi ve artımlı ana indeks"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from html_to_json import HTMLToJSONConverter
+from raw_store import load_raw_html
+from sqlite_store import SQLiteStore
+from stats_catalog import read_catalog
+
+KANUN = """<html><head><title>Noterlik Kanunu</title><meta name="keywords" content="noter, kanun"></head>
+<body><h1>1512 sayılı Noterlik Kanunu</h1><p>Madde 1 - Noterlik bir kamu hizmetidir.</p>
+<table><tr><th>İşlem</th><th>Ücret</th></tr><tr><td>Onay</td><td>100</td></tr></table>
+<a href="genelge.html">Genelge</a></body></html>"""
+GENELGE = "<html><head><title>Genelge</title></head><body><p>2019/45 sayılı genelge</p></body></html>"
+
+
+@pytest.fixture
+def html_dir(tmp_path):
+    directory = tmp_path / "db"
+    (directory / "alt").mkdir(parents=True)
+    (directory / "kanun.html").write_text(KANUN, encoding="utf-8")
+    (directory / "alt" / "genelge.html").write_text(GENELGE, encoding="utf-8")
+    return directory
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_convert_inline_and_master_index(html_dir, tmp_path):
+    converter = HTMLToJSONConverter(str(html_dir), str(tmp_path / "json_output"))
+
+    async def scenario():
+        await converter.convert_all_html_files()
+        await converter.create_master_index()
+
+    asyncio.run(scenario())
+    document = read_json(tmp_path / "json_output" / "kanun.json")
+    assert document["metadata"]["title"] == "Noterlik Kanunu"
+    assert document["raw_html"] == KANUN
+    assert document["content"]["tables"][0]["rows"][1] == ["Onay", "100"]
+
+    index = read_json(tmp_path / "json_output" / "master_index.json")
+    assert index["total_files"] == 2
+    assert sorted(entry["file_path"] for entry in index["files"]) == ["alt/genelge.json", "kanun.json"]
+    assert read_catalog(tmp_path / "json_output")["files"] == 2
+
+
+def test_store_mode_writes_refs_and_compacts_dead_entries(html_dir, tmp_path):
+    output_dir = tmp_path / "json_output"
+    converter = HTMLToJSONConverter(str(html_dir), str(output_dir), raw_html_mode="store")
+    asyncio.run(converter.convert_all_html_files())
+    document = read_json(output_dir / "kanun.json")
+    assert "raw_html" not in document
+    assert load_raw_html(document, output_dir) == KANUN
+
+    # Sayfa üç kez değişir: eski içerikler paket boyunu dosya sayısının 1,5 katına çıkarınca atılır
+    kanun = html_dir / "kanun.html"
+    for revision in range(3):
+        kanun.write_text(KANUN.replace("kamu hizmetidir", f"kamu hizmetidir ({revision})"), encoding="utf-8")
+        asyncio.run(converter.convert_all_html_files())
+    assert len(converter.raw_store) <= 3
+    assert converter.raw_html_hashes() == {read_json(output_dir / name)["raw_html_ref"]["sha256"]
+                                           for name in ("kanun.json", "alt/genelge.json")}
+    assert "(2)" in load_raw_html(read_json(output_dir / "kanun.json"), output_dir)
+
+
+def test_stale_files_and_incremental_index(html_dir, tmp_path):
+    output_dir = tmp_path / "json_output"
+    converter = HTMLToJSONConverter(str(html_dir), str(output_dir))
+
+    async def convert_and_index():
+        await converter.convert_all_html_files()
+        await converter.create_master_index()
+
+    asyncio.run(convert_and_index())
+    assert converter.find_stale_files() == ([], [])
+
+    genelge = html_dir / "alt" / "genelge.html"
+    stat = genelge.stat()
+    os.utime(genelge, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (html_dir / "kanun.html").unlink()
+    changed, removed = converter.find_stale_files()
+    assert changed == [genelge] and removed == [html_dir / "kanun.html"]
+
+    async def update():
+        result = await converter.convert_files(changed, removed)
+        return await converter.update_master_index(result['written'], result['removed'])
+
+    summary = asyncio.run(update())
+    assert summary == {'updated': 1, 'removed': 1, 'rebuilt': False, 'tables_changed': True}
+    assert not (output_dir / "kanun.json").exists()
+    assert [entry["file_path"] for entry in read_json(output_dir / "master_index.json")["files"]] == \
+        ["alt/genelge.json"]
+
+
+def test_sqlite_backend_detects_stale_pages(tmp_path):
+    with SQLiteStore(tmp_path / "noterlik.db") as store:
+        store.write_pages([("kanun.html", KANUN), ("alt/genelge.html", GENELGE)])
+        converter = HTMLToJSONConverter(str(tmp_path / "db"), str(tmp_path / "json_output"), store=store)
+        asyncio.run(converter.convert_all_html_files())
+        assert converter.find_stale_files() == ([], [])
+        assert [entry["title"] for entry in store.index_rows()] == ["Genelge", "Noterlik Kanunu"]
+
+        store.write_pages([("kanun.html", KANUN + " ")])
+        store.delete("pages", ["alt/genelge.html"])
+        assert converter.find_stale_files() == ([tmp_path / "db" / "kanun.html"],
+                                                [tmp_path / "db" / "alt" / "genelge.html"])
@@ -0,0 +1,68 @@
+"""Madde, tarih, sayı ve atıf çıkarıcı"""
+
+from legal_extractor import LegalExtractor, article_text, iso_date
+
+TEXT = (
+    "NOTERLİK KANUNU YÖNETMELİĞİ Sayı: 2004/12 Resmî Gazete 15 Mart 2004 tarihinde yayımlanmıştır. "
+    "AmaçMADDE 1 - Bu yönetmelik 1512 sayılı Noterlik Kanunu uyarınca hazırlanmıştır. "
+    "MADDE 2 - 5271 sayılı Ceza Muhakemesi Kanunu hükümleri saklıdır. Yürürlük 01.06.2004. "
+    "GEÇİCİ MADDE 1 - 2004/7 sayılı Genelge yürürlükten kaldırılmıştır."
+)
+
+
+def test_extracts_articles_with_offsets():
+    legal = LegalExtractor().extract(TEXT, "Noterlik Yönetmeliği")
+    assert [(a['id'], a['kind'], a['number']) for a in legal['articles']] == [
+        ('madde-1', 'madde', '1'), ('madde-2', 'madde', '2'), ('gecici-madde-1', 'gecici', '1')]
+    assert article_text(TEXT, legal['articles'][1]).startswith("MADDE 2 - 5271 sayılı")
+    assert legal['articles'][0]['end'] == legal['articles'][1]['start']
+
+
+def test_extracts_references_per_article():
+    legal = LegalExtractor().extract(TEXT, "Noterlik Yönetmeliği")
+    assert [(r['type'], r['number'], r['year']) for r in legal['references']] == [
+        ('kanun', '1512', None), ('kanun', '5271', None), ('genelge', '7', 2004)]
+    assert [len(a['references']) for a in legal['articles']] == [1, 1, 1]
+
+
+def test_extracts_doc_type_sayi_and_dates():
+    legal = LegalExtractor().extract(TEXT, "Noterlik Yönetmeliği")
+    assert legal['doc_type'] == 'yonetmelik'
+    assert legal['sayi'] == '2004/12'
+    assert legal['date'] == '2004-03-15'
+    assert legal['dates'] == ['2004-03-15', '2004-06-01']
+    assert legal['year'] == 2004
+
+
+def test_doc_number_from_file_name():
+    legal = LegalExtractor().extract("metin", "Genelge", "db/genelgeler/2019-45-sayili.html")
+    assert (legal['number'], legal['year'], legal['doc_type']) == ('45', 2019, 'genelge')
+
+
+def test_doc_type_from_text_needs_explicit_phrases():
+    extractor = LegalExtractor()
+    assert extractor.detect_doc_type("", "", "Noter huzurunda verilen karar tebliğ edilir.") == 'diger'
+    assert extractor.detect_doc_type("", "", "NOTERLİK KANUNU YÖNETMELİĞİ") == 'yonetmelik'
+    assert extractor.detect_doc_type("", "", "Bu Tebliğ 5271 sayılı Kanun uyarınca") == 'teblig'
+    assert extractor.detect_doc_type("", "", "2004/7 sayılı Kanun değişikliği") == 'kanun'
+    # Başlık ve dosya adında genel anahtar kelimeler geçerli kalır
+    assert extractor.detect_doc_type("Noter Ücret Tarifesi", "", "") == 'noterlik'
+
+
+def test_impossible_dates_are_dropped():
+    legal = LegalExtractor().extract("Tarih: 31.02.2004, 30 Şubat 2005, 29.02.2001 ve 29.02.2004.")
+    assert legal['dates'] == ['2004-02-29']
+    assert legal['date'] == '2004-02-29'
+    assert legal['year'] == 2004
+
+
+def test_no_valid_date_leaves_year_empty():
+    legal = LegalExtractor().extract("31.04.2010 tarihli yazı")
+    assert legal['dates'] == []
+    assert legal['year'] is None
+
+
+def test_iso_date():
+    assert iso_date(2004, 2, 29) == '2004-02-29'
+    assert iso_date(2004, 13, 1) is None
+    assert iso_date(0, 1, 1) is None
@@ -0,0 +1,109 @@
+"""CSR link grafiği, PageRank ve erişilebilirlik analizleri"""
+
+import numpy as np
+import pytest
+
+from link_graph import LinkGraph, LinkGraphBuilder, document_ranks
+
+A, B, C, D, E, F = (f"http://site.test/{name}.html" for name in "abcdef")
+
+
+def build():
+    #   a -> b, c (c iki kez)   b -> c   c -> a, f (f indirilemedi)
+    #   d -> b (kimse d'ye link vermiyor)   e indirildi, izole
+    builder = LinkGraphBuilder()
+    builder.add_page(A, [B, C, C, A])
+    builder.add_page(B, [C])
+    builder.add_page(C, [A, F])
+    builder.add_page(D, [B])
+    builder.add_page(E, [])
+    builder.mark_failed(F)
+    return builder
+
+
+def test_build_deduplicates_edges_and_drops_self_links():
+    graph = build().build()
+    assert graph.node_count == 6
+    assert graph.edge_count == 6
+    assert list(graph.indptr) == [0, 2, 3, 5, 5, 6, 6]
+    assert graph.links_of(A) == [B, C]
+    assert graph.links_of(E) == []
+    # İndirilmemiş veya bilinmeyen sayfanın linkleri bilinmez
+    assert graph.links_of(F) is None
+    assert graph.links_of("http://site.test/yok.html") is None
+    # Kimlikler ilk görülme sırasıyla verilir: a, b, c, f, d, e
+    assert list(graph.in_degree()) == [1, 2, 2, 1, 0, 0]
+
+
+def reference_pagerank(graph, damping=0.85, iterations=200):
+    n = graph.node_count
+    rank = [1.0 / n] * n
+    for _ in range(iterations):
+        new_rank = [(1.0 - damping) / n] * n
+        for node in range(n):
+            targets = graph.indices[graph.indptr[node]:graph.indptr[node + 1]]
+            if len(targets):
+                for target in targets:
+                    new_rank[target] += damping * rank[node] / len(targets)
+            else:
+                for target in range(n):
+                    new_rank[target] += damping * rank[node] / n
+        rank = new_rank
+    return rank
+
+
+def test_pagerank_matches_reference():
+    graph = build().build()
+    ranks = graph.pagerank(tol=1e-12, max_iter=500)
+    np.testing.assert_allclose(ranks, reference_pagerank(graph), rtol=1e-6)
+    assert ranks.sum() == pytest.approx(1.0)
+    assert LinkGraphBuilder().build().pagerank().shape == (0,)
+
+
+def test_broken_orphan_and_unreachable_pages():
+    graph = build().build()
+    assert graph.broken_links() == [(C, F)]
+    assert graph.orphan_pages() == [D, E]
+    assert graph.orphan_pages(roots=[D]) == [E]
+    assert graph.unreachable_pages([A]) == [D, E]
+    assert graph.unreachable_pages([0, D]) == [E]
+    assert graph.summary([A]) == {'nodes': 6, 'edges': 6, 'fetched': 5, 'failed': 1,
+                                  'broken_links': 1, 'orphans': 2, 'unreachable': 2}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = build().build()
+    graph.save(tmp_path / "grafik.npz")
+    loaded = LinkGraph.load(tmp_path / "grafik.npz")
+    assert loaded.urls == graph.urls
+    np.testing.assert_array_equal(loaded.indptr, graph.indptr)
+    np.testing.assert_array_equal(loaded.indices, graph.indices)
+    assert loaded.broken_links() == graph.broken_links()
+
+    LinkGraphBuilder().build().save(tmp_path / "bos.npz")
+    assert LinkGraph.load(tmp_path / "bos.npz").node_count == 0
+
+
+def test_merge_payload_remaps_node_ids():
+    first = LinkGraphBuilder()
+    first.add_page(A, [B])
+    second = LinkGraphBuilder()
+    second.add_page(C, [A])
+    second.add_page(B, [C])
+    second.mark_failed(D)
+    first.merge_payload(second.to_payload())
+
+    graph = first.build()
+    assert graph.links_of(A) == [B]
+    assert graph.links_of(B) == [C]
+    assert graph.links_of(C) == [A]
+    assert graph.unreachable_pages([A]) == []
+    assert bool(graph.failed[graph.node_id(D)])
+
+
+def test_document_ranks_uses_path_mapping():
+    graph = build().build()
+    ranks = document_ranks(graph, {A: "a.html", D: "d.html", "http://site.test/yok.html": "yok.html"})
+    assert set(ranks) == {"a.html", "d.html"}
+    assert ranks["a.html"]["in_degree"] == 1
+    assert ranks["d.html"]["pagerank"] < ranks["a.html"]["pagerank"]
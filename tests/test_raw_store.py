@@ -0,0 +1,81 @@
+"""Ham HTML paketi ve dönüştürücünün paket kullanımı"""
+
+import asyncio
+import json
+
+import pytest
+
+from html_to_json import HTMLToJSONConverter
+from raw_store import INDEX_NAME, PACK_NAME, RawHTMLStore, load_raw_html
+
+
+def test_put_is_durable_before_close(tmp_path):
+    store = RawHTMLStore(tmp_path, fsync_policy="file")
+    ref = store.put("<p>ş</p>")
+    # Referans döndüğünde paket ve indeks diskte: başka bir okuyucu kapatmadan okuyabilir
+    with RawHTMLStore(tmp_path) as reader:
+        assert reader.get(ref) == "<p>ş</p>"
+    assert store.put("<p>ş</p>") == ref
+    assert len(store) == 1
+    store.close()
+
+
+def test_torn_index_entries_are_ignored(tmp_path):
+    with RawHTMLStore(tmp_path) as store:
+        ref = store.put("<p>a</p>")
+    with open(tmp_path / INDEX_NAME, 'a', encoding='utf-8') as f:
+        f.write(f"{'0' * 64}\t{ref['length']}\t999\t10\n")
+    with RawHTMLStore(tmp_path) as store:
+        assert len(store) == 1
+        assert ref["sha256"] in store
+
+
+def test_compact_drops_dead_entries_and_keeps_old_refs_valid(tmp_path):
+    with RawHTMLStore(tmp_path) as store:
+        refs = [store.put(f"<p>sayfa {i}</p>" * 50) for i in range(5)]
+        live = {refs[1]["sha256"], refs[4]["sha256"]}
+        result = store.compact(live)
+        assert result["kept"] == 2 and result["dropped"] == 3
+        assert result["bytes_after"] < result["bytes_before"]
+        assert store.get(refs[4]) == "<p>sayfa 4</p>" * 50
+        # Sıkıştırma sonrası eklenenler yeni pakete yazılır
+        new_ref = store.put("<p>yeni</p>")
+
+    assert not (tmp_path / PACK_NAME).exists()
+    with RawHTMLStore(tmp_path) as store:
+        assert len(store) == 3
+        assert store.get(refs[1]) == "<p>sayfa 1</p>" * 50
+        assert store.get(new_ref) == "<p>yeni</p>"
+        assert store.get_by_hash(refs[0]["sha256"]) is None
+        store.compact({refs[1]["sha256"]})
+        assert store.pack_name == "raw_html.2.pack"
+        assert store.get(refs[1]) == "<p>sayfa 1</p>" * 50
+
+
+def test_invalid_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        RawHTMLStore(tmp_path, fsync_policy="bazen")
+
+
+def test_converter_compacts_pack_after_recrawl(tmp_path):
+    input_dir, output_dir = tmp_path / "db", tmp_path / "json_output"
+    page = input_dir / "genelge.html"
+    page.parent.mkdir()
+
+    async def convert(version):
+        page.write_text(f"<html><head><title>Genelge</title></head><body><p>sürüm {version}</p></body></html>",
+                        encoding="utf-8")
+        converter = HTMLToJSONConverter(str(input_dir), str(output_dir), raw_html_mode="store")
+        await converter.convert_all_html_files()
+        return converter
+
+    for version in range(3):
+        converter = asyncio.run(convert(version))
+
+    with open(output_dir / "genelge.json", encoding="utf-8") as f:
+        document = json.load(f)
+    with RawHTMLStore(output_dir) as store:
+        # Her sürümde bir ölü kayıt eklenir; 1.5 katı aşınca yalnızca güncel kayıt kalır
+        assert len(store) == 1
+        assert "sürüm 2" in load_raw_html(document, output_dir, store)
+    assert converter.raw_html_hashes() == {document["raw_html_ref"]["sha256"]}
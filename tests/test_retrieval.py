@@ -0,0 +1,128 @@
+"""Parçalama, shard deposu, gömme ve vektör arama"""
+
+import json
+
+import numpy as np
+import pytest
+
+from retrieval import (ChunkShardWriter, ChunkStore, HashingEmbedder, TextChunker, VectorIndex,
+                       build_retrieval_export, chunk_id)
+
+TEXT = ("Genel hükümler. MADDE 1 - Noter her işlemi kayda geçirir. Kayıtlar saklanır. "
+        "MADDE 2 - Vekaletname 12.03.2004 tarihinden itibaren geçerlidir. Harç ödenir.")
+
+
+def document():
+    return {"content": {"text": TEXT, "headings": []},
+            "legal": {"articles": [{"id": "madde-1", "start": TEXT.index("MADDE 1")},
+                                   {"id": "madde-2", "start": TEXT.index("MADDE 2")}]}}
+
+
+def test_chunks_respect_article_boundaries():
+    chunks = list(TextChunker(max_tokens=64, overlap_tokens=8).chunk_text("a.json", TEXT, document()))
+    assert [chunk["section"] for chunk in chunks] == ["", "madde-1", "madde-2"]
+    assert chunks[2]["text"].startswith("MADDE 2")
+    # Tarih içindeki noktalar cümleyi bölmez
+    assert "12.03.2004 tarihinden" in chunks[2]["text"]
+    for chunk in chunks:
+        assert TEXT[chunk["start"]:chunk["end"]].strip() == chunk["text"]
+        assert chunk["id"] == chunk_id("a.json", chunk["start"], chunk["end"])
+
+
+def test_long_sections_split_with_overlap():
+    text = " ".join(f"Cümle {i} burada biter." for i in range(40))
+    chunks = list(TextChunker(max_tokens=20, overlap_tokens=5).chunk_text("b.json", text))
+    assert len(chunks) > 3
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current["start"] < previous["end"]
+
+
+def test_overlap_must_be_smaller_than_budget():
+    with pytest.raises(ValueError):
+        TextChunker(max_tokens=10, overlap_tokens=10)
+
+
+def write_chunks(directory, count, shard_size):
+    with ChunkShardWriter(str(directory), shard_size=shard_size) as writer:
+        for i in range(count):
+            writer.add({"id": f"id{i}", "doc": f"d{i % 3}.json", "section": "", "start": i, "end": i + 1,
+                        "text": f"parça {i} ş"})
+    return writer
+
+
+def test_shard_store_round_trip(tmp_path):
+    writer = write_chunks(tmp_path, 25, shard_size=10)
+    assert writer.shard_count == 3
+    store = ChunkStore(str(tmp_path))
+    assert len(store) == 25
+    assert store[13] == {"id": "id13", "doc": "d1.json", "section": "", "start": 13, "end": 14, "text": "parça 13 ş"}
+    assert [len(batch) for batch in store.iter_texts(batch_size=10)] == [10, 10, 5]
+    with pytest.raises(IndexError):
+        store[25]
+
+
+def test_rechunk_with_fewer_shards_drops_stale_shards(tmp_path):
+    write_chunks(tmp_path, 25, shard_size=10)
+    write_chunks(tmp_path, 5, shard_size=10)
+    store = ChunkStore(str(tmp_path))
+    assert len(store) == 5
+    assert sorted(path.name for path in tmp_path.glob("chunks-*")) == [
+        "chunks-00000.idx.npy", "chunks-00000.meta.json", "chunks-00000.txt"]
+
+
+def test_store_requires_completed_manifest(tmp_path):
+    writer = ChunkShardWriter(str(tmp_path))
+    writer.add({"id": "x", "doc": "d.json", "section": "", "start": 0, "end": 1, "text": "x"})
+    writer.flush()
+    with pytest.raises(FileNotFoundError):
+        ChunkStore(str(tmp_path))
+
+
+def test_hashing_embedder_is_normalized_and_deterministic():
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder(["noter vekaletname", "noter vekaletname", ""])
+    assert vectors.shape == (3, 64)
+    np.testing.assert_allclose(np.linalg.norm(vectors[:2], axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(vectors[0], vectors[1])
+    assert not vectors[2].any()
+
+
+def test_ivf_search_matches_brute_force_with_all_lists():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex(vectors)
+    exact_scores, exact_ids = index.search(vectors[:5], k=3)
+    assert list(exact_ids[:, 0]) == [0, 1, 2, 3, 4]
+
+    index.build_ivf(n_lists=8)
+    assert index.list_offsets[-1] == 500
+    scores, ids = index.search(vectors[:5], k=3, nprobe=8)
+    np.testing.assert_array_equal(ids, exact_ids)
+    np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+
+
+def test_build_ivf_on_empty_corpus():
+    index = VectorIndex(np.zeros((0, 8), np.float32))
+    index.build_ivf()
+    assert index.centroids is None
+    scores, ids = index.search(np.ones(8, np.float32), k=5, nprobe=4)
+    assert scores.shape == (1, 0) and ids.shape == (1, 0)
+
+
+def test_build_retrieval_export(tmp_path):
+    json_dir = tmp_path / "json_output"
+    json_dir.mkdir()
+    (json_dir / "master_index.json").write_text(json.dumps({"files": [{"file_path": "a.json"}]}), encoding="utf-8")
+    with open(json_dir / "a.json", 'w', encoding='utf-8') as f:
+        json.dump(document(), f, ensure_ascii=False)
+
+    result = build_retrieval_export(str(json_dir), str(tmp_path / "retrieval"), embedder=HashingEmbedder(dim=32))
+    assert result == {"chunks": 3, "shards": 1, "dim": 32}
+    assert np.load(tmp_path / "retrieval" / "embeddings.npy").shape == (3, 32)
+
+    # Korpus boşalınca önceki matris boş matrisle değiştirilir
+    (json_dir / "master_index.json").write_text(json.dumps({"files": []}), encoding="utf-8")
+    result = build_retrieval_export(str(json_dir), str(tmp_path / "retrieval"), embedder=HashingEmbedder(dim=32))
+    assert result == {"chunks": 0, "shards": 0, "dim": 0}
+    assert np.load(tmp_path / "retrieval" / "embeddings.npy").shape == (0, 0)
@@ -0,0 +1,113 @@
+"""SQLite deposu, SQLiteWriter ve artımlı dosya düzeni dışa aktarımı"""
+
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+
+from sqlite_store import SQLiteStore, SQLiteWriter, export_layout
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SQLiteStore(tmp_path / "noterlik.db") as store:
+        yield store
+
+
+def export(store, tmp_path, full=False):
+    return asyncio.run(export_layout(store, tmp_path / "db", tmp_path / "json_output", full=full))
+
+
+def test_writes_and_full_export(store, tmp_path):
+    assert store.write_pages([("a/x.html", "<p>ç</p>"), ("y.html", "<p>y</p>")]) == [9, 8]
+    store.write_documents([("a/x.json", json.dumps({"raw_html_ref": {"sha256": "abc"}}))],
+                          {"a/x.json": {"title": "X", "keywords": ["noter"], "doc_year": 2004}})
+    store.put_url_mappings({"http://site.test/a/x.html": "a/x.html"}, {"x": 1})
+
+    assert export(store, tmp_path) == {'pages': 2, 'documents': 1, 'removed': 0}
+    assert (tmp_path / "db" / "a" / "x.html").read_text(encoding="utf-8") == "<p>ç</p>"
+    with open(tmp_path / "db" / "file_index.json", encoding="utf-8") as f:
+        assert json.load(f)["path_mapping"] == {"http://site.test/a/x.html": "a/x.html"}
+    with open(tmp_path / "json_output" / "master_index.json", encoding="utf-8") as f:
+        [entry] = json.load(f)["files"]
+    assert (entry["file_path"], entry["keywords"], entry["doc_year"]) == ("a/x.json", ["noter"], 2004)
+
+    assert store.raw_html_hashes() == {"abc"}
+    assert store.stale_pages() == (["y.html"], [])
+    assert export(store, tmp_path) == {'pages': 0, 'documents': 0, 'removed': 0}
+
+
+def test_incremental_export_does_not_depend_on_wall_clock(store, tmp_path, monkeypatch):
+    store.write_pages([("a.html", "1"), ("b.html", "1")])
+    export(store, tmp_path)
+
+    # Saat geri alınsa da sonraki yazım ve silme dışa aktarılır
+    monkeypatch.setattr(time, "time", lambda: 0.0)
+    store.write_pages([("a.html", "2")])
+    assert store.delete("pages", ["b.html"]) == 1
+    assert export(store, tmp_path) == {'pages': 1, 'documents': 0, 'removed': 1}
+    assert (tmp_path / "db" / "a.html").read_text() == "2"
+    assert not (tmp_path / "db" / "b.html").exists()
+
+    assert export(store, tmp_path, full=True)['pages'] == 1
+
+
+def test_delete_tombstones_only_existing_rows(store):
+    store.write_pages([("a.html", "1")])
+    version = store.current_version()
+    assert store.delete("pages", ["a.html", "yok.html", "a.html"]) == 1
+    assert store.changed_since("pages", version) == ([], ["a.html"])
+
+    # Hiçbir satır silinmezse sürüm de ilerlemez
+    version = store.current_version()
+    assert store.delete("pages", ["yok.html"]) == 0
+    assert store.current_version() == version
+    assert store.changed_since("pages", 0) == ([], ["a.html"])
+
+    # Yeniden yazılan satırın silme kaydı kalkar
+    store.write_pages([("a.html", "2")])
+    assert store.changed_since("pages", 0) == ([("a.html", "2")], [])
+
+
+def test_version_one_database_is_migrated(tmp_path):
+    path = tmp_path / "eski.db"
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE pages (path TEXT PRIMARY KEY, directory TEXT NOT NULL, html TEXT NOT NULL,
+                            size INTEGER NOT NULL, sha256 TEXT NOT NULL, updated_at REAL NOT NULL);
+        CREATE TABLE removed (kind TEXT NOT NULL, path TEXT NOT NULL, removed_at REAL NOT NULL,
+                              PRIMARY KEY (kind, path));
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO pages VALUES ('a.html', '.', 'eski', 4, '-', 1e10);
+        INSERT INTO meta VALUES ('schema_version', '1');
+    """)
+    connection.close()
+
+    with SQLiteStore(path) as store:
+        assert store.get_meta("schema_version") == 2
+        # Geçişten sonraki ilk artımlı dışa aktarım mevcut satırları yazar
+        assert store.changed_since("pages", 0) == ([("a.html", "eski")], [])
+        store.write_pages([("b.html", "yeni")])
+        assert store.changed_since("pages", 1) == ([("b.html", "yeni")], [])
+
+
+def test_writer_batches_documents_with_index_rows(store, tmp_path):
+    written = []
+
+    async def scenario():
+        writer = SQLiteWriter(store, "documents", tmp_path, batch_size=2,
+                              on_written=lambda path, size: written.append((path, size)))
+        async with writer:
+            writer.stage_index_row(tmp_path / "k.json", {"title": "Kanun"})
+            await writer.write(tmp_path / "k.json", "{}")
+            await writer.write(tmp_path / "alt" / "g.json", '{"a": 1}')
+        return writer.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats['backend'], stats['files'], stats['errors']) == ("sqlite", 2, 0)
+    assert sorted(written) == [(tmp_path / "alt" / "g.json", 8), (tmp_path / "k.json", 2)]
+    assert [entry["title"] for entry in store.index_rows()] == ["Kanun"]
+    with pytest.raises(ValueError):
+        SQLiteWriter(store, "tablolar", tmp_path)
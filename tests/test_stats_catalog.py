@@ -0,0 +1,118 @@
+"""Artımlı istatistik kataloğu ve boyut günlüğü"""
+
+import json
+
+from stats_catalog import CATALOG_NAME, SIZES_NAME, StatsCatalog, read_catalog, top_directories
+
+
+def test_existing_files_are_counted_on_first_use(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "x.html").write_text("12345")
+    (tmp_path / "y.html").write_text("123")
+    (tmp_path / "file_index.json").write_text("{}")
+
+    summary = StatsCatalog(tmp_path, kind="html").summary()
+    assert (summary['files'], summary['bytes']) == (2, 8)
+    assert summary['directories'] == {'a': {'files': 1, 'bytes': 5}, '.': {'files': 1, 'bytes': 3}}
+
+    # Katalog varken dizin yeniden taranmaz
+    (tmp_path / "z.html").write_text("1")
+    assert StatsCatalog(tmp_path, kind="html").summary()['files'] == 2
+
+
+def test_deltas_reach_the_log_before_save(tmp_path):
+    catalog = StatsCatalog(tmp_path, kind="json", flush_every=2)
+    catalog.record_file(tmp_path / "a.json", 10)
+    assert not (tmp_path / SIZES_NAME).read_text()
+    catalog.record_file(tmp_path / "b.json", 20)
+    assert (tmp_path / SIZES_NAME).read_text() == "a.json\t10\nb.json\t20\n"
+
+    # save() çağrılmadan çöken sürecin kayıtları bir sonraki süreçte işlenir
+    del catalog
+    summary = StatsCatalog(tmp_path, kind="json").summary()
+    assert (summary['files'], summary['bytes']) == (2, 30)
+
+
+def test_overwrites_and_removals_apply_only_differences(tmp_path):
+    catalog = StatsCatalog(tmp_path, kind="json")
+    catalog.begin_run("convert")
+    catalog.record_file(tmp_path / "d" / "a.json", 10)
+    catalog.record_file(tmp_path / "d" / "b.json", 5)
+    catalog.end_run()
+    assert catalog.save()['files'] == 2
+
+    catalog.record_file(tmp_path / "d" / "a.json", 12)
+    catalog.record_file(tmp_path / "d" / "a.json", 15)
+    catalog.remove_file(tmp_path / "d" / "b.json")
+    catalog.remove_file(tmp_path / "d" / "yok.json")
+    summary = catalog.save()
+    assert (summary['files'], summary['bytes']) == (1, 15)
+    assert summary['directories'] == {'d': {'files': 1, 'bytes': 15}}
+    assert summary['runs'][-1]['files'] == 2
+
+    # 6 satır > 2 x 1 dosya: günlük güncel boyut tablosuyla yeniden yazıldı
+    assert (tmp_path / SIZES_NAME).read_text() == "d/a.json\t15\n"
+    assert summary['sizes_offset'] == len("d/a.json\t15\n")
+
+    catalog.record_file(tmp_path / "d" / "c.json", 1)
+    assert catalog.save()['files'] == 2
+
+
+def test_compaction_keeps_unapplied_tail_and_recovers_from_short_log(tmp_path):
+    catalog = StatsCatalog(tmp_path, kind="html")
+    with open(tmp_path / SIZES_NAME, 'a', encoding='utf-8') as f:
+        f.write("a.html\t1\na.html\t2\na.html\t3\nb.ht")
+    summary = catalog.save()
+    assert (summary['files'], summary['bytes']) == (1, 3)
+    assert (tmp_path / SIZES_NAME).read_text() == "a.html\t3\nb.ht"
+
+    with open(tmp_path / SIZES_NAME, 'a', encoding='utf-8') as f:
+        f.write("ml\t4\n")
+    assert catalog.save()['files'] == 2
+
+    # Sıkıştırma ile katalog yazımı arasında çökme: günlük ofsetten kısa kalırsa yeniden oluşturulur
+    (tmp_path / "a.html").write_text("123")
+    (tmp_path / SIZES_NAME).write_text("")
+    assert StatsCatalog(tmp_path, kind="html").summary()['files'] == 1
+
+
+def test_partial_last_line_waits_for_completion(tmp_path):
+    catalog = StatsCatalog(tmp_path, kind="html")
+    with open(tmp_path / SIZES_NAME, 'a', encoding='utf-8') as f:
+        f.write("a.html\t7\nb.ht")
+    summary = catalog.save()
+    assert summary['files'] == 1
+    with open(tmp_path / SIZES_NAME, 'a', encoding='utf-8') as f:
+        f.write("ml\t3\n")
+    assert catalog.save()['files'] == 2
+
+
+def test_rebuild_compacts_log_and_keeps_run_history(tmp_path):
+    (tmp_path / "a.html").write_text("1234")
+    catalog = StatsCatalog(tmp_path, kind="html")
+    catalog.begin_run("scrape")
+    catalog.record_file(tmp_path / "a.html", 4)
+    catalog.record_file(tmp_path / "a.html", 4)
+    catalog.end_run()
+    catalog.save()
+
+    summary = catalog.rebuild()
+    assert (tmp_path / SIZES_NAME).read_text() == "a.html\t4\n"
+    assert summary['files'] == 1
+    assert len(summary['runs']) == 1
+    assert read_catalog(tmp_path) == summary
+
+
+def test_legacy_catalog_without_offset_is_rebuilt(tmp_path):
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / CATALOG_NAME).write_text(json.dumps({'kind': 'json', 'files': 5, 'bytes': 99,
+                                                      'directories': {}, 'runs': [{'operation': 'eski'}]}))
+    (tmp_path / SIZES_NAME).write_text("a.json\t2\nb.json\t97\n")
+    summary = StatsCatalog(tmp_path, kind="json").summary()
+    assert (summary['files'], summary['bytes']) == (1, 2)
+    assert summary['runs'] == [{'operation': 'eski'}]
+
+
+def test_top_directories():
+    summary = {'directories': {'a': {'files': 1, 'bytes': 5}, 'b': {'files': 2, 'bytes': 50}}}
+    assert [item['directory'] for item in top_directories(summary, limit=1)] == ['b']
@@ -0,0 +1,122 @@
+"""Tablo hücrelerinin ayrıştırılması, sütunlu depo ve toplama sorguları"""
+
+import csv
+import json
+import math
+
+import numpy as np
+import pytest
+
+from table_export import (DATE, NUMBER, TEXT, TableStore, TableStoreBuilder, build_table_export,
+                          infer_header, normalize_header, parse_date, parse_number)
+
+HARCLAR = {"caption": "Harçlar", "headers": ["İşlem", "Ücret (TL)", "Tarih"],
+           "rows": [["İşlem", "Ücret (TL)", "Tarih"],
+                    ["Vekaletname", "1.234,50 TL", "12.03.2004"],
+                    ["Onay", "100", "1 Nisan 2005"],
+                    ["Vekaletname", "65,5", "2006-01-31"]]}
+# <th> yok: ilk satır başlık olarak çıkarılır
+ORANLAR = {"caption": "", "headers": [], "rows": [["İŞLEM", "Ücret:"], ["Onay", "%20"], ["Suret", "%5,5"]]}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.234,56", 1234.56), ("1234,5", 1234.5), ("1234.5", 1234.5), ("1.234", 1234.0),
+    ("-12 TL", -12.0), ("%18", 18.0), ("₺ 2.000", 2000.0), ("12a", None), ("", None), ("1,2,3", None),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_date():
+    assert parse_date("12.03.2004") == np.datetime64("2004-03-12")
+    assert parse_date("2004-03-12") == np.datetime64("2004-03-12")
+    assert parse_date("12 Mart 2004") == np.datetime64("2004-03-12")
+    assert parse_date("31.02.2004") is None
+    assert parse_date("12 Martı 2004") is None
+
+
+def test_infer_header():
+    assert infer_header(HARCLAR)[0] == ["İşlem", "Ücret (TL)", "Tarih"]
+    assert len(infer_header(HARCLAR)[1]) == 3
+    assert infer_header(ORANLAR) == (["İŞLEM", "Ücret:"], [["Onay", "%20"], ["Suret", "%5,5"]])
+    assert infer_header({"rows": [["a", "b"], ["c", "d"]]}) == ([], [["a", "b"], ["c", "d"]])
+    assert normalize_header("  İŞLEM   Ücreti: ") == "işlem ücreti"
+
+
+@pytest.fixture
+def store(tmp_path):
+    builder = TableStoreBuilder()
+    builder.add_document("harc.json", [HARCLAR, {"rows": [[" ", ""]]}])
+    builder.add_document("bos.json", [])
+    builder.add_document("oran.json", [ORANLAR])
+    return builder.save(tmp_path / "tables")
+
+
+def test_store_layout_and_column_types(store):
+    assert store.docs == ["harc.json", "oran.json"]
+    assert len(store) == 2
+    assert store.cell_count == 13
+    assert list(store.column_type) == [TEXT, NUMBER, DATE, TEXT, NUMBER]
+    assert store.headers == ["işlem", "ücret (tl)", "tarih", "ücret"]
+    assert store.table(0)["rows"][1] == ["Onay", "100", "1 Nisan 2005"]
+    assert store.table(1) == {"doc": "oran.json", "caption": "", "headers": ["işlem", "ücret"],
+                              "types": ["text", "number"], "rows": [["Onay", "%20"], ["Suret", "%5,5"]]}
+
+
+def test_aggregate(store):
+    assert store.aggregate("ücret (tl)") == pytest.approx(1400.0)
+    # Tam eşleşme varsa yalnızca o başlık, yoksa adı sorguyu içeren tüm başlıklar
+    assert store.aggregate("ücret", "count") == 2.0
+    assert store.find_headers("ücr") == [1, 3]
+    assert store.aggregate("ücr", "count") == 5.0
+    assert store.aggregate("ücr", "max", group_by="doc") == {"harc.json": 1234.5, "oran.json": 20.0}
+    assert store.aggregate("ücr", "mean", group_by="işlem") == pytest.approx(
+        {"Onay": 60.0, "Suret": 5.5, "Vekaletname": 650.0})
+    assert store.aggregate([1, 3], "sum", group_by="table") == pytest.approx({"0": 1400.0, "1": 25.5})
+    assert math.isnan(store.aggregate("yok"))
+    assert store.aggregate("yok", group_by="işlem") == {}
+    with pytest.raises(ValueError):
+        store.aggregate("ücret", "median")
+
+
+def test_date_values(store):
+    _, dates = store.values("tarih", kind="date")
+    assert list(dates) == [np.datetime64("2004-03-12"), np.datetime64("2005-04-01"), np.datetime64("2006-01-31")]
+
+
+def test_reload_and_csv(store, tmp_path):
+    reloaded = TableStore(store.table_dir)
+    assert reloaded.aggregate("ücret (tl)", "min") == 65.5
+    reloaded.write_csv(tmp_path / "hucreler.csv")
+    with open(tmp_path / "hucreler.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 13
+    assert rows[1] == {"doc": "harc.json", "table": "0", "row": "0", "column": "1", "header": "ücret (tl)",
+                       "type": "number", "text": "1.234,50 TL", "number": "1234.5", "date": ""}
+
+
+def test_save_swaps_generations_atomically(store):
+    old_cells = store.cell_count
+    builder = TableStoreBuilder()
+    builder.add_document("oran.json", [ORANLAR])
+    saved = builder.save(store.table_dir)
+
+    # Önceki kuşak dosyaları silinse de açık depo mmap'lerinden okumaya devam eder
+    assert (store.generation, saved.generation) == (1, 2)
+    assert store.cell_count == old_cells and saved.cell_count == 4
+    assert store.aggregate("ücret (tl)") == pytest.approx(1400.0)
+    assert not list(store.table_dir.glob("*.1.*"))
+    assert TableStore(store.table_dir).docs == ["oran.json"]
+
+
+def test_build_table_export_skips_documents_without_tables(tmp_path):
+    json_dir = tmp_path / "json_output"
+    json_dir.mkdir()
+    documents = {"harc.json": [HARCLAR], "metin.json": []}
+    for key, tables in documents.items():
+        (json_dir / key).write_text(json.dumps({"content": {"tables": tables}}), encoding="utf-8")
+    (json_dir / "master_index.json").write_text(json.dumps({"files": [
+        {"file_path": key, "table_count": len(tables)} for key, tables in documents.items()]}), encoding="utf-8")
+
+    result = build_table_export(str(json_dir), str(tmp_path / "tables"), str(tmp_path / "db"))
+    assert result == {"documents": 1, "tables": 1, "cells": 9, "headers": 3}
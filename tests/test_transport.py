@@ -0,0 +1,130 @@
+"""Taşıma katmanı: profiller, sahte taşıma ve bağlantı ön ısıtması"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from transport import (DEFAULT_OPTIONS, AiohttpTransport, FakeTransport, HTTPTransport, create_transport,
+                       run, transport_options)
+from web_scraper import AsyncWebScraper
+
+
+def test_transport_interface_is_abstract():
+    with pytest.raises(TypeError):
+        HTTPTransport()
+
+    class Incomplete(HTTPTransport):
+        async def start(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_transport_options_profiles():
+    assert transport_options("basic", 8) == DEFAULT_OPTIONS
+    pooled = transport_options("pooled", 40)
+    assert (pooled['limit'], pooled['limit_per_host'], pooled['prewarm']) == (40, 40, 40)
+    # Ön ısıtma host başına bağlantı sınırını aşmaz
+    assert transport_options("pooled", 40, limit_per_host=10)['prewarm'] == 10
+    assert transport_options("no_keepalive")['force_close'] is True
+    with pytest.raises(ValueError):
+        transport_options("hizli")
+
+    fake = FakeTransport()
+    assert create_transport(fake) is fake
+    assert isinstance(create_transport("basic"), AiohttpTransport)
+
+
+def test_fake_transport_routes_handler_and_validators():
+    async def handler(url, headers):
+        await asyncio.sleep(0)
+        return {"status": 500} if url.endswith("/hata") else None
+
+    transport = FakeTransport({"http://t/a": "A", "http://t/b": {"text": "B", "headers": {"ETag": '"v1"'}}},
+                              handler=handler)
+
+    async def scenario():
+        async with transport:
+            return [await transport.get("http://t/a"),
+                    await transport.get("http://t/b", {"If-None-Match": '"v1"'}),
+                    await transport.get("http://t/b", {"If-None-Match": '"v0"'}),
+                    await transport.get("http://t/hata"),
+                    await transport.get("http://t/yok")]
+
+    responses = run(scenario(), use_uvloop=False)
+    assert [(r['status'], r['text']) for r in responses] == [(200, "A"), (304, ""), (200, "B"), (500, ""), (404, "")]
+    assert responses[2]['headers']['etag'] == '"v1"'
+    assert transport.requests[1] == ("http://t/b", {"If-None-Match": '"v1"'})
+
+
+def test_run_falls_back_to_asyncio_without_uvloop(monkeypatch):
+    import builtins
+    real_import = builtins.__import__
+
+    def no_uvloop(name, *args, **kwargs):
+        if name == "uvloop":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_uvloop)
+
+    async def loop_name():
+        return type(asyncio.get_running_loop()).__module__
+
+    assert run(loop_name(), use_uvloop=True).startswith("asyncio")
+
+
+def test_run_uses_loop_policy_without_asyncio_runner(monkeypatch):
+    import sys
+    import types
+
+    class MarkedLoop(asyncio.SelectorEventLoop):
+        pass
+
+    class Policy(asyncio.DefaultEventLoopPolicy):
+        def new_event_loop(self):
+            return MarkedLoop()
+
+    monkeypatch.setitem(sys.modules, "uvloop", types.SimpleNamespace(EventLoopPolicy=Policy))
+    monkeypatch.delattr(asyncio, "Runner", raising=False)
+    previous = asyncio.get_event_loop_policy()
+
+    async def loop_type():
+        return type(asyncio.get_running_loop())
+
+    assert run(loop_type()) is MarkedLoop
+    assert asyncio.get_event_loop_policy() is previous
+
+
+async def serve(requests):
+    """HEAD/GET isteklerini sayan yerel sunucu"""
+    async def handle(request):
+        requests.append(request.method)
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.parametrize("prewarm, expected", [(None, 4), (2, 2), (0, 0), (10, 4)])
+def test_scraper_prewarm_is_capped(tmp_path, prewarm, expected):
+    async def scenario():
+        requests = []
+        runner, base_url = await serve(requests)
+        try:
+            async with AsyncWebScraper(base_url, str(tmp_path), max_concurrent=4, transport="pooled",
+                                       prewarm=prewarm):
+                pass
+        finally:
+            await runner.cleanup()
+        return requests
+
+    assert asyncio.run(scenario()).count("HEAD") == expected
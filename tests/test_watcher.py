@@ -0,0 +1,71 @@
+"""Dizin izleyici (yoklama ve inotify)"""
+
+import asyncio
+
+import pytest
+
+from watcher import DirectoryWatcher
+
+
+async def collect(watcher, action):
+    """İzleyici başladıktan sonra değişikliği yap ve teslim edilen grubu döndür"""
+    waiter = asyncio.create_task(watcher.wait_for_changes())
+    await asyncio.sleep(0.05)
+    action()
+    return await asyncio.wait_for(waiter, timeout=5)
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_reports_changed_and_removed_files(tmp_path, use_inotify):
+    (tmp_path / "eski.html").write_text("x")
+
+    async def scenario():
+        async with DirectoryWatcher(tmp_path, debounce=0.1, poll_interval=0.05,
+                                    use_inotify=use_inotify) as watcher:
+            if use_inotify and watcher.backend != "inotify":
+                pytest.skip("inotify bu sistemde yok")
+
+            def write():
+                (tmp_path / "alt").mkdir()
+                (tmp_path / "alt" / "yeni.html").write_text("y")
+                (tmp_path / ".yeni.html.1.tmp").write_text("geçici")
+                (tmp_path / "notlar.txt").write_text("desene uymuyor")
+                (tmp_path / "eski.html").unlink()
+
+            first = await collect(watcher, write)
+            second = await collect(watcher, lambda: (tmp_path / "alt" / "yeni.html").write_text("değişti"))
+            return watcher.backend, first, second, watcher.stats
+
+    backend, (changed, removed), (changed_again, removed_again), stats = asyncio.run(scenario())
+    assert backend == ("inotify" if use_inotify else "poll")
+    assert changed == {tmp_path / "alt" / "yeni.html"}
+    assert removed == {tmp_path / "eski.html"}
+    assert changed_again == {tmp_path / "alt" / "yeni.html"} and not removed_again
+    assert stats['batches'] == 2
+
+
+def test_debounce_groups_burst_of_writes(tmp_path):
+    async def scenario():
+        async with DirectoryWatcher(tmp_path, debounce=0.2, poll_interval=0.05, use_inotify=False) as watcher:
+            async def burst():
+                for i in range(5):
+                    (tmp_path / f"{i}.html").write_text(str(i))
+                    await asyncio.sleep(0.05)
+
+            waiter = asyncio.create_task(watcher.wait_for_changes())
+            await burst()
+            return await asyncio.wait_for(waiter, timeout=5)
+
+    changed, removed = asyncio.run(scenario())
+    assert changed == {tmp_path / f"{i}.html" for i in range(5)}
+    assert not removed
+
+
+def test_matches_and_scan(tmp_path):
+    watcher = DirectoryWatcher(tmp_path, patterns=("*.html", "*.htm"))
+    (tmp_path / "a.htm").write_text("12")
+    (tmp_path / ".a.html.tmp").write_text("x")
+    assert watcher.matches("a.html") and not watcher.matches(".gizli.html") and not watcher.matches("a.json")
+    snapshot = watcher.scan()
+    assert list(snapshot) == [str(tmp_path / "a.htm")]
+    assert snapshot[str(tmp_path / "a.htm")][1] == 2
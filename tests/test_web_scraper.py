@@ -0,0 +1,103 @@
+"""Tarama ve artımlı yeniden tarama (FakeTransport üzerinden)"""
+
+import asyncio
+import json
+
+from link_graph import GRAPH_NAME, LinkGraph
+from stats_catalog import read_catalog
+from transport import FakeTransport
+from web_scraper import VALIDATORS_NAME, AsyncWebScraper
+
+BASE = "http://site.test"
+
+
+def page(*links, body=""):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body>{body}{anchors}</body></html>"
+
+
+def site():
+    return {
+        f"{BASE}/index.html": {"text": page("/a/genelge.html", "/kanun.html", "/silinecek.html", "http://dis.test/x"),
+                               "headers": {"ETag": '"i1"'}},
+        f"{BASE}/a/genelge.html": {"text": page("/index.html#ust", body="genelge"),
+                                   "headers": {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}},
+        f"{BASE}/kanun.html": page(body="kanun"),
+        f"{BASE}/silinecek.html": page(body="geçici"),
+    }
+
+
+def crawl(output_dir, routes, incremental=False):
+    transport = FakeTransport(routes)
+
+    async def scenario():
+        async with AsyncWebScraper(BASE, str(output_dir), max_concurrent=4, incremental=incremental,
+                                   transport=transport) as scraper:
+            changed = await scraper.scrape_recursive(f"{BASE}/index.html")
+        return scraper, changed
+
+    scraper, changed = asyncio.run(scenario())
+    return scraper, changed, transport
+
+
+def test_full_crawl_writes_pages_index_and_graph(tmp_path):
+    scraper, changed, transport = crawl(tmp_path, site())
+    assert changed
+    assert scraper.stats['downloaded'] == 4
+    assert (tmp_path / "a" / "genelge.html").read_text(encoding="utf-8") == site()[f"{BASE}/a/genelge.html"]["text"]
+    # Site dışı linkler ve fragment'lar istenmez
+    assert sorted(url for url, _ in transport.requests) == sorted(site())
+
+    with open(tmp_path / "file_index.json", encoding="utf-8") as f:
+        assert json.load(f)["path_mapping"][f"{BASE}/kanun.html"] == "kanun.html"
+    graph = LinkGraph.load(tmp_path / GRAPH_NAME)
+    assert graph.links_of(f"{BASE}/a/genelge.html") == [f"{BASE}/index.html"]
+    assert read_catalog(tmp_path)["files"] == 4
+
+
+def test_incremental_recrawl_uses_validators_and_removes_gone_pages(tmp_path):
+    crawl(tmp_path, site(), incremental=True)
+    assert set(json.loads((tmp_path / VALIDATORS_NAME).read_text())) == {f"{BASE}/index.html",
+                                                                         f"{BASE}/a/genelge.html"}
+    kanun_mtime = (tmp_path / "kanun.html").stat().st_mtime_ns
+
+    routes = site()
+    del routes[f"{BASE}/silinecek.html"]
+    scraper, changed, transport = crawl(tmp_path, routes, incremental=True)
+
+    requests = dict(transport.requests)
+    assert requests[f"{BASE}/index.html"] == {"If-None-Match": '"i1"'}
+    assert requests[f"{BASE}/a/genelge.html"] == {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    # index.html 304 döndü: linkleri önceki grafikten alındı ve kuyruk yine tüm siteye ulaştı
+    assert f"{BASE}/kanun.html" in requests
+    assert scraper.not_modified == {f"{BASE}/index.html", f"{BASE}/a/genelge.html"}
+
+    assert changed
+    assert scraper.stats['downloaded'] == 0
+    assert scraper.stats['unchanged'] == 3
+    assert scraper.stats['removed'] == 1
+    assert not (tmp_path / "silinecek.html").exists()
+    assert (tmp_path / "kanun.html").stat().st_mtime_ns == kanun_mtime
+    with open(tmp_path / "file_index.json", encoding="utf-8") as f:
+        assert f"{BASE}/silinecek.html" not in json.load(f)["path_mapping"]
+    assert read_catalog(tmp_path)["files"] == 3
+
+
+def test_incremental_recrawl_without_changes_keeps_index(tmp_path):
+    crawl(tmp_path, site(), incremental=True)
+    index_mtime = (tmp_path / "file_index.json").stat().st_mtime_ns
+    scraper, changed, _ = crawl(tmp_path, site(), incremental=True)
+    assert not changed
+    assert scraper.stats['unchanged'] == 4
+    assert (tmp_path / "file_index.json").stat().st_mtime_ns == index_mtime
+
+
+def test_not_modified_page_without_local_copy_is_refetched(tmp_path):
+    crawl(tmp_path, site(), incremental=True)
+    (tmp_path / "index.html").unlink()
+    scraper, _, transport = crawl(tmp_path, site(), incremental=True)
+
+    index_requests = [headers for url, headers in transport.requests if url == f"{BASE}/index.html"]
+    assert index_requests == [{"If-None-Match": '"i1"'}, {}]
+    assert (tmp_path / "index.html").exists()
+    assert scraper.stats['downloaded'] == 1